@@ -0,0 +1,575 @@
+import sys
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from applicants import applicant_fingerprints, applicant_row_keys, map_unique
+from disciplines import DisciplineIndex
+from ranking import DEFAULT_WEIGHTS, TopKOrder, combined_score, ranking_criteria
+from utils import map_country
+
+REASON_TARGET = "هدف جنسية محددة"
+REASON_GEO = "توازن جغرافي"
+REASON_DISCIPLINE = "توازن تخصصات"
+REASON_RANKED = "ترتيب متعدد المعايير"
+
+DISCIPLINE_COLUMNS = ["disc1", "disc2", "disc3"]
+CHANGE_ADDED = "قبول جديد"
+CHANGE_REMOVED = "إلغاء القبول"
+CHANGE_DISCIPLINE = "تغيير التخصص"
+
+# Block number logged for phase-2 acceptances, sorting after every target block
+GEO_BLOCK = sys.maxsize
+
+
+def map_targets(country_targets_en: dict) -> list[tuple[str, int]]:
+    """Map {english_country_name: min_count} to ordered (arabic_country, min_count) pairs."""
+    return list({map_country(en): cnt for en, cnt in country_targets_en.items()}.items())
+
+
+class PreparedApplicants:
+    """Per-upload precomputation shared by every allocation over the same applicants.
+
+    Holds the mapped nationalities, the ranking criteria and weighted score,
+    the per-country queues, the phase-2 order and the discipline -> program
+    lookups. It is
+    read-only after construction, apart from the lazily grown phase-2 order
+    (``TopKOrder``, which locks its own growth), so several allocators
+    (scenarios) can use one instance.
+
+    Given the ``previous`` upload (same dataset version, index and settings),
+    rows with the same ``ID`` and fingerprint reuse its nationality, program
+    and criteria values; only new and changed rows, plus rows whose
+    applicant-demand scarcity moved, are mapped and ranked again.
+    """
+
+    def __init__(
+            self,
+            applicants_df: pd.DataFrame,
+            current_students_df: pd.DataFrame,
+            discipline_index: DisciplineIndex | None = None,
+            balance_with_enrollment: bool = False,
+            weights: dict | None = None,
+            previous: "PreparedApplicants | None" = None,
+    ):
+        data = applicants_df.copy().reset_index(drop=True)
+
+        self.row_keys = applicant_row_keys(data)
+        self.fingerprints = applicant_fingerprints(data)
+        # Row of each unchanged applicant in the previous upload, -1 for new or changed rows
+        self.previous_positions = np.full(len(data), -1, dtype=np.int64)
+        if previous is not None:
+            self.previous_positions = previous.unchanged_positions(self.row_keys, self.fingerprints)
+        reused = self.previous_positions >= 0
+        fresh = ~reused
+        before = self.previous_positions[reused]
+
+        # Map uploaded nationalities to internal Arabic country names (once per distinct value),
+        # unless the chunked CSV reader already did
+        if "mapped_nationality" not in data.columns:
+            mapped = np.empty(len(data), dtype=object)
+            if previous is not None:
+                mapped[reused] = previous.data["mapped_nationality"].to_numpy(dtype=object)[before]
+            nationalities = data.loc[fresh, "nationality"].astype(str).str.strip()
+            mapped[fresh] = map_unique(nationalities, map_country, {}).to_numpy(dtype=object)
+            data["mapped_nationality"] = mapped
+
+        self.data = data
+
+        self.discipline_index = discipline_index
+        self.discs = [data[col].to_numpy(dtype=object) for col in DISCIPLINE_COLUMNS]
+        # Resolve every choice to an enrolled program once (distinct strings only), so
+        # discipline load can be keyed by program and looked up in O(1) per applicant
+        self.programs = None
+        if discipline_index is not None:
+            self.programs = []
+            copy = previous is not None and previous.programs is not None
+            for i, col in enumerate(DISCIPLINE_COLUMNS):
+                programs = np.empty(len(data), dtype=object)
+                if copy:
+                    programs[reused] = previous.programs[i][before]
+                remap = fresh if copy else slice(None)
+                programs[remap] = discipline_index.map_programs(data.loc[remap, col]).to_numpy(dtype=object)
+                self.programs.append(programs)
+
+        # Base discipline load (accepted-applicant load starts at 0 unless balancing with enrollment)
+        self.base_loads: dict = {}
+        if discipline_index is not None and balance_with_enrollment:
+            active = current_students_df[current_students_df["status"] == "نشط"]
+            self.base_loads = active["program"].value_counts().to_dict()
+
+        # ── Phase-2 ranking (higher = admitted earlier); geo_score is the geographical criterion
+        choice_keys = [
+            pd.Series(self.discs[i] if self.programs is None
+                      else np.where(pd.isna(self.programs[i]), self.discs[i], self.programs[i]))
+            for i in range(len(DISCIPLINE_COLUMNS))
+        ]
+        demand_counts = choice_keys[0].value_counts()
+        self.demand_shares = demand_counts / max(len(data), 1)
+        if previous is None:
+            self.criteria = ranking_criteria(data, current_students_df, choice_keys)
+            self.reranked = len(data)
+        else:
+            # Scarcity of a choice without a matching program is its share of first choices,
+            # so rows choosing a discipline whose share moved are ranked again too
+            shares = pd.concat([previous.demand_shares, self.demand_shares], axis=1).fillna(0)
+            moved = shares.index[shares.iloc[:, 0] != shares.iloc[:, 1]]
+            moved = moved.difference(current_students_df["program"].unique())
+            rerank = fresh | np.logical_or.reduce([keys.isin(moved).to_numpy() for keys in choice_keys])
+            subset = ranking_criteria(
+                data[rerank].reset_index(drop=True), current_students_df,
+                [keys[rerank].reset_index(drop=True) for keys in choice_keys],
+                demand_counts, len(data),
+            )
+            self.criteria = {}
+            for name, values in subset.items():
+                criterion = np.empty(len(data))
+                criterion[reused] = previous.criteria[name][before]
+                criterion[rerank] = values
+                self.criteria[name] = criterion
+            self.reranked = int(rerank.sum())
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.phase2_reason = REASON_GEO if self.weights == DEFAULT_WEIGHTS else REASON_RANKED
+        data["geo_score"] = self.criteria["geo"]
+        score = combined_score(self.criteria, self.weights)
+        data["rank_score"] = score.round(4)
+
+        # Per-country queues in file order and the phase-2 order (ties keep file order),
+        # materialized only as far as the allocation reads it
+        self.queues = {
+            country: positions for country, positions in
+            data.groupby("mapped_nationality", sort=False).indices.items()
+        }
+        self.geo_order = TopKOrder(score)
+
+    def unchanged_positions(self, row_keys: np.ndarray, fingerprints: np.ndarray) -> np.ndarray:
+        """Row in this upload of each given row with the same ``ID`` and fingerprint, else -1."""
+        keyed = np.flatnonzero(self.row_keys != "")
+        indexer = pd.Index(self.row_keys[keyed]).get_indexer(row_keys)
+        positions = np.where(indexer >= 0, keyed[indexer], -1)
+        same = (positions >= 0) & (row_keys != "")
+        same[same] = self.fingerprints[positions[same]] == fingerprints[same]
+        return np.where(same, positions, -1)
+
+    def revision_summary(self, previous: "PreparedApplicants") -> dict:
+        """Counts of new, changed, removed and unchanged rows against ``previous``."""
+        matched = pd.Index(previous.row_keys).isin(self.row_keys[self.row_keys != ""])
+        unchanged = int((self.previous_positions >= 0).sum())
+        known = pd.Index(self.row_keys).isin(previous.row_keys[previous.row_keys != ""])
+        return {
+            "new": int((~known).sum()),
+            "changed": int(known.sum()) - unchanged,
+            "removed": int((~matched).sum()),
+            "unchanged": unchanged,
+            "reranked": self.reranked,
+        }
+
+
+class IncrementalAllocator:
+    """Stateful version of the two-phase acceptance used by ``suggest_applicants``.
+
+    For a fixed target list the greedy algorithm accepts applicants in one
+    deterministic sequence (target countries in order, then the geo-score
+    order), and a plan with N seats is always the first N entries of it. The
+    allocator keeps that sequence as a log together with the discipline
+    loads and the cursor position before every entry:
+
+    * adding seats continues the sequence from the saved cursor,
+    * removing seats rolls back the most recent acceptances,
+    * changing a target rolls back to that country's block and replays from
+      there, leaving earlier countries untouched.
+
+    Work is proportional to the acceptances that change, not the file size.
+    """
+
+    def __init__(self, prepared: PreparedApplicants):
+        self.prepared = prepared
+        self.data = prepared.data
+        self.discipline_index = prepared.discipline_index
+        self._discs = prepared.discs
+        self._programs = prepared.programs
+        self._base_loads = prepared.base_loads
+        self._queues = prepared.queues
+        self._geo_order = prepared.geo_order
+        self._phase2_reason = prepared.phase2_reason
+
+        self.targets: list[tuple[str, int]] = []
+        self.seats = 0
+        self._loads = dict(self._base_loads)
+        self._accepted = np.zeros(len(self.data), dtype=bool)
+        self._cursor = (0, 0, 0)  # (target block, position in its queue, position in geo order)
+        # Acceptance log: one entry per accepted applicant, in acceptance order
+        self._log_idx: list[int] = []
+        self._log_reason: list[str] = []
+        self._log_disc: list[str] = []
+        self._log_rank: list[int] = []
+        self._log_key: list[str] = []
+        self._log_cursor: list[tuple] = []
+        self._log_block: list[int] = []
+        self._exhausted = False
+        self.last_change = {"added": [], "removed": [], "reassigned": []}
+
+    # ── Sequence generation
+
+    def _next_candidate(self):
+        block, queue_pos, geo_pos = self._cursor
+        while block < len(self.targets):
+            country, target = self.targets[block]
+            queue = self._queues.get(country, ())
+            if queue_pos < min(target, len(queue)):
+                self._cursor = (block, queue_pos + 1, geo_pos)
+                return int(queue[queue_pos]), REASON_TARGET, block
+            block, queue_pos = block + 1, 0
+        while geo_pos < len(self._geo_order):
+            idx = int(self._geo_order[geo_pos])
+            geo_pos += 1
+            if not self._accepted[idx]:
+                self._cursor = (block, queue_pos, geo_pos)
+                return idx, self._phase2_reason, GEO_BLOCK
+        self._cursor = (block, queue_pos, geo_pos)
+        return None
+
+    def _best_discipline(self, idx: int) -> tuple[str, int, str]:
+        """Return (discipline, choice_rank, load_key) with the lowest load; prefer lower rank on tie."""
+        choices = []
+        for rank, discs in enumerate(self._discs, 1):
+            disc = discs[idx]
+            disc = str(disc).strip() if not pd.isna(disc) else ""
+            if not disc:
+                continue
+            key = disc
+            if self._programs is not None:
+                program = self._programs[rank - 1][idx]
+                key = program if isinstance(program, str) else disc
+            choices.append((self._loads.get(key, 0), rank, disc, key))
+        if not choices:
+            return "", 0, ""
+        choices.sort()  # ascending load, then ascending rank
+        return choices[0][2], choices[0][1], choices[0][3]
+
+    def _extend(self, count: int) -> None:
+        while count > 0 and not self._exhausted:
+            cursor = self._cursor
+            candidate = self._next_candidate()
+            if candidate is None:
+                self._exhausted = True
+                break
+            idx, reason, block = candidate
+            disc, rank, key = self._best_discipline(idx)
+            self._loads[key] = self._loads.get(key, 0) + 1
+            self._accepted[idx] = True
+            self._log_idx.append(idx)
+            # If a non-first choice was needed to balance disciplines, note it
+            self._log_reason.append(REASON_DISCIPLINE if rank > 1 else reason)
+            self._log_disc.append(disc)
+            self._log_rank.append(rank)
+            self._log_key.append(key)
+            self._log_cursor.append(cursor)
+            self._log_block.append(block)
+            self.last_change["added"].append(idx)
+            count -= 1
+
+    def _rollback(self, length: int) -> None:
+        """Undo the most recent acceptances until ``length`` remain."""
+        if length >= len(self._log_idx):
+            return
+        self._cursor = self._log_cursor[length]
+        for pos in range(len(self._log_idx) - 1, length - 1, -1):
+            idx = self._log_idx[pos]
+            self._accepted[idx] = False
+            key = self._log_key[pos]
+            self._loads[key] -= 1
+            self.last_change["removed"].append(idx)
+        for log in (self._log_idx, self._log_reason, self._log_disc,
+                    self._log_rank, self._log_key, self._log_cursor, self._log_block):
+            del log[length:]
+        self._exhausted = False
+
+    def _revision_start(self, prepared: PreparedApplicants, new_of_old: np.ndarray) -> tuple:
+        """First log entry a revised upload can change, with the log cursors on the new rows.
+
+        An entry is kept only if the greedy sequence over ``prepared`` reaches
+        it unchanged: its applicant is unchanged, every target block before
+        it took the same queue prefix, and in phase 2 the new order (skipping
+        applicants already accepted) yields the same applicants in turn.
+        Returns ``(length, cursors, resume)``: entries kept, the cursor before
+        every entry and the cursor to continue from after the last kept one.
+        """
+        mapped = new_of_old[np.asarray(self._log_idx, dtype=np.int64)]
+        total = len(mapped)
+        removed = np.flatnonzero(mapped < 0)
+        length = int(removed[0]) if len(removed) else total
+        cursors = list(self._log_cursor)
+        resume = None
+
+        for block, (country, target) in enumerate(self.targets):
+            start, end = bisect_left(self._log_block, block), bisect_left(self._log_block, block + 1)
+            if start >= length:
+                break
+            queue = prepared.queues.get(country, np.empty(0, dtype=np.int64))
+            expected = queue[:min(target, len(queue))]
+            taken = mapped[start:end]
+            size = min(len(taken), len(expected))
+            differs = np.flatnonzero(taken[:size] != expected[:size])
+            if len(differs) or len(expected) < len(taken):
+                length = min(length, start + (int(differs[0]) if len(differs) else size))
+                break
+            if self._cursor[0] > block and len(expected) > len(taken):
+                # The block closed because its old queue ran out; it now takes more
+                if end <= length:
+                    length, resume = end, (block, len(taken), 0)
+                break
+
+        geo_start = bisect_left(self._log_block, GEO_BLOCK)
+        if length <= geo_start:
+            if resume is None:
+                resume = cursors[length] if length < total else (self._cursor[0], self._cursor[1], 0)
+            return length, cursors, resume
+
+        accepted = np.zeros(len(prepared.data), dtype=bool)
+        accepted[mapped[:geo_start]] = True
+        order = prepared.geo_order
+        geo_pos = 0
+        for pos in range(geo_start, total):
+            block, queue_pos, _ = self._log_cursor[pos]
+            cursors[pos] = (block, queue_pos, geo_pos)
+            while geo_pos < len(order) and accepted[order[geo_pos]]:
+                geo_pos += 1
+            if pos >= length or geo_pos >= len(order) or order[geo_pos] != mapped[pos]:
+                return pos, cursors, cursors[pos]
+            geo_pos += 1
+        return total, cursors, (self._cursor[0], self._cursor[1], geo_pos)
+
+    # ── Public API
+
+    def update(self, intl_seats: int, country_targets_en: dict) -> dict:
+        """Move the allocation to a new seat count and target set.
+
+        Returns the row positions that were newly accepted (``added``), dropped
+        (``removed``) or rolled back and accepted again during the replay
+        (``reassigned``, possibly with another discipline).
+        """
+        self.last_change = {"added": [], "removed": []}
+        targets = map_targets(country_targets_en)
+        if targets != self.targets:
+            # First block that differs; everything accepted from it onward is replayed
+            first = next(
+                (i for i, (old, new) in enumerate(zip(self.targets, targets)) if old != new),
+                min(len(self.targets), len(targets)),
+            )
+            self._rollback(bisect_left(self._log_block, first))
+            if self._cursor[0] >= first:
+                # No acceptances came from the changed blocks yet; restart at the first of them
+                self._cursor = (first, 0, 0)
+            self.targets = targets
+            self._exhausted = False
+
+        self.seats = max(int(intl_seats), 0)
+        if self.seats < len(self._log_idx):
+            self._rollback(self.seats)
+        else:
+            self._extend(self.seats - len(self._log_idx))
+
+        added, removed = set(self.last_change["added"]), set(self.last_change["removed"])
+        self.last_change = {
+            "added": sorted(added - removed),
+            "removed": sorted(removed - added),
+            "reassigned": sorted(added & removed),
+        }
+        return self.last_change
+
+    def result(self) -> pd.DataFrame:
+        """Applicants with the acceptance columns of the current allocation."""
+        data = self.data.copy()
+        data["accepted"] = self._accepted.copy()
+        reason = np.full(len(data), "", dtype=object)
+        disc = np.full(len(data), "", dtype=object)
+        rank = np.zeros(len(data), dtype=np.int64)
+        order = np.zeros(len(data), dtype=np.int64)
+        if self._log_idx:
+            positions = np.asarray(self._log_idx)
+            reason[positions] = self._log_reason
+            disc[positions] = self._log_disc
+            rank[positions] = self._log_rank
+            order[positions] = np.arange(1, len(positions) + 1)
+        data["acceptance_reason"] = reason
+        data["assigned_discipline"] = disc
+        data["accepted_at_choice"] = rank
+        data["acceptance_order"] = order
+        if self.discipline_index is not None:
+            matches = {d: self.discipline_index.match(d) for d in set(self._log_disc) if d}
+            data["assigned_program"] = [matches[d][0] or "" if d else "" for d in disc]
+            data["assigned_college"] = [matches[d][1] or "" if d else "" for d in disc]
+        return data
+
+    def acceptances(self) -> pd.DataFrame:
+        """Accepted applicants with an ``ID`` and their assigned discipline, indexed by row key."""
+        positions = np.asarray(self._log_idx, dtype=np.int64)
+        accepted = pd.DataFrame({
+            "applicant_id": self.data["applicant_id"].to_numpy()[positions],
+            "mapped_nationality": self.data["mapped_nationality"].to_numpy()[positions],
+            "assigned_discipline": self._log_disc,
+        }, index=self.prepared.row_keys[positions])
+        return accepted[accepted.index != ""]
+
+    def revise(self, prepared: PreparedApplicants) -> pd.DataFrame:
+        """Move the allocation onto a revised upload, keeping what the revision cannot change.
+
+        ``prepared`` must be built with this allocator's applicants as its
+        ``previous``. The acceptance log is kept up to the first entry the
+        revision affects (see ``_revision_start``) and the rest is replayed
+        on the new rows, at the same seats and targets.
+        Returns the acceptances that changed (``acceptance_changes``).
+        """
+        before = self.acceptances()
+        reused = prepared.previous_positions >= 0
+        new_of_old = np.full(len(self.data), -1, dtype=np.int64)
+        new_of_old[prepared.previous_positions[reused]] = np.flatnonzero(reused)
+        length, cursors, resume = self._revision_start(prepared, new_of_old)
+        self._log_cursor[:] = cursors
+        self._rollback(length)
+        self._cursor = resume
+
+        self.prepared = prepared
+        self.data = prepared.data
+        self.discipline_index = prepared.discipline_index
+        self._discs = prepared.discs
+        self._programs = prepared.programs
+        self._queues = prepared.queues
+        self._geo_order = prepared.geo_order
+        self._phase2_reason = prepared.phase2_reason
+        self._log_idx = [int(new_of_old[idx]) for idx in self._log_idx]
+        self._accepted = np.zeros(len(self.data), dtype=bool)
+        self._accepted[self._log_idx] = True
+        self._exhausted = False
+        self.last_change = {"added": [], "removed": []}
+        self._extend(self.seats - len(self._log_idx))
+        self.last_change = {"added": [], "removed": [], "reassigned": []}
+        return acceptance_changes(before, self.acceptances())
+
+
+def suggest_applicants(
+        applicants_df: pd.DataFrame,
+        current_students_df: pd.DataFrame,
+        intl_seats: int,
+        country_targets_en: dict,
+        discipline_index: DisciplineIndex | None = None,
+        balance_with_enrollment: bool = False,
+        weights: dict | None = None,
+) -> pd.DataFrame:
+    """
+    Suggest which applicants to accept.
+
+    Priority order:
+      1. Country targets  – fill specified minimums per nationality first
+      2. Geographical balance – underrepresented countries (low current share) get priority;
+                               ``weights`` can blend in continent share and discipline scarcity
+      3. Discipline balance  – accepted slots are distributed as evenly as possible across
+                               disciplines; 2nd/3rd choice used when 1st is overloaded.
+
+    applicants_df must have: applicant_id, nationality, disc1, disc2, disc3
+                  (mapped_nationality is reused when present)
+    current_students_df must have: country, program, status
+    country_targets_en: {english_country_name: min_count}
+    discipline_index: maps free-text choices to enrolled programs; when given, choices
+                      resolving to the same program share one discipline load
+    balance_with_enrollment: start each program's load at its active enrollment
+                             instead of zero (requires discipline_index)
+    weights: phase-2 ranking weights per criterion in ``ranking.RANKING_CRITERIA``
+             (default: geographical share only)
+
+    Returns applicants_df with added columns:
+      mapped_nationality, geo_score, rank_score, accepted, acceptance_reason,
+      assigned_discipline, accepted_at_choice, acceptance_order
+      (plus assigned_program, assigned_college when discipline_index is given)
+    """
+    allocator = IncrementalAllocator(PreparedApplicants(
+        applicants_df, current_students_df, discipline_index, balance_with_enrollment, weights
+    ))
+    allocator.update(intl_seats, country_targets_en)
+    return allocator.result()
+
+
+def acceptance_changes(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """Applicants accepted in only one of two ``acceptances()`` tables, or with another discipline."""
+    merged = before.join(after, how="outer", lsuffix="_before", rsuffix="_after")
+    was, now = merged["applicant_id_before"].notna(), merged["applicant_id_after"].notna()
+    moved = was & now & (merged["assigned_discipline_before"] != merged["assigned_discipline_after"])
+    change = np.select([~was, ~now, moved], [CHANGE_ADDED, CHANGE_REMOVED, CHANGE_DISCIPLINE], default="")
+    return pd.DataFrame({
+        "applicant_id": merged["applicant_id_after"].fillna(merged["applicant_id_before"]),
+        "mapped_nationality": merged["mapped_nationality_after"].fillna(merged["mapped_nationality_before"]),
+        "change": change,
+        "discipline_before": merged["assigned_discipline_before"].fillna(""),
+        "discipline_after": merged["assigned_discipline_after"].fillna(""),
+    })[change != ""].reset_index(drop=True)
+
+
+# ── Scenario comparison
+
+def evaluate_scenarios(allocators: dict, scenarios: list[dict]) -> dict:
+    """Bring each scenario's allocator to its seats/targets, one scenario after another.
+
+    ``allocators`` maps scenario name -> IncrementalAllocator (all built on one
+    shared PreparedApplicants); ``scenarios`` are dicts with name, seats and
+    targets. Earlier state is reused, so re-evaluating after a small edit is
+    incremental. The greedy allocation holds the GIL, so threads would not
+    overlap it, and the allocators live in the session, so they are not
+    handed to worker processes either.
+    Returns {name: result DataFrame} in scenario order.
+    """
+    results = {}
+    for scenario in scenarios:
+        allocator = allocators[scenario["name"]]
+        allocator.update(scenario["seats"], scenario["targets"])
+        results[scenario["name"]] = allocator.result()
+    return results
+
+
+def scenario_summary(results: dict) -> pd.DataFrame:
+    rows = []
+    for name, result in results.items():
+        accepted = result[result["accepted"]]
+        rows.append({
+            "scenario": name,
+            "accepted": len(accepted),
+            "nationalities": accepted["mapped_nationality"].nunique(),
+            "disciplines": accepted["assigned_discipline"].nunique(),
+            "first_choice_share": (accepted["accepted_at_choice"] == 1).mean() if len(accepted) else 0.0,
+        })
+    return pd.DataFrame(rows)
+
+
+def scenario_distribution(results: dict, column: str, top: int = 15) -> pd.DataFrame:
+    """Long-form accepted counts of ``column`` per scenario, limited to the overall top values."""
+    counts = pd.DataFrame({
+        name: result.loc[result["accepted"], column].value_counts()
+        for name, result in results.items()
+    }).fillna(0).astype(int)
+    counts = counts.loc[counts.sum(axis=1).sort_values(ascending=False).index[:top]]
+    return counts.rename_axis("value").reset_index().melt(
+        id_vars="value", var_name="scenario", value_name="count"
+    )
+
+
+def scenario_flips(results: dict, first: str, second: str) -> pd.DataFrame:
+    """Applicants whose acceptance or assigned discipline differs between two scenarios."""
+    a, b = results[first], results[second]
+    changed = (a["accepted"] != b["accepted"]) | (a["assigned_discipline"] != b["assigned_discipline"])
+    return pd.DataFrame({
+        "applicant_id": a.loc[changed, "applicant_id"],
+        "mapped_nationality": a.loc[changed, "mapped_nationality"],
+        "accepted_first": a.loc[changed, "accepted"],
+        "discipline_first": a.loc[changed, "assigned_discipline"],
+        "accepted_second": b.loc[changed, "accepted"],
+        "discipline_second": b.loc[changed, "assigned_discipline"],
+    })
+
+
+def scenario_flip_matrix(results: dict) -> pd.DataFrame:
+    """Number of applicants accepted in exactly one of each pair of scenarios."""
+    names = list(results)
+    accepted = np.column_stack([results[name]["accepted"].to_numpy() for name in names])
+    flips = (accepted[:, :, None] != accepted[:, None, :]).sum(axis=0)
+    return pd.DataFrame(flips, index=names, columns=names)
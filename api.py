@@ -0,0 +1,341 @@
+import asyncio
+import hashlib
+import json
+import sys
+import threading
+import time
+import traceback
+from http import HTTPStatus
+from urllib.parse import parse_qsl, unquote
+
+import numpy as np
+import pandas as pd
+
+import shared_store
+from cache_manager import get_cache_manager
+from filters import FilterIndex, FILTER_COLUMNS, ALL_OPTION
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+API_PREFIX = "/api/v1"
+
+AGGREGATE_DIMENSIONS = ["country", "continent", "college", "program", "status", "status_bucket", "gender"]
+DEFAULT_DIMENSIONS = ["country", "college", "status"]
+# Columns served by /rows (contact details stay in the dashboard)
+ROW_COLUMNS = [
+    "student_id", "name", "country", "continent", "program", "college", "status",
+    "status_bucket", "status_detail", "gpa", "hours", "funding", "term_admit", "last_term",
+]
+PLAN_COLUMNS = [
+    "applicant_id", "mapped_nationality", "assigned_discipline", "assigned_program",
+    "assigned_college", "accepted_at_choice", "acceptance_reason", "acceptance_order",
+]
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Response bodies live in this namespace of the process cache manager, keyed by ETag
+RESPONSE_NAMESPACE = "api_responses"
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ── Shared state
+# The dashboard publishes its cached dataset, filter index and latest admission
+# plan here; the server thread only reads. Each publish swaps one tuple, so a
+# request always sees a consistent (dataset, index) pair.
+
+_dataset_state: tuple | None = None   # (version, FilterIndex)
+_plan_state: tuple | None = None      # (version, accepted plan DataFrame)
+_attached_segment: str | None = None  # shared-store segment behind _dataset_state, if any
+_state_lock = threading.Lock()
+
+
+def publish_dataset(filter_index: FilterIndex) -> None:
+    global _dataset_state, _attached_segment
+    if _dataset_state is None or _dataset_state[1] is not filter_index:
+        _dataset_state, _attached_segment = (filter_index.version, filter_index), None
+
+
+def publish_plan(results_df: pd.DataFrame) -> None:
+    """Expose the accepted applicants of the current admission plan at /admission-plan."""
+    global _plan_state
+    accepted = results_df.loc[results_df["accepted"], [c for c in PLAN_COLUMNS if c in results_df]]
+    accepted = accepted.sort_values("acceptance_order")
+    digest = pd.util.hash_pandas_object(accepted, index=False).to_numpy()
+    version = hashlib.sha1(digest.tobytes()).hexdigest()[:16]
+    if _plan_state is None or _plan_state[0] != version:
+        _plan_state = (version, accepted)
+
+
+def _current_index() -> tuple:
+    """Published (version, index).
+
+    Standalone, the API attaches to the shared dataset store when a segment is
+    published there (following later switch-overs), and otherwise loads the
+    dataset itself on first use.
+    """
+    global _dataset_state, _attached_segment
+    if _dataset_state is None or _attached_segment is not None:
+        segment = shared_store.current_segment()
+        if segment is not None and segment != _attached_segment:
+            with _state_lock:
+                index = shared_store.attach(segment).filter_index
+                _dataset_state, _attached_segment = (index.version, index), segment
+    if _dataset_state is None:
+        with _state_lock:
+            if _dataset_state is None:
+                from ingest import ingest_sources, load_manifest
+
+                index = FilterIndex(ingest_sources(load_manifest()))
+                _dataset_state = (index.version, index)
+    return _dataset_state
+
+
+# ── Query handling
+
+def _records(frame: pd.DataFrame) -> list[dict]:
+    """JSON-safe records (NaN/NA become null, numpy scalars become Python numbers)."""
+    return json.loads(frame.to_json(orient="records", force_ascii=False))
+
+
+def parse_filters(params: dict, index: FilterIndex) -> tuple[dict, tuple]:
+    selections = {column: params.get(column, ALL_OPTION) for column in FILTER_COLUMNS}
+    try:
+        gpa_range = (
+            float(params.get("gpa_min", index.gpa_min)),
+            float(params.get("gpa_max", index.gpa_max)),
+        )
+    except ValueError:
+        raise ApiError(400, "gpa_min and gpa_max must be numbers")
+    return selections, gpa_range
+
+
+def gpa_summary(gpa: pd.Series) -> dict:
+    gpa = gpa.dropna()
+    if gpa.empty:
+        return {"count": 0}
+    q25, median, q75 = np.percentile(gpa, [25, 50, 75])
+    return {
+        "count": int(len(gpa)),
+        "mean": round(float(gpa.mean()), 4),
+        "std": round(float(gpa.std()), 4) if len(gpa) > 1 else 0.0,
+        "min": float(gpa.min()),
+        "p25": round(float(q25), 4),
+        "median": round(float(median), 4),
+        "p75": round(float(q75), 4),
+        "max": float(gpa.max()),
+    }
+
+
+def aggregates(filtered: pd.DataFrame, dimensions: list[str]) -> dict:
+    groups = {}
+    for dimension in dimensions:
+        grouped = filtered.groupby(dimension)["gpa"].agg(["size", "mean"])
+        grouped = grouped.sort_values("size", ascending=False).round(4).reset_index()
+        grouped.columns = ["value", "count", "gpa_mean"]
+        groups[dimension] = _records(grouped)
+    return {"total": len(filtered), "gpa": gpa_summary(filtered["gpa"]), "groups": groups}
+
+
+def handle_query(path: str, params: dict) -> tuple[str, dict]:
+    """Route one GET request; returns (version the response depends on, payload)."""
+    if path == "/admission-plan":
+        if _plan_state is None:
+            raise ApiError(404, "No admission plan has been computed in the dashboard yet")
+        version, plan = _plan_state
+        return version, {"version": version, "accepted": len(plan), "rows": _records(plan)}
+
+    version, index = _current_index()
+    if path == "/meta":
+        return version, {
+            "version": version,
+            "rows": len(index.df),
+            "filters": {column: index.options(column) for column in FILTER_COLUMNS},
+            "gpa_range": [index.gpa_min, index.gpa_max],
+        }
+
+    unknown = set(params) - set(FILTER_COLUMNS) - {"gpa_min", "gpa_max", "by", "page", "page_size"}
+    if unknown:
+        raise ApiError(400, f"Unknown parameters: {', '.join(sorted(unknown))}")
+    selections, gpa_range = parse_filters(params, index)
+    filtered = index.filter(selections, gpa_range)
+
+    if path == "/aggregates":
+        dimensions = params["by"].split(",") if params.get("by") else DEFAULT_DIMENSIONS
+        invalid = [d for d in dimensions if d not in AGGREGATE_DIMENSIONS]
+        if invalid:
+            raise ApiError(400, f"Unsupported dimensions: {', '.join(invalid)}")
+        return version, {"version": version, **aggregates(filtered, dimensions)}
+
+    if path == "/rows":
+        try:
+            page = max(int(params.get("page", 1)), 1)
+            page_size = min(max(int(params.get("page_size", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            raise ApiError(400, "page and page_size must be integers")
+        rows = filtered.iloc[(page - 1) * page_size: page * page_size][ROW_COLUMNS]
+        return version, {
+            "version": version,
+            "total": len(filtered),
+            "page": page,
+            "page_size": page_size,
+            "pages": -(-len(filtered) // page_size),
+            "rows": _records(rows),
+        }
+
+    raise ApiError(404, f"Unknown endpoint: {API_PREFIX}{path}")
+
+
+def _etag(path: str, params: dict, version: str) -> str:
+    query = "&".join(f"{key}={params[key]}" for key in sorted(params))
+    return '"' + hashlib.sha1(f"{version}|{path}|{query}".encode()).hexdigest()[:20] + '"'
+
+
+def _cached_response(path: str, params: dict) -> tuple[str, bytes]:
+    """(ETag, body) for a query, memoized per dataset/plan version and query."""
+    version = _plan_state[0] if path == "/admission-plan" and _plan_state else _current_index()[0]
+    etag = _etag(path, params, version)
+    manager = get_cache_manager()
+    body = manager.get(RESPONSE_NAMESPACE, etag)
+    if body is not None:
+        return etag, body
+    start = time.perf_counter()
+    served_version, payload = handle_query(path, params)
+    # The dataset may have been republished meanwhile; key the body by what it was built from
+    etag = _etag(path, params, served_version)
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    manager.put(RESPONSE_NAMESPACE, etag, body, time.perf_counter() - start)
+    return etag, body
+
+
+# ── ASGI application
+
+async def _send_json(send, status: int, body: bytes, extra_headers: list | None = None,
+                     head: bool = False) -> None:
+    """Send a JSON response; for HEAD (``head``) the headers describe ``body`` but it is not sent."""
+    headers = [
+        (b"content-type", b"application/json; charset=utf-8"),
+        (b"content-length", str(len(body)).encode()),
+        # Clients may keep responses but must revalidate them with If-None-Match
+        (b"cache-control", b"no-cache"),
+        *(extra_headers or []),
+    ]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": b"" if head else body})
+
+
+async def app(scope, receive, send):
+    """ASGI entry point (``uvicorn api:app`` works as well as ``python api.py``)."""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["method"] not in ("GET", "HEAD"):
+        await _send_json(send, 405, b'{"error": "Only GET is supported"}')
+        return
+    head = scope["method"] == "HEAD"
+    path = scope["path"]
+    if not path.startswith(API_PREFIX):
+        await _send_json(send, 404, b'{"error": "Not found"}', head=head)
+        return
+    params = dict(parse_qsl(scope["query_string"].decode("utf-8"), keep_blank_values=False))
+    try:
+        # Filtering and grouping are CPU work; keep the event loop free for other requests
+        etag, body = await asyncio.to_thread(_cached_response, path[len(API_PREFIX):] or "/", params)
+    except ApiError as e:
+        await _send_json(send, e.status, json.dumps({"error": str(e)}, ensure_ascii=False).encode(), head=head)
+        return
+    except Exception:
+        # Answer instead of letting the server drop the connection; the details go to the log
+        traceback.print_exc()
+        await _send_json(send, 500, b'{"error": "Internal server error"}', head=head)
+        return
+    request_headers = dict(scope.get("headers", []))
+    if request_headers.get(b"if-none-match", b"").decode() == etag:
+        await send({"type": "http.response.start", "status": 304,
+                    "headers": [(b"etag", etag.encode()), (b"cache-control", b"no-cache")]})
+        await send({"type": "http.response.body", "body": b""})
+        return
+    await _send_json(send, 200, body, [(b"etag", etag.encode())], head=head)
+
+
+# ── Minimal HTTP/1.1 server (no dependencies beyond asyncio)
+
+async def _serve_connection(reader, writer, asgi_app) -> None:
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = []
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers.append((name.strip().lower().encode(), value.strip().encode("latin-1")))
+            header_map = dict(headers)
+            if int(header_map.get(b"content-length", 0)):
+                await reader.readexactly(int(header_map[b"content-length"]))
+
+            path, _, query = target.partition("?")
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                "method": method, "path": unquote(path), "raw_path": path.encode(),
+                "query_string": query.encode("latin-1"), "headers": headers,
+            }
+            response: dict = {}
+            body = []
+
+            async def receive():
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    response.update(message)
+                else:
+                    body.append(message.get("body", b""))
+
+            await asgi_app(scope, receive, send)
+            status = response["status"]
+            head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+            head += [f"{k.decode()}: {v.decode('latin-1')}" for k, v in response.get("headers", [])]
+            keep_alive = header_map.get(b"connection", b"").lower() != b"close"
+            head.append("connection: keep-alive" if keep_alive else "connection: close")
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + b"".join(body))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    server = await asyncio.start_server(lambda r, w: _serve_connection(r, w, app), host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def start_in_thread(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> threading.Thread:
+    """Run the API on a daemon thread with its own event loop (used inside the dashboard)."""
+    thread = threading.Thread(target=asyncio.run, args=(serve(host, port),), name="dashboard-api", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    host = args[args.index("--host") + 1] if "--host" in args else DEFAULT_HOST
+    port = int(args[args.index("--port") + 1]) if "--port" in args else DEFAULT_PORT
+    print(f"Serving {API_PREFIX} on http://{host}:{port}")
+    asyncio.run(serve(host, port))
@@ -1,19 +1,70 @@
+import hashlib
+import inspect
+import os
+from functools import partial
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from datetime import datetime
 import numpy as np
 from utils import (
-    map_country,
-    map_continent,
-    categorize_status,
-    parse_hijri_year,
-    format_hijri_date,
-    map_gender,
     format_plot,
-    ARABIC_TO_ENGLISH
+    LazyModule,
+    ARABIC_TO_ENGLISH,
+    ENGLISH_TO_ARABIC,
+    UNDEFINED_AR
+)
+from charts import (
+    STAT_CARD_HTML,
+    summary_stats,
+    dashboard_figures,
+    gpa_hours_density_figure,
+)
+from ingest import load_manifest, ingest_sources, MANIFEST_PATH
+from delta_ingest import LiveDataset
+from disciplines import DisciplineIndex
+from filters import FilterIndex, ALL_OPTION
+from density import DensityBins
+from dedup import DuplicateIndex
+from forecasting import FORECAST_HORIZON, EnrollmentForecast
+from approximate import StratifiedSample, APPROXIMATE_THRESHOLD, WEIGHT_COLUMN
+from drilldown import DRILL_LEVELS, DRILL_LABELS, build_cube, next_level, summarize, valid_path, apply_path
+import api
+import shared_store
+from shared_store import SharedDataset
+from ranking import DEFAULT_WEIGHTS
+from render_scheduler import RenderScheduler
+from cache_manager import cached, get_cache_manager, frame_digest
+from prewarm import FigureCache, Prewarmer, figure_key
+from usage_log import combination, log_usage
+from figure_specs import rtl_template
+from yield_simulation import estimate_yield_rates, applicant_yield, simulate_yield, waitlist_limit
+from applicants import (
+    read_applicant_header,
+    resolve_applicant_columns,
+    read_applicants,
+)
+from admission import (
+    PreparedApplicants,
+    IncrementalAllocator,
+    evaluate_scenarios,
+    scenario_summary,
+    scenario_distribution,
+    scenario_flips,
+    scenario_flip_matrix,
 )
 
+# plotly.express is the slowest import; defer it until the first chart is built
+px = LazyModule("plotly.express")
+
+CSS_PATH = "assets/style.css"
+# Set to serve the JSON API (api.py) from this process, sharing its dataset and caches
+API_PORT = int(os.environ.get("DASHBOARD_API_PORT", 0))
+# Set to attach to the memory-mapped dataset shared by all server processes (shared_store.py)
+SHARED_MODE = "DASHBOARD_SHARED_DIR" in os.environ
+# Set to follow new registrar exports by applying row deltas instead of reloading (delta_ingest.py)
+DELTA_MODE = "DASHBOARD_DELTA_INGEST" in os.environ
+
 # Page configuration
 st.set_page_config(
     page_title="لوحة معلومات الطلاب الدوليين",
@@ -22,650 +73,696 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS to mimic an AdminKit-like layout with RTL support
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap');
+# Custom CSS to mimic an AdminKit-like layout with RTL support.
+# Read once per process; Streamlit drops elements that a rerun does not emit,
+# so the cached stylesheet is still written on every run.
+@st.cache_resource
+def load_css() -> str:
+    with open(CSS_PATH, encoding="utf-8") as f:
+        return f"<style>{f.read()}</style>"
 
-    :root {
-        --primary: #0d6efd;
-        --surface: #ffffff;
-        --muted: #6b7280;
-        --border: #e5e7eb;
-    }
 
-    /* Apply RTL to the main app container */
-    .stApp {
-        direction: rtl;
-        text-align: right;
-        font-family: 'Inter', sans-serif;
-    }
+st.markdown(load_css(), unsafe_allow_html=True)
 
-    body {
-        background: #f5f7fb;
-        color: #111827;
-    }
 
-    /* Selectbox text visibility */
-/* Main area (light background): keep text dark */
-.stSelectbox div[data-baseweb="select"] > div,
-.stSelectbox div[data-baseweb="select"] span,
-.stSelectbox div[data-baseweb="select"] input {
-    color: #111827 !important;
-    -webkit-text-fill-color: #111827 !important;
-    caret-color: #111827 !important;
-}
+# Load data
+@cached("dataset", pinned=True)
+def load_data():
+    """(dataset, data-quality report), loaded once and shared by every session without copies."""
+    try:
+        with st.spinner("جارٍ تحميل البيانات..."):
+            df, _, _, quality = ingest_sources(load_manifest(), with_details=True)
+        return df, quality
+    except FileNotFoundError as e:
+        st.error(f"❌ ملف البيانات غير موجود! يرجى التأكد من وجود '{e.filename or MANIFEST_PATH}'.")
+        st.stop()
+    except Exception as e:
+        st.error(f"❌ خطأ في تحميل البيانات: {str(e)}")
+        st.stop()
 
-/* Sidebar selectboxes: white background + black text */
-[data-testid="stSidebar"] .stSelectbox div[data-baseweb="select"] > div,
-[data-testid="stSidebar"] .stSelectbox div[data-baseweb="select"] span,
-[data-testid="stSidebar"] .stSelectbox div[data-baseweb="select"] input {
-    color: #000000 !important;
-    -webkit-text-fill-color: #e5e7eb !important;
-    caret-color: #000000 !important;
-}
-/* Force input text color and background - Aggressive override */
-    input,
-    input[type="text"],
-    .stTextInput input,
-    .stNumberInput input,
-    div[data-baseweb="input"] input {
-        color: #000000 !important;
-        -webkit-text-fill-color: #000000 !important;
-        caret-color: #000000 !important;
-        background-color: #ffffff !important;
-    }
 
-    /* Placeholder styling */
-    .stTextInput input::placeholder,
-    .stNumberInput input::placeholder {
-        color: #6b7280 !important;
-        opacity: 1 !important;
-        -webkit-text-fill-color: #6b7280 !important;
-    }
+@st.cache_resource
+def get_live_dataset() -> LiveDataset:
+    """Dataset that follows source file changes by applying deltas, once per process."""
+    try:
+        return LiveDataset()
+    except FileNotFoundError as e:
+        st.error(f"❌ ملف البيانات غير موجود! يرجى التأكد من وجود '{e.filename or MANIFEST_PATH}'.")
+        st.stop()
+    except Exception as e:
+        st.error(f"❌ خطأ في تحميل البيانات: {str(e)}")
+        st.stop()
 
-    /* Dropdown menu: full RTL for container, list, and items */
-ul[data-baseweb="menu"],
-[role="listbox"] {
-    direction: rtl !important;
-    text-align: right !important;
-}
-ul[data-baseweb="menu"] li,
-[role="option"] {
-    direction: rtl !important;
-    text-align: right !important;
-    color: #000000 !important;
-    -webkit-text-fill-color: #000000 !important;
-}
-ul[data-baseweb="menu"] li span,
-ul[data-baseweb="menu"] li div,
-[role="option"] span,
-[role="option"] div {
-    direction: rtl !important;
-    text-align: right !important;
-}
-[data-baseweb="popover"] {
-    direction: rtl !important;
-}
 
-/* Fix Plotly Overlaps: Force LTR for the chart container to prevent coordinate flipping bugs */
-    .js-plotly-plot, .plot-container {
-        direction: ltr !important;
-    }
+@st.cache_resource(max_entries=2)
+def attach_shared_dataset(segment: str) -> SharedDataset:
+    """Attach a published segment once per process; a new segment gets a new entry."""
+    return shared_store.attach(segment)
 
-    /* Ensure tooltips are readable */
-    .js-plotly-plot .plotly .hovertext text {
-        text-anchor: start !important;
-    }
 
-    /* Fix Streamlit slider interaction issues in RTL */
-    .stSlider {
-        direction: ltr !important;
-    }
+def get_dataset() -> tuple:
+    """(dataset, filter index, full-dataset drill cube or None, quality report or None).
 
-    /* Re-align slider label to right */
-    .stSlider label {
-        direction: rtl !important;
-        text-align: right !important;
-        width: 100%;
-    }
+    With DASHBOARD_SHARED_DIR set, every server process attaches read-only to
+    the dataset published there (the first process publishes it if needed)
+    and follows the CURRENT pointer, so a republish switches all of them over.
+    With DASHBOARD_DELTA_INGEST set, changed source files are applied as
+    inserts/updates/deletes by student id on the next rerun.
+    """
+    if SHARED_MODE:
+        segment = shared_store.current_segment()
+        if segment is None:
+            df, quality = load_data()
+            segment = f"v-{shared_store.publish(df, quality=quality)}"
+        shared = attach_shared_dataset(segment)
+        return shared.frame, shared.filter_index, shared.cube, shared.quality
+    if DELTA_MODE:
+        live = get_live_dataset()
+        try:
+            changes = live.refresh()
+        except Exception as e:
+            # Keep serving the last good version until the export can be read
+            st.warning(f"⚠️ تعذر تطبيق تحديث البيانات: {str(e)}")
+            changes = []
+        for change in changes:
+            st.toast(
+                f"🔄 تحديث البيانات ({change['source']}): {change['inserted']:,} إضافة، "
+                f"{change['updated']:,} تعديل، {change['deleted']:,} حذف خلال {change['seconds']:.2f} ث"
+            )
+        return live.snapshot()
+    df, quality = load_data()
+    return df, get_filter_index(df, df.attrs.get("version", "")), None, quality
 
-    /* Fix sidebar collapse button position for RTL - move to right side */
-    [data-testid="collapsedControl"] {
-        left: auto !important;
-        right: 0.5rem !important;
-    }
 
-/* Plotly hover tooltip – restored to previous working state */
-.js-plotly-plot .hoverlayer .hovertext text {
-    text-anchor: end !important;
-}
-.js-plotly-plot .hoverlayer .hovertext rect {
-    rx: 4;
-    ry: 4;
-}
+@cached("indexes")
+def get_stratified_sample(_df: pd.DataFrame, version: str) -> StratifiedSample:
+    """Weighted stratified sample for approximate charts, drawn once per dataset version."""
+    return StratifiedSample(_df)
 
-    /* Hide undefined text in Plotly legend/annotation areas */
-    .js-plotly-plot .infolayer .legend .legendtext,
-    .js-plotly-plot .infolayer .gtitle {
-        visibility: hidden !important;
-    }
 
-    .block-container {
-        padding-top: 1.2rem;
-        padding-bottom: 2rem;
-    }
+@cached("indexes")
+def get_density_bins(_df: pd.DataFrame, version: str) -> DensityBins:
+    """GPA × earned-hours bin edges and per-row bins, computed once per dataset version."""
+    return DensityBins(_df)
 
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #111827 0%, #0b1220 100%);
-        color: #e5e7eb;
-        border-right: 1px solid rgba(255, 255, 255, 0.08);
-    }
-    [data-testid="stSidebar"] * {
-        color: #e5e7eb !important;
-    }
-    [data-testid="stSidebar"] [data-testid="stSidebarNavLink"] {
-        border-radius: 10px;
-    }
 
-    /* Sidebar inputs */
-[data-testid="stSidebar"] .stSelectbox div[data-baseweb="select"] {
-    background-color: #ffffff !important;
-}
+@cached("indexes")
+def get_enrollment_forecast(_df: pd.DataFrame, version: str) -> EnrollmentForecast:
+    """Yearly intake per country and college and its projection, fitted once per dataset version."""
+    return EnrollmentForecast(_df)
 
-/* Sidebar selectbox: ensure inner control is white so black text is readable */
-[data-testid="stSidebar"] .stSelectbox div[data-baseweb="select"] > div {
-    background: #ffffff !important;
-}
-/* (Text color handled in the "Sidebar (dark background)" block above) */
-/* Stat cards */
-    .stat-card {
-        background: var(--surface);
-        border: 1px solid var(--border);
-        border-radius: 14px;
-        padding: 16px 18px;
-        box-shadow: 0 10px 30px rgba(17, 24, 39, 0.08);
-        display: flex;
-        gap: 12px;
-        align-items: center;
-        height: 100%;
-        transition: transform 0.1s ease, box-shadow 0.2s ease;
-    }
-    .stat-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 12px 32px rgba(17, 24, 39, 0.12);
-    }
-    .stat-icon {
-        width: 42px;
-        height: 42px;
-        border-radius: 12px;
-        background: rgba(13, 110, 253, 0.12);
-        color: var(--accent, var(--primary));
-        display: grid;
-        place-items: center;
-        font-size: 18px;
-        font-weight: 700;
-        flex-shrink: 0;
-    }
-    .stat-content {
-        flex: 1;
-        text-align: right;
-        direction: rtl;
-    }
-    .stat-content p {
-        margin: 0;
-        color: var(--muted);
-        font-weight: 600;
-        font-size: 13px;
-    }
-    .stat-content h3 {
-        margin: 2px 0 0;
-        font-size: 24px;
-        color: #111827;
-        font-weight: 700;
-    }
 
-    /* Tabs */
-    .stTabs [role="tablist"] {
-        gap: 0.5rem;
-    }
-    .stTabs [role="tab"] {
-        background: #ffffff;
-        border: 1px solid var(--border);
-        border-radius: 12px;
-        padding: 10px 14px;
-        color: #111827;
-        font-weight: 600;
-    }
-    .stTabs [role="tab"][aria-selected="true"] {
-        background: var(--primary);
-        color: #ffffff;
-        border-color: var(--primary);
-        box-shadow: 0 8px 20px rgba(13, 110, 253, 0.2);
-    }
+@cached("indexes")
+def get_duplicate_index(_df: pd.DataFrame, version: str) -> DuplicateIndex:
+    """Probable duplicate-student clusters, resolved once per dataset version."""
+    with st.spinner("جارٍ البحث عن السجلات المكررة..."):
+        return DuplicateIndex(_df)
 
-    /* Chart & table containers */
-    [data-testid="stDataFrame"] {
-        border: 1px solid var(--border);
-        border-radius: 12px;
-        box-shadow: 0 8px 24px rgba(17, 24, 39, 0.06);
-    }
-    .element-container:has(.plotly) {
-        background: var(--surface);
-        border-radius: 14px;
-        padding: 12px 12px 4px;
-        border: 1px solid var(--border);
-        box-shadow: 0 8px 24px rgba(17, 24, 39, 0.06);
-    }
 
-    .divider {
-        margin: 18px 0;
-        border-bottom: 1px solid var(--border);
-    }
+@cached("indexes")
+def get_filter_index(_df: pd.DataFrame, version: str) -> FilterIndex:
+    """Per-value row positions for the sidebar filters, built once per dataset version."""
+    return FilterIndex(_df)
 
-    /* Hide header anchor links */
-    [data-testid="stHeaderActionElements"] {
-        display: none !important;
-    }
 
-    /* Hide all anchor tags inside headers */
-    h1 a, h2 a, h3 a, h4 a, h5 a, h6 a {
-        display: none !important;
-    }
+@st.cache_resource
+def get_figure_cache() -> FigureCache:
+    """Built tab 1-3 figure sets, shared by all sessions of this process."""
+    return FigureCache()
 
-    /* Hide anchor links by href pattern (internal links) */
-    a[href^="#"] {
-        display: none !important;
-    }
 
-    /* Hide specific anchor class if present */
-    a.anchor-link {
-        display: none !important;
-    }
+@st.cache_resource
+def get_prewarmer() -> Prewarmer:
+    """Background builder of the most used combinations' figures, once per process."""
+    return Prewarmer(get_figure_cache())
 
-    /* Hide anchor links (chain icon) next to headers */
-    [data-testid="stMarkdownContainer"] h1 a,
-    [data-testid="stMarkdownContainer"] h2 a,
-    [data-testid="stMarkdownContainer"] h3 a,
-    [data-testid="stMarkdownContainer"] h4 a,
-    [data-testid="stMarkdownContainer"] h5 a,
-    [data-testid="stMarkdownContainer"] h6 a {
-        display: none !important;
-    }
-    /* Sidebar input text should be light on dark sidebar */
-[data-testid="stSidebar"] input,
-[data-testid="stSidebar"] textarea,
-[data-testid="stSidebar"] div[data-baseweb="input"] input,
-[data-testid="stSidebar"] div[data-baseweb="select"] input {
-  color: #e5e7eb !important;
-  -webkit-text-fill-color: #e5e7eb !important;
-  caret-color: #e5e7eb !important;
-  background: rgba(255, 255, 255, 0.08) !important;
-}
 
-/* Sidebar placeholders */
-[data-testid="stSidebar"] input::placeholder,
-[data-testid="stSidebar"] textarea::placeholder {
-  color: rgba(229, 231, 235, 0.65) !important;
-  -webkit-text-fill-color: rgba(229, 231, 235, 0.65) !important;
-  opacity: 1 !important;
+@st.cache_resource
+def start_api(port: int):
+    """Start the JSON API on a background thread once per server process."""
+    return api.start_in_thread(port=port)
+
+
+@cached("indexes")
+def get_discipline_index(_df: pd.DataFrame, version: str) -> DisciplineIndex:
+    """Discipline -> program index, built once per dataset version and shared across uploads."""
+    return DisciplineIndex(_df)
+
+
+@cached("exports")
+def export_csv(_frame: pd.DataFrame, digest: str) -> bytes:
+    """UTF-8 CSV (with BOM, for Excel) of a table, cached by its content hash."""
+    return _frame.to_csv(index=False).encode("utf-8-sig")
+
+
+@cached("applicants")
+def parse_applicants(file_bytes: bytes, rename: dict, _country_cache: dict | None = None):
+    """Chunked, validated parse of an uploaded applicant CSV (cached per file content).
+
+    ``_country_cache`` carries nationality mappings over from earlier uploads.
+    """
+    with st.spinner("جارٍ قراءة ملف المتقدمين..."):
+        return read_applicants(file_bytes, rename, country_cache=_country_cache)
+
+
+VALIDATION_ISSUE_LABELS = {
+    "missing_id": "رقم متقدم مفقود",
+    "duplicate_id": "رقم متقدم مكرر",
+    "missing_nationality": "جنسية مفقودة",
+    "unknown_nationality": "جنسية غير معروفة",
+    "empty_choices": "لا توجد تخصصات مختارة",
 }
-div[data-baseweb="popover"] input {
-  color: #111827 !important;
-  -webkit-text-fill-color: #111827 !important;
-  background: #ffffff !important;
+
+
+QUALITY_ISSUE_LABELS = {
+    "gpa_not_numeric": "معدل غير رقمي",
+    "gpa_out_of_range": "معدل خارج النطاق (0-5)",
+    "hours_not_numeric": "ساعات غير رقمية",
+    "negative_hours": "ساعات سالبة",
+    "duplicate_id": "رقم جامعي مكرر",
+    "unmapped_nationality": "جنسية غير معرّفة في جدول الدول",
+    "unparseable_term_admit": "فصل قبول غير مقروء",
+    "unparseable_last_term": "آخر فصل غير مقروء",
+    "last_term_before_admit": "آخر فصل يسبق فصل القبول",
 }
-/* === FINAL OVERRIDES (must be last) === */
-/* Sidebar selectboxes: force true black */
-[data-testid="stSidebar"] .stSelectbox div[data-baseweb="select"] * {
-  color: #000000 !important;
-  -webkit-text-fill-color: #000000 !important;
-  opacity: 1 !important;
+
+
+def render_validation_report(report: dict, labels: dict = VALIDATION_ISSUE_LABELS,
+                             title: str = "تقرير التحقق من الملف", expanded: bool | None = None):
+    """Show row-level validation counts and sample rows (an applicant upload by default)."""
+    total_issues = sum(report["counts"].values())
+    title = f"{title} ({report['rows']:,} صف، {total_issues:,} ملاحظة)"
+    with st.expander(title, expanded=total_issues > 0 if expanded is None else expanded):
+        if not total_issues:
+            st.success("لم يتم العثور على أخطاء في صفوف الملف.")
+            return
+        counts_df = pd.DataFrame([
+            {"المشكلة": labels[issue], "عدد الصفوف": count}
+            for issue, count in report["counts"].items() if count
+        ])
+        st.dataframe(counts_df, use_container_width=True, hide_index=True)
+        for issue, samples in report["samples"].items():
+            if samples:
+                st.caption(f"أمثلة: {labels[issue]}")
+                st.dataframe(pd.DataFrame(samples), use_container_width=True, hide_index=True)
+
+
+FORECAST_COLUMN_LABELS = {
+    "last": "آخر سنة",
+    "forecast": "التوقع",
+    "low": "الحد الأدنى",
+    "high": "الحد الأعلى",
 }
-[data-testid="stSidebar"] .stSelectbox div[data-baseweb="select"] > div {
-  background: #ffffff !important;
+# Rows of the suggestion tables, and suggested countries applied as targets at once
+SUGGESTED_TARGET_ROWS = 15
+SUGGESTED_TARGETS = 5
+
+CHANGE_COLUMN_LABELS = {
+    "applicant_id": "رقم المتقدم",
+    "mapped_nationality": "الجنسية",
+    "change": "التغيير",
+    "discipline_before": "التخصص سابقاً",
+    "discipline_after": "التخصص حالياً",
 }
 
-/* If dropdown/search renders in a popover outside sidebar DOM */
-div[data-baseweb="popover"] div[data-baseweb="select"] * ,
-div[data-baseweb="popover"] div[data-baseweb="select"] input {
-  color: #000000 !important;
-  -webkit-text-fill-color: #000000 !important;
-  opacity: 1 !important;
-}
 
-    /* ── RTL fixes for acceptance plan tab components ── */
+def render_upload_revision(summary: dict, changes: pd.DataFrame):
+    """What a revised applicant file changed: rows by ID, and the acceptances that moved."""
+    st.info(
+        f"ملف معدَّل: {summary['new']:,} متقدم جديد، {summary['changed']:,} معدَّل، "
+        f"{summary['removed']:,} محذوف، و{summary['unchanged']:,} دون تغيير. "
+        f"أُعيدت مطابقة وترتيب {summary['reranked']:,} صف فقط، وحُدِّثت خطة القبول السابقة."
+    )
+    with st.expander(f"القبولات التي تغيّرت بعد التعديل ({len(changes):,})", expanded=False):
+        if changes.empty:
+            st.success("لم تتغير أي قبولات.")
+        else:
+            st.dataframe(changes.rename(columns=CHANGE_COLUMN_LABELS), use_container_width=True, hide_index=True)
 
-    /* Selectbox: RTL dropdown control and menu */
-    .stSelectbox [data-baseweb="select"] > div {
-        direction: rtl !important;
-        text-align: right !important;
-    }
-    .stSelectbox [data-baseweb="select"] [data-baseweb="icon"] {
-        order: -1;
-    }
 
-    /* Multiselect: RTL tags and search input */
-    .stMultiSelect [data-baseweb="select"] > div {
-        direction: rtl !important;
-        text-align: right !important;
-    }
-    .stMultiSelect [data-baseweb="tag"] {
-        direction: rtl;
-    }
+@cached("yield_simulations")
+def run_yield_simulation(probabilities, seats, n_planned, n_sims, confidence, group_codes):
+    with st.spinner("جارٍ تشغيل المحاكاة..."):
+        return simulate_yield(probabilities, seats, n_planned, n_sims, confidence, group_codes, seed=0)
 
-    /* Number input: RTL layout for container and label.
-       BaseWeb sets direction:ltr on [data-baseweb="input"] internally,
-       so we override it here, then re-force the <input> to LTR so
-       digits still render in the correct order. */
-    div[data-testid="stNumberInput"],
-    div[data-testid="stNumberInput"] > div,
-    div[data-testid="stNumberInput"] [data-baseweb="form-control"],
-    div[data-testid="stNumberInput"] [data-baseweb="input"] {
-        direction: rtl !important;
-        text-align: right !important;
-    }
-    div[data-testid="stNumberInput"] label,
-    div[data-testid="stNumberInput"] p {
-        direction: rtl !important;
-        text-align: right !important;
-        width: 100% !important;
-        display: block !important;
-    }
-    /* Keep the actual number value LTR inside the box */
-    div[data-testid="stNumberInput"] input[type="number"] {
-        direction: ltr !important;
-        text-align: right !important;
-    }
 
-    /* File uploader: RTL label and drop zone */
-    [data-testid="stFileUploader"] {
-        direction: rtl;
-        text-align: right;
-    }
-    [data-testid="stFileUploader"] label,
-    [data-testid="stFileUploaderDropzone"] {
-        direction: rtl;
-        text-align: right;
-    }
-    [data-testid="stFileUploaderDropzoneInstructions"] {
-        direction: rtl;
-        text-align: right;
-    }
+def render_yield_simulation(results_df: pd.DataFrame, students_df: pd.DataFrame,
+                            intl_seats: int, discipline_index: DisciplineIndex):
+    """Monte Carlo seat-fill report for the suggested plan, with editable yield rates."""
+    st.markdown("#### محاكاة الالتحاق الفعلي")
+    st.caption(
+        "تُقدَّر نسبة الالتحاق تاريخياً من حالات (إنسحاب قبول، معتذر، مؤجل) ويمكن تعديلها يدوياً. "
+        "يُرتَّب المتقدمون: المقبولون أولاً ثم قائمة الانتظار حسب نقاط التوازن الجغرافي."
+    )
 
-    /* Metric: RTL label and value */
-    [data-testid="stMetric"],
-    [data-testid="metric-container"] {
-        direction: rtl;
-        text-align: right;
-    }
+    # Acceptance order: planned admits first, then the waitlist in phase-2 priority
+    accepted = results_df[results_df["accepted"]]
+    waitlist = results_df[~results_df["accepted"]].sort_values("rank_score", ascending=False, kind="stable")
+    candidates = pd.concat([accepted, waitlist])
+    candidate_program = candidates["assigned_program"].where(
+        candidates["assigned_program"] != "", discipline_index.map_programs(candidates["disc1"])
+    )
 
-    /* Alert boxes (info / warning / error) */
-    [data-testid="stAlert"],
-    [data-testid="stAlert"] * {
-        direction: rtl;
-        text-align: right;
-    }
+    s1, s2, s3 = st.columns(3)
+    basis = s1.selectbox("أساس تقدير نسبة الالتحاق", ["الجنسية", "التخصص"], key="yield_basis")
+    n_sims = s2.select_slider("عدد مرات المحاكاة", options=[10_000, 25_000, 50_000, 100_000, 200_000],
+                              value=100_000, key="yield_n_sims")
+    confidence = s3.slider("مستوى الثقة لملء المقاعد", 0.5, 0.99, 0.9, 0.01, key="yield_confidence")
+
+    if basis == "الجنسية":
+        groups = candidates["mapped_nationality"]
+        rates, overall = estimate_yield_rates(students_df, "country")
+    else:
+        groups = candidate_program.fillna(UNDEFINED_AR)
+        rates, overall = estimate_yield_rates(students_df, "program")
+
+    rates_df = groups.value_counts().rename_axis("group").reset_index(name="applicants")
+    rates_df["rate"] = rates_df["group"].map(rates).fillna(overall).round(3)
+    edited = st.data_editor(
+        rates_df.rename(columns={"group": "المجموعة", "applicants": "عدد المرشحين", "rate": "نسبة الالتحاق"}),
+        column_config={
+            "نسبة الالتحاق": st.column_config.NumberColumn(min_value=0.0, max_value=1.0, step=0.01),
+        },
+        disabled=["المجموعة", "عدد المرشحين"],
+        hide_index=True,
+        use_container_width=True,
+        key=f"yield_rates_{basis}",
+    )
+    edited_rates = dict(zip(edited["المجموعة"], edited["نسبة الالتحاق"]))
+    probabilities = applicant_yield(groups, edited_rates, overall)
 
-    /* Caption */
-    [data-testid="stCaptionContainer"] {
-        direction: rtl;
-        text-align: right;
-    }
+    # The waitlist past the point where seats are certain to fill does not change the report
+    probabilities = probabilities[:waitlist_limit(probabilities, intl_seats, len(accepted))]
 
-    /* Buttons */
-    .stButton > button {
-        direction: rtl;
-    }
+    nationality_codes, nationality_names = pd.factorize(accepted["mapped_nationality"])
+    result = run_yield_simulation(
+        probabilities, intl_seats, len(accepted), n_sims, confidence, nationality_codes
+    )
 
-    /* Markdown content */
-    [data-testid="stMarkdownContainer"] {
-        direction: rtl;
-        text-align: right;
-    }
+    pct = result["planned_percentiles"]
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("متوسط الملتحقين المتوقع", f"{result['planned_mean']:,.1f}")
+    m2.metric("نطاق 5%–95%", f"{pct[5]:,} – {pct[95]:,}")
+    m3.metric("احتمال ملء جميع المقاعد", f"{result['planned_p_fill']:.1%}")
+    if result["recommended_admits"] is None:
+        m4.metric("القبول الزائد المقترح", "—")
+        st.warning("لا يكفي عدد المتقدمين لملء المقاعد بمستوى الثقة المطلوب.")
+    else:
+        m4.metric("القبول الزائد المقترح", f"+{result['over_admission']:,}",
+                  help=f"اقبل {result['recommended_admits']:,} متقدماً لملء {intl_seats:,} مقعداً "
+                       f"باحتمال {confidence:.0%} على الأقل.")
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown("##### توزيع عدد الملتحقين (الخطة الحالية)")
+        hist = result["planned_hist"]
+        dist_df = pd.DataFrame({"enrolled": np.arange(len(hist)), "probability": hist / result["n_sims"]})
+        dist_df = dist_df[dist_df["probability"] > 0]
+        fig_dist = px.bar(dist_df, x="enrolled", y="probability",
+                          labels={"enrolled": "عدد الملتحقين", "probability": "الاحتمال"})
+        fig_dist.update_traces(marker_color="#0d6efd", name="")
+        st.plotly_chart(format_plot(fig_dist), use_container_width=True)
+    with c2:
+        st.markdown("##### احتمال ملء المقاعد حسب عدد المقبولين")
+        fig_curve = px.line(result["curve"], x="admits", y="p_fill",
+                            labels={"admits": "عدد المقبولين", "p_fill": "احتمال ملء المقاعد"})
+        fig_curve.update_traces(line_color="#198754", name="")
+        fig_curve.add_hline(y=confidence, line_dash="dash", line_color="#f97316")
+        st.plotly_chart(format_plot(fig_curve), use_container_width=True)
+
+    bands = pd.DataFrame({
+        "الجنسية": nationality_names,
+        "المقبولون": np.bincount(nationality_codes, minlength=len(nationality_names)),
+        "المتوقع": np.round(result["group_means"], 1),
+        "P5": [p[5] for p in result["group_percentiles"]],
+        "P50": [p[50] for p in result["group_percentiles"]],
+        "P95": [p[95] for p in result["group_percentiles"]],
+    }).sort_values("المقبولون", ascending=False)
+    st.markdown("##### نطاقات الالتحاق حسب الجنسية")
+    st.dataframe(bands, use_container_width=True, hide_index=True)
+
+
+MAX_SCENARIOS = 5
+SCENARIO_COLUMNS = {"name": "اسم السيناريو", "seats": "المقاعد", "targets": "أهداف الجنسيات"}
+
+
+def format_targets(targets: dict) -> str:
+    return "، ".join(f"{country}:{count}" for country, count in targets.items())
+
+
+def parse_targets(text) -> dict:
+    """Parse "اليمن:50، مصر:20" (Arabic or English country names) into a targets dict."""
+    targets = {}
+    if pd.isna(text):
+        return targets
+    for part in str(text).replace("،", ",").split(","):
+        country, _, count = part.partition(":")
+        country = country.strip()
+        if country and count.strip().isdigit() and int(count) > 0:
+            targets[country] = int(count)
+    return targets
+
+
+def render_target_suggestions(forecast: EnrollmentForecast, intl_seats: int, countries: list):
+    """Next-year intake projected per country and college, with nationality targets proportional to it."""
+    next_year = forecast.future_years[0] if len(forecast.future_years) else ""
+    with st.expander(f"أهداف مقترحة من توقع الالتحاق لعام {next_year} هـ"):
+        st.caption(
+            f"توقع عدد المقبولين الجدد لكل دولة وكلية من آخر {len(forecast.years)} سنوات، مع فترة توقع "
+            "(95% تقريباً). الهدف المقترح يوزع المقاعد الدولية بنسبة التوقع لكل دولة."
+        )
+        table = forecast.table("country")
+        table = table[table["country"].isin(countries)]
+        share = table["forecast"] / table["forecast"].sum() if table["forecast"].sum() else 0 * table["forecast"]
+        table = table.assign(suggested=(share * intl_seats).round().astype(int))
+        top = table.head(SUGGESTED_TARGET_ROWS)
+        st.dataframe(top.rename(columns={**FORECAST_COLUMN_LABELS, "country": "الدولة",
+                                         "suggested": "الهدف المقترح"}),
+                     use_container_width=True, hide_index=True)
+        suggested = top[top["suggested"] > 0].head(SUGGESTED_TARGETS)
+        if st.button(f"استخدام أعلى {len(suggested)} دول كأهداف", disabled=suggested.empty,
+                     key="apply_suggested_targets"):
+            st.session_state.nat_targets = [
+                {"country": row.country, "target": int(row.suggested)} for row in suggested.itertuples()
+            ]
+            # Drop the old rows' widget state so the new targets show
+            for key in [k for k in st.session_state if str(k).startswith(("nat_country_", "nat_target_"))]:
+                del st.session_state[key]
+            st.rerun()
+        st.markdown("**التوقع حسب الكلية**")
+        st.dataframe(forecast.table("college").head(SUGGESTED_TARGET_ROWS).rename(
+            columns={**FORECAST_COLUMN_LABELS, "college": "الكلية"}),
+            use_container_width=True, hide_index=True)
+
+
+def render_scenario_workspace(intl_seats: int, country_targets_en: dict):
+    """Named seat/target configurations evaluated side by side on the shared applicant data."""
+    st.markdown("#### مقارنة السيناريوهات")
+    st.caption(
+        f"حتى {MAX_SCENARIOS} سيناريوهات. الأهداف بصيغة «الدولة:العدد» مفصولة بفواصل. "
+        "تُشارك السيناريوهات بيانات المتقدمين المعالجة، ويُستكمل كل سيناريو من حالته السابقة بعد التعديل."
+    )
+    if "scenario_base" not in st.session_state:
+        st.session_state.scenario_base = pd.DataFrame([{
+            "name": "الخطة الحالية", "seats": intl_seats, "targets": format_targets(country_targets_en),
+        }])
+    if st.button("+ أضف الإعدادات الحالية كسيناريو"):
+        base = st.session_state.get("scenario_edited", st.session_state.scenario_base)
+        new_row = {
+            "name": f"سيناريو {len(base) + 1}", "seats": intl_seats, "targets": format_targets(country_targets_en),
+        }
+        st.session_state.scenario_base = pd.concat([base, pd.DataFrame([new_row])], ignore_index=True)
+        st.session_state.pop("scenario_editor", None)
+
+    edited = st.data_editor(
+        st.session_state.scenario_base.rename(columns=SCENARIO_COLUMNS),
+        num_rows="dynamic",
+        column_config={
+            "المقاعد": st.column_config.NumberColumn(min_value=0, step=10),
+        },
+        hide_index=True,
+        use_container_width=True,
+        key="scenario_editor",
+    ).rename(columns={v: k for k, v in SCENARIO_COLUMNS.items()})
+    st.session_state.scenario_edited = edited
+
+    scenarios = []
+    for row in edited.dropna(subset=["name"]).head(MAX_SCENARIOS).itertuples():
+        name = str(row.name).strip()
+        if name and name not in {s["name"] for s in scenarios}:
+            seats = 0 if pd.isna(row.seats) else int(row.seats)
+            scenarios.append({"name": name, "seats": seats, "targets": parse_targets(row.targets)})
+    if len(scenarios) < 2:
+        st.info("أضف سيناريوهين على الأقل للمقارنة.")
+        return
+
+    # One allocator per scenario name, all sharing the prepared applicants
+    allocators = st.session_state.scenario_allocators
+    for scenario in scenarios:
+        if scenario["name"] not in allocators:
+            allocators[scenario["name"]] = IncrementalAllocator(st.session_state.prepared_applicants)
+    results = evaluate_scenarios(allocators, scenarios)
+
+    summary = scenario_summary(results)
+    summary["first_choice_share"] = summary["first_choice_share"].map(lambda v: f"{v:.0%}")
+    st.dataframe(
+        summary.rename(columns={
+            "scenario": "السيناريو", "accepted": "المقبولون", "nationalities": "عدد الجنسيات",
+            "disciplines": "عدد التخصصات", "first_choice_share": "نسبة القبول بالخيار الأول",
+        }),
+        use_container_width=True, hide_index=True,
+    )
 
-    /* Dataframe header and cells: RTL */
-    [data-testid="stDataFrame"] th,
-    [data-testid="stDataFrame"] td {
-        direction: rtl;
-        text-align: right !important;
-    }
+    c1, c2 = st.columns(2)
+    for col, column, title in [
+        (c1, "mapped_nationality", "توزيع المقبولين حسب الجنسية"),
+        (c2, "assigned_discipline", "توزيع المقبولين حسب التخصص"),
+    ]:
+        with col:
+            st.markdown(f"##### {title}")
+            dist = scenario_distribution(results, column)
+            fig = px.bar(dist, x="value", y="count", color="scenario", barmode="group",
+                         labels={"value": "", "count": "العدد", "scenario": "السيناريو"})
+            fig = format_plot(fig)
+            fig.update_layout(showlegend=True, legend=dict(orientation="h", y=1.1))
+            st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("##### عدد المتقدمين المختلفين بين كل سيناريوهين")
+    st.dataframe(scenario_flip_matrix(results), use_container_width=True)
+
+    names = list(results)
+    d1, d2 = st.columns(2)
+    first = d1.selectbox("السيناريو الأول", names, index=0, key="scenario_diff_first")
+    second = d2.selectbox("السيناريو الثاني", names, index=1, key="scenario_diff_second")
+    flips = scenario_flips(results, first, second)
+    status_label = {True: "مقبول", False: "غير مقبول"}
+    flips["accepted_first"] = flips["accepted_first"].map(status_label)
+    flips["accepted_second"] = flips["accepted_second"].map(status_label)
+    st.markdown(f"##### المتقدمون الذين يختلف وضعهم ({len(flips):,})")
+    st.dataframe(
+        flips.rename(columns={
+            "applicant_id": "رقم المتقدم",
+            "mapped_nationality": "الجنسية",
+            "accepted_first": f"الحالة ({first})",
+            "discipline_first": f"التخصص ({first})",
+            "accepted_second": f"الحالة ({second})",
+            "discipline_second": f"التخصص ({second})",
+        }),
+        use_container_width=True, hide_index=True,
+    )
 
-    /* Download button */
-    [data-testid="stDownloadButton"] > button {
-        direction: rtl;
-    }
 
-    </style>
-    """, unsafe_allow_html=True)
+# Main app
+# ── Drill-down
+# Plotly selection events reach Python only from Streamlit 1.35 (on_select);
+# older versions drive the same drill path from the panel's buttons and selectbox.
+PLOTLY_SELECTION_EVENTS = "on_select" in inspect.signature(st.plotly_chart).parameters
+DRILL_TOP = 25
 
 
-# Load data
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_excel('data/data.xlsx')
-        processed = pd.DataFrame({
-            "student_id": df.get("STD_ID"),
-            "name": df.get("STD_NAME"),
-            "gender": df.get("GENDER").apply(map_gender),
-            "country": df.get("CITZ_DESC").apply(map_country),
-            "program": df.get("MAJR_DESC").fillna("غير محدد"),
-            "college": df.get("COLL_DESC").fillna("غير محدد"),
-            "status_detail": df.get("LAST_STST").fillna("غير محدد"),
-            "funding": df.get("CELG_CODE").fillna("غير محدد"),
-            "gpa": pd.to_numeric(df.get("STD_GPA"), errors="coerce"),
-            "hours": pd.to_numeric(df.get("STD_HRS"), errors="coerce"),
-            "term_admit": df.get("TERM_ADMIT"),
-            "last_term": df.get("LAST_TERM"),
-            "level": df.get("LEVL_DESC").fillna("غير محدد"),
-            "email": df.get("EMAIL"),
-            "mobile": df.get("MOBILE"),
-        })
+@cached("drill_cubes")
+def get_drill_cube(_base_df: pd.DataFrame, version: str, selection_key: tuple) -> pd.DataFrame:
+    """Group-by cube for the sidebar-filtered rows; drill steps only aggregate this table."""
+    return build_cube(_base_df)
 
-        processed["status"] = processed["status_detail"].apply(categorize_status)
-        processed["admit_year"] = processed["term_admit"].apply(parse_hijri_year)
-        processed["last_term_year"] = processed["last_term"].apply(parse_hijri_year)
-        processed["timeline_year"] = processed["admit_year"].fillna(processed["last_term_year"])
-        processed["continent"] = processed["country"].apply(map_continent)
-        # Add formatted Hijri date columns
-        processed["admit_date_hijri"] = processed["term_admit"].apply(format_hijri_date)
-        processed["last_term_hijri"] = processed["last_term"].apply(format_hijri_date)
-        return processed
-    except FileNotFoundError:
-        st.error("❌ ملف البيانات غير موجود! يرجى التأكد من وجود 'data/data.xlsx'.")
-        st.stop()
-    except Exception as e:
-        st.error(f"❌ خطأ في تحميل البيانات: {str(e)}")
-        st.stop()
 
+def _reset_drill_widgets():
+    for level in DRILL_LEVELS:
+        st.session_state.pop(f"drill_select_{level}", None)
 
-def gaussian_kde(data, bandwidth=None):
-    """
-    Compute Gaussian KDE manually to avoid scipy dependency.
-    """
-    data = np.asarray(data)
-    n = len(data)
-    if n == 0:
-        return np.array([]), np.array([])
-
-    std = np.std(data)
-    if std == 0:
-        # If all values are the same, return a spike
-        return np.array([data[0]]), np.array([1.0])
-
-    if bandwidth is None:
-        # Scott's Rule
-        bandwidth = 1.06 * std * (n ** (-1 / 5))
-
-    if bandwidth == 0:
-        bandwidth = 0.1
-
-    min_x = data.min() - 3 * bandwidth
-    max_x = data.max() + 3 * bandwidth
-    x = np.linspace(min_x, max_x, 200)
-
-    # Vectorized calculation
-    # x[:, None] is (200, 1), data[None, :] is (1, n)
-    # diff is (200, n)
-    diff = (x[:, None] - data[None, :]) / bandwidth
-    # pdf is (200,)
-    pdf = (np.exp(-0.5 * diff ** 2) / np.sqrt(2 * np.pi)).sum(axis=1) / (n * bandwidth)
-
-    return x, pdf
-
-
-def suggest_applicants(
-        applicants_df: pd.DataFrame,
-        current_students_df: pd.DataFrame,
-        intl_seats: int,
-        country_targets_en: dict,
-) -> pd.DataFrame:
-    """
-    Suggest which applicants to accept.
 
-    Priority order:
-      1. Country targets  – fill specified minimums per nationality first
-      2. Geographical balance – underrepresented countries (low current share) get priority
-      3. Discipline balance  – accepted slots are distributed as evenly as possible across
-                               disciplines; 2nd/3rd choice used when 1st is overloaded.
+def set_drill(level: str, value):
+    if value is None or value == "":
+        return
+    st.session_state.drill_path = {**st.session_state.get("drill_path", {}), level: value}
+    _reset_drill_widgets()
 
-    applicants_df must have: applicant_id, nationality, disc1, disc2, disc3
-    current_students_df must have: country, program
-    country_targets_en: {english_country_name: min_count}
 
-    Returns applicants_df with added columns:
-      mapped_nationality, geo_score, accepted, acceptance_reason,
-      assigned_discipline, accepted_at_choice
-    """
-    data = applicants_df.copy().reset_index(drop=True)
-
-    # Map uploaded nationalities to internal Arabic country names
-    data["mapped_nationality"] = data["nationality"].astype(str).str.strip().apply(map_country)
-
-    # ── Geographical score (higher = more underrepresented in current enrollment)
-    current_country_counts = current_students_df["country"].value_counts()
-    total_current = max(len(current_students_df), 1)
-
-    def geo_score_fn(country):
-        share = current_country_counts.get(country, 0) / total_current
-        return round(1.0 - share, 4)
-
-    data["geo_score"] = data["mapped_nationality"].apply(geo_score_fn)
-    data["accepted"] = False
-    data["acceptance_reason"] = ""
-    data["assigned_discipline"] = ""
-    data["accepted_at_choice"] = 0
-
-    accepted_set: set = set()
-    seats_used = 0
-    disc_counts: dict = {}  # tracks accepted-applicant discipline load (starts at 0, ignore existing)
-
-    def find_best_disc(row):
-        """Return (discipline, choice_rank) whose accepted count is lowest; prefer lower rank on tie."""
-        choices = []
-        for rank, col in enumerate(["disc1", "disc2", "disc3"], 1):
-            disc = row[col]
-            disc = str(disc).strip() if not pd.isna(disc) else ""
-            if not disc:
-                continue
-            choices.append((disc_counts.get(disc, 0), rank, disc))
-        if not choices:
-            return "", 0
-        choices.sort()  # ascending count, then ascending rank
-        return choices[0][2], choices[0][1]
-
-    def accept(idx, primary_reason):
-        nonlocal seats_used
-        row = data.loc[idx]
-        disc, rank = find_best_disc(row)
-        disc_counts[disc] = disc_counts.get(disc, 0) + 1
-        # If a non-first choice was needed to balance disciplines, note it
-        if rank > 1:
-            final_reason = "توازن تخصصات"
-        else:
-            final_reason = primary_reason
-        data.at[idx, "accepted"] = True
-        data.at[idx, "acceptance_reason"] = final_reason
-        data.at[idx, "assigned_discipline"] = disc
-        data.at[idx, "accepted_at_choice"] = rank
-        accepted_set.add(idx)
-        seats_used += 1
-
-    # ── Phase 1: Country targets
-    mapped_targets = {map_country(en): cnt for en, cnt in country_targets_en.items()}
-
-    for country, target in mapped_targets.items():
-        if seats_used >= intl_seats:
-            break
-        quota = min(target, intl_seats - seats_used)
-        candidates = data[
-            (data["mapped_nationality"] == country) &
-            (~data.index.isin(accepted_set))
-        ]
-        count = 0
-        for idx in candidates.index:
-            if count >= quota:
-                break
-            accept(idx, "هدف جنسية محددة")
-            count += 1
-
-    # ── Phase 2: Geographical balance + discipline balance
-    # Process in geo-score order; discipline is assigned dynamically per accepted applicant
-    remaining_seats = intl_seats - seats_used
-    if remaining_seats > 0:
-        remaining = data[~data.index.isin(accepted_set)].sort_values(
-            "geo_score", ascending=False
-        )
-        count = 0
-        for idx in remaining.index:
-            if count >= remaining_seats:
-                break
-            accept(idx, "توازن جغرافي")
-            count += 1
+def truncate_drill(depth: int):
+    st.session_state.drill_path = dict(list(st.session_state.get("drill_path", {}).items())[:depth])
+    _reset_drill_widgets()
 
-    return data
+
+def drill_from_select(level: str):
+    set_drill(level, st.session_state.get(f"drill_select_{level}"))
+
+
+def drill_from_selection(key: str, level: str):
+    """on_select callback: the first clicked point becomes a drill filter on ``level``."""
+    points = st.session_state[key]["selection"]["points"]
+    if not points:
+        return
+    point = points[0]
+    if level == "country" and "location" in point:
+        # The choropleth is keyed by English country names
+        set_drill(level, ENGLISH_TO_ARABIC.get(point["location"]))
+    else:
+        set_drill(level, point.get("x"))
+
+
+def drillable_chart(fig, key: str, level: str):
+    """Render a chart whose clicked bar/country is applied as a drill filter when supported."""
+    if PLOTLY_SELECTION_EVENTS:
+        st.plotly_chart(fig, use_container_width=True, key=key, on_select=lambda: drill_from_selection(key, level),
+                        selection_mode="points")
+    else:
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def render_drilldown(cube: pd.DataFrame, path: dict):
+    """Breadcrumb, next-level breakdown and status mix for the current drill path."""
+    with st.expander("🔎 التعمق في البيانات (القارة ← الدولة ← الكلية ← البرنامج)", expanded=bool(path)):
+        crumbs = st.columns(len(path) + 1)
+        crumbs[0].button("الكل", key="drill_crumb_0", on_click=truncate_drill, args=(0,), disabled=not path)
+        for depth, (level, value) in enumerate(path.items(), 1):
+            crumbs[depth].button(f"{DRILL_LABELS[level]}: {value}", key=f"drill_crumb_{depth}",
+                                 on_click=truncate_drill, args=(depth,), disabled=depth == len(path))
+
+        level = next_level(path)
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            if level is None:
+                st.caption("تم الوصول إلى أدنى مستوى (البرنامج).")
+            else:
+                children = summarize(cube, path, level)
+                st.markdown(f"##### الطلاب حسب {DRILL_LABELS[level]}")
+                fig = px.bar(children.head(DRILL_TOP), x=level, y="count", hover_data=["gpa_mean"],
+                             labels={level: DRILL_LABELS[level], "count": "عدد الطلاب", "gpa_mean": "متوسط المعدل"})
+                fig.update_traces(marker_color="#0d6efd", name="")
+                drillable_chart(format_plot(fig), f"drill_chart_{level}", level)
+                st.selectbox(
+                    f"اختر {DRILL_LABELS[level]} للتعمق",
+                    [""] + children[level].tolist(),
+                    key=f"drill_select_{level}",
+                    on_change=drill_from_select,
+                    args=(level,),
+                )
+        with col2:
+            status = summarize(cube, path, "status")
+            st.markdown("##### الحالة الأكاديمية")
+            st.dataframe(
+                status.rename(columns={"status": "الحالة", "count": "الطلاب", "gpa_mean": "متوسط المعدل"}),
+                hide_index=True, use_container_width=True,
+            )
+        if PLOTLY_SELECTION_EVENTS:
+            st.caption("يمكن أيضاً النقر على أعمدة الكليات أو دول الخريطة لإضافتها كفلتر.")
+
+
+# ── Instrumentation
+
+PREWARM_STATE_LABELS = {"idle": "لم يبدأ", "running": "قيد التنفيذ", "done": "اكتمل"}
+
+
+def render_duplicate_clusters(duplicate_index: DuplicateIndex, df: pd.DataFrame):
+    """Collapsed list of the probable duplicate clusters, the counted (most recent) record first."""
+    title = f"👥 السجلات المكررة المحتملة ({duplicate_index.cluster_count:,} مجموعة)"
+    with st.expander(title, expanded=False):
+        if not duplicate_index.cluster_count:
+            st.success("لم يتم العثور على سجلات مكررة.")
+            return
+        clusters = duplicate_index.clusters(df).rename(columns={
+            "cluster": "المجموعة",
+            "student_id": "الرقم الجامعي",
+            "name": "الاسم",
+            "mobile": "الجوال",
+            "email": "البريد الإلكتروني",
+            "college": "الكلية",
+            "status": "الحالة",
+            "last_term": "آخر فصل",
+            "reason": "سبب الدمج",
+        })
+        st.dataframe(clusters, use_container_width=True, hide_index=True)
+
+
+CACHE_NAMESPACE_LABELS = {
+    "dataset": "البيانات",
+    "indexes": "الفهارس والعينات",
+    "drill_cubes": "مكعبات التعمق",
+    "figures": "الرسوم البيانية",
+    "applicants": "ملفات المتقدمين",
+    "yield_simulations": "محاكاة الالتحاق",
+    "exports": "ملفات التصدير",
+    "api_responses": "استجابات الواجهة البرمجية",
+}
+
+
+def render_cache_stats():
+    """Memory held by the process caches against the budget, with hit rate and evictions per cache."""
+    manager = get_cache_manager()
+    used_mb, budget_mb = manager.total_bytes / 2 ** 20, manager.budget_bytes / 2 ** 20
+    st.markdown("**الذاكرة المؤقتة للعملية**")
+    st.progress(min(used_mb / budget_mb, 1.0), text=f"{used_mb:,.1f} من {budget_mb:,.0f} ميغابايت")
+    stats = manager.stats()
+    stats["namespace"] = stats["namespace"].map(lambda name: CACHE_NAMESPACE_LABELS.get(name, name))
+    stats["bytes"] = (stats["bytes"] / 2 ** 20).round(2)
+    st.dataframe(stats.rename(columns={
+        "namespace": "الذاكرة",
+        "entries": "العناصر",
+        "bytes": "الحجم (م.ب)",
+        "hits": "إصابات",
+        "misses": "إخفاقات",
+        "evictions": "مرات الإخلاء",
+        "hit_rate": "نسبة الإصابة",
+    }), hide_index=True, use_container_width=True)
+
+
+def render_instrumentation(scheduler: RenderScheduler, prewarm: dict):
+    """Collapsed panel with this rerun's per-figure build timings, the prewarm progress and cache usage."""
+    with st.expander("⏱️ توقيت بناء الرسوم البيانية"):
+        state = PREWARM_STATE_LABELS.get(prewarm["state"], prewarm["state"])
+        st.markdown(f"**التسخين المسبق لذاكرة الرسوم** ({state})")
+        if prewarm["total"]:
+            st.progress(prewarm["done"] / prewarm["total"], text=(
+                f"{prewarm['done']:,} من {prewarm['total']:,} من التركيبات الأكثر استخداماً "
+                f"({prewarm['skipped']:,} كانت جاهزة) · {prewarm['cpu_seconds']:.1f} ث معالج "
+                f"خلال {prewarm['elapsed']:.1f} ث"
+            ))
+        else:
+            st.caption("لا توجد تركيبات مسجلة بعد")
+        if scheduler.cached:
+            st.caption("✅ رسوم هذا التحديد من الذاكرة المؤقتة")
+        render_cache_stats()
+        timings = scheduler.timings()
+        if timings.empty:
+            st.caption("لا توجد قياسات لهذا التحديث")
+            return
+        slowest = timings.iloc[0]
+        c1, c2, c3 = st.columns(3)
+        c1.metric("زمن البناء الكلي (ث)", f"{timings['end_ms'].max() / 1000:.2f}")
+        c2.metric("مجموع أزمنة البناء (ث)", f"{timings['build_ms'].sum() / 1000:.2f}")
+        c3.metric("المسار الحرج", slowest["figure"], f"{slowest['build_ms']:.0f} ms", delta_color="off")
+        st.dataframe(timings, hide_index=True, use_container_width=True)
 
 
-# Main app
 def main():
     # Title
     st.title("🎓 لوحة معلومات الطلاب الدوليين")
     st.markdown("### تحليلات ذكاء الأعمال لبيانات الطلاب الدوليين")
 
     # Load data
-    df = load_data()
+    df, filter_index, shared_cube, quality_report = get_dataset()
 
     # Removed Hero Header as requested
 
-    gpa_values = df['gpa'].dropna()
-    gpa_min = float(gpa_values.min()) if not gpa_values.empty else 0.0
-    gpa_max = float(gpa_values.max()) if not gpa_values.empty else 5.0
-    if gpa_min == gpa_max:
-        gpa_max = gpa_min + 1
+    gpa_min, gpa_max = filter_index.gpa_min, filter_index.gpa_max
+    if API_PORT:
+        start_api(API_PORT)
+        api.publish_dataset(filter_index)
 
     # Sidebar filters
     st.sidebar.header("📊 الفلاتر")
-
-    # Country filter
-    countries = ['الكل'] + sorted(df['country'].dropna().unique().tolist())
-    selected_country = st.sidebar.selectbox("اختر الدولة", countries)
-
-    # College filter
-    colleges = ['الكل'] + sorted(df['college'].dropna().unique().tolist())
-    selected_college = st.sidebar.selectbox("اختر الكلية", colleges)
-
-    # Program filter
-    programs = ['الكل'] + sorted(df['program'].dropna().unique().tolist())
-    selected_program = st.sidebar.selectbox("اختر البرنامج", programs)
-
-    # Status filter
-    status_options = ['الكل'] + sorted(df['status'].dropna().unique().tolist())
-    selected_status = st.sidebar.selectbox("اختر الحالة", status_options)
-
-    # Gender filter
-    gender_options = ['الكل'] + sorted(df['gender'].dropna().unique().tolist())
-    selected_gender = st.sidebar.selectbox("اختر الجنس", gender_options)
+    filter_labels = {
+        "country": "اختر الدولة",
+        "college": "اختر الكلية",
+        "program": "اختر البرنامج",
+        "status": "اختر الحالة",
+        "status_bucket": "اختر فئة الحالة",
+        "gender": "اختر الجنس",
+    }
+    selections = {
+        column: st.sidebar.selectbox(label, [ALL_OPTION] + filter_index.options(column))
+        for column, label in filter_labels.items()
+    }
 
     # GPA range filter
     st.sidebar.markdown("**نطاق المعدل التراكمي**")
@@ -677,70 +774,85 @@ def main():
         step=0.1
     )
 
-    # Apply filters
-    filtered_df = df.copy()
-    if selected_country != 'الكل':
-        filtered_df = filtered_df[filtered_df['country'] == selected_country]
-    if selected_college != 'الكل':
-        filtered_df = filtered_df[filtered_df['college'] == selected_college]
-    if selected_program != 'الكل':
-        filtered_df = filtered_df[filtered_df['program'] == selected_program]
-    if selected_status != 'الكل':
-        filtered_df = filtered_df[filtered_df['status'] == selected_status]
-    if selected_gender != 'الكل':
-        filtered_df = filtered_df[filtered_df['gender'] == selected_gender]
-    gpa_for_filter = filtered_df['gpa'].fillna(gpa_min)
-    filtered_df = filtered_df[(gpa_for_filter >= gpa_range[0]) & (gpa_for_filter <= gpa_range[1])]
+    # Approximate charts for very large selections
+    st.sidebar.markdown("**⚡ الأداء**")
+    approx_enabled = st.sidebar.checkbox(
+        "رسوم تقريبية للتحديدات الكبيرة", value=True, key="approx_enabled"
+    )
+    approx_threshold = st.sidebar.number_input(
+        "تُستخدم العينة عندما يتجاوز عدد الصفوف", min_value=1_000, value=APPROXIMATE_THRESHOLD,
+        step=1_000, key="approx_threshold", disabled=not approx_enabled,
+    )
+
+    # Students re-admitted or re-keyed under another STD_ID counted once
+    st.sidebar.markdown("**👥 السجلات المكررة**")
+    dedup_enabled = st.sidebar.checkbox(
+        "عدّ الطالب المكرر مرة واحدة", value=False, key="dedup_counts",
+        help="يدمج السجلات التي يرجّح أنها لنفس الطالب (تطابق الجوال أو البريد أو الاسم) ويعتمد أحدثها",
+    )
+
+    # Warm the figure cache for the most used combinations once per dataset version
+    forecast = get_enrollment_forecast(df, filter_index.version)
+    get_prewarmer().start(filter_index, partial(StratifiedSample, df),
+                          partial(get_enrollment_forecast, df, filter_index.version))
+
+    # Apply filters (row positions come from the per-version filter index); the
+    # combination is the normalized form used for the usage log and figure cache
+    usage_key = combination(selections, None if gpa_range == (gpa_min, gpa_max) else gpa_range)
+    base_df = filter_index.filter(selections, usage_key[1])
+    duplicate_index = get_duplicate_index(df, filter_index.version) if dedup_enabled else None
+    if duplicate_index is not None:
+        base_df = duplicate_index.deduplicate(base_df)
+
+    # Drill-down path on top of the sidebar filters
+    unfiltered = all(v == ALL_OPTION for v in selections.values()) and gpa_range == (gpa_min, gpa_max)
+    if unfiltered and shared_cube is not None and not dedup_enabled:
+        drill_cube = shared_cube
+    else:
+        drill_cube = get_drill_cube(base_df, filter_index.version,
+                                    (*selections.values(), *gpa_range, dedup_enabled))
+    drill_path = valid_path(drill_cube, st.session_state.get("drill_path", {}))
+    st.session_state.drill_path = drill_path
+    filtered_df = apply_path(base_df, drill_path)
 
     # Display metrics as AdminKit-like stat cards
     st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
-    avg_gpa = filtered_df['gpa'].mean()
-    stats = [
-        {
-            "label": "إجمالي الطلاب",
-            "value": f"{len(filtered_df):,}",
-            "icon": "👥",
-            "color": "#0d6efd"
-        },
-        {
-            "label": "الطلاب النشطون",
-            "value": f"{len(filtered_df[filtered_df['status'] == 'نشط']):,}",
-            "icon": "✅",
-            "color": "#22c55e"
-        },
-        {
-            "label": "الخريجون",
-            "value": f"{len(filtered_df[filtered_df['status'] == 'متخرج']):,}",
-            "icon": "🎓",
-            "color": "#f97316"
-        },
-        {
-            "label": "متوسط المعدل",
-            "value": f"{avg_gpa:.2f}" if not np.isnan(avg_gpa) else "--",
-            "icon": "⭐",
-            "color": "#8b5cf6"
-        },
-        {
-            "label": "عدد الدول",
-            "value": f"{filtered_df['country'].nunique():,}",
-            "icon": "🌍",
-            "color": "#14b8a6"
-        }
-    ]
+    stats = summary_stats(filtered_df)
     stat_cols = st.columns(len(stats))
     for col, stat in zip(stat_cols, stats):
-        col.markdown(f"""
-            <div class="stat-card" style="--accent: {stat['color']}">
-                <div class="stat-icon">{stat['icon']}</div>
-                <div class="stat-content">
-                    <p>{stat['label']}</p>
-                    <h3>{stat['value']}</h3>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+        col.markdown(STAT_CARD_HTML.format(**stat), unsafe_allow_html=True)
+    if duplicate_index is not None:
+        st.caption(
+            f"👥 الأعداد بعد دمج السجلات المكررة: {duplicate_index.duplicate_rows:,} سجل في البيانات "
+            f"يعود إلى {duplicate_index.cluster_count:,} طالب، ويُحتسب أحدث سجل لكل منهم."
+        )
 
+    render_drilldown(drill_cube, drill_path)
+
+    # Distribution charts (map, box plot, GPA means, KDE) read chart_df; above the
+    # threshold it is the weighted stratified sample, while the stat cards stay exact
+    chart_df, chart_weight = filtered_df, None
+    if approx_enabled and len(filtered_df) > approx_threshold:
+        if not st.toggle("حساب دقيق للرسوم البيانية", value=False, key="approx_exact"):
+            chart_df = get_stratified_sample(df, filter_index.version).rows(filtered_df)
+            chart_weight = WEIGHT_COLUMN
+            st.info(
+                f"⚡ الخريطة وتوزيعات المعدل تقريبية: محسوبة من عينة طبقية (حسب الكلية والدولة) "
+                f"تضم {len(chart_df):,} من أصل {len(filtered_df):,} صف. بطاقات الإحصاء دقيقة."
+            )
     st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
 
+    # Build the tab 1-3 figures on the render pool while the admission tab runs;
+    # each chart below waits only for its own figure. The RTL template is
+    # registered here, once, before the workers start using it
+    rtl_template()
+    figure_cache = get_figure_cache()
+    chart_mode = ("sample" if chart_weight else "exact") + ("-dedup" if dedup_enabled else "")
+    cache_key = figure_key(filter_index.version, usage_key, drill_path, chart_mode)
+    scheduler = RenderScheduler(figure_cache.get(cache_key))
+    for name, builder, args in dashboard_figures(filtered_df, chart_df, chart_weight, forecast):
+        scheduler.submit(name, builder, *args)
+
     # Create tabs for different views
     tab1, tab2, tab3, tab4, tab5 = st.tabs(
         ["📈 نظرة عامة", "🌍 التحليل الجغرافي", "📊 الأداء الأكاديمي", "📋 جدول البيانات", "🎯 خطة القبول"])
@@ -774,6 +886,8 @@ def main():
         if "nat_targets" not in st.session_state:
             st.session_state.nat_targets = []
 
+        render_target_suggestions(forecast, intl_seats, all_countries_ar)
+
         to_delete = None
         for i, entry in enumerate(st.session_state.nat_targets):
             r1, r2, r3 = st.columns([4, 2, 1])
@@ -833,51 +947,116 @@ def main():
         if uploaded is None:
             st.info("ارفع ملف المتقدمين للحصول على اقتراحات القبول.")
         else:
-            raw_df = pd.read_csv(uploaded)
-            raw_df.columns = [c.strip() for c in raw_df.columns]
-            lower_cols = {c.lower(): c for c in raw_df.columns}
-
-            def find_col(patterns):
-                for p in patterns:
-                    if p in lower_cols:
-                        return lower_cols[p]
-                return None
-
-            id_col  = find_col(["id"])
-            nat_col = find_col(["nationality", "national", "nation"])
-            d1_col  = find_col(["1st discipline", "1st desired discipline",
-                                 "disc1", "discipline1", "discipline_1", "first discipline"])
-            d2_col  = find_col(["2nd discipline", "2nd desired discipline",
-                                 "disc2", "discipline2", "discipline_2", "second discipline"])
-            d3_col  = find_col(["3rd discipline", "3rd desired discipline",
-                                 "disc3", "discipline3", "discipline_3", "third discipline"])
-
-            missing_cols = []
-            if not id_col:  missing_cols.append("ID")
-            if not nat_col: missing_cols.append("Nationality")
-            if not d1_col:  missing_cols.append("1st Discipline")
-            if not d2_col:  missing_cols.append("2nd Discipline")
-            if not d3_col:  missing_cols.append("3rd Discipline")
+            rename, missing_cols = resolve_applicant_columns(read_applicant_header(uploaded))
 
             if missing_cols:
                 st.error(f"الملف يفتقد الأعمدة التالية: {', '.join(missing_cols)}")
             elif intl_seats == 0:
                 st.warning("عدد المقاعد الدولية صفر. يرجى إدخال عدد الطلاب المحليين.")
             else:
-                adf = raw_df.rename(columns={
-                    id_col:  "applicant_id",
-                    nat_col: "nationality",
-                    d1_col:  "disc1",
-                    d2_col:  "disc2",
-                    d3_col:  "disc3",
-                })[["applicant_id", "nationality", "disc1", "disc2", "disc3"]].copy()
-
-                results_df = suggest_applicants(
-                    applicants_df=adf,
-                    current_students_df=df,
-                    intl_seats=intl_seats,
-                    country_targets_en=country_targets_en,
+                adf, validation_report = parse_applicants(
+                    uploaded.getvalue(), rename, st.session_state.setdefault("applicant_country_cache", {})
+                )
+                render_validation_report(validation_report)
+
+                discipline_index = get_discipline_index(df, df.attrs.get("version", ""))
+                discipline_table = discipline_index.mapping_table(
+                    pd.concat([adf["disc1"], adf["disc2"], adf["disc3"]])
+                )
+                unmatched = discipline_table[discipline_table["program"].isna()]
+                with st.expander(
+                    f"مطابقة التخصصات مع برامج الجامعة ({len(discipline_table) - len(unmatched):,} "
+                    f"من {len(discipline_table):,} مطابق)"
+                ):
+                    st.dataframe(
+                        discipline_table.rename(columns={
+                            "discipline": "التخصص (الملف)",
+                            "program": "البرنامج",
+                            "college": "الكلية",
+                            "score": "درجة التطابق",
+                        }),
+                        use_container_width=True, hide_index=True,
+                    )
+                balance_with_enrollment = st.checkbox(
+                    "موازنة التخصصات مع أعداد الطلاب النشطين حالياً في كل برنامج",
+                    value=False,
+                    key="balance_with_enrollment",
                 )
+                with st.expander("أوزان ترتيب المرحلة الثانية (بعد أهداف الجنسيات)"):
+                    st.caption(
+                        "تُحوَّل كل معيار إلى مقياس من 0 إلى 1 ثم يُحسب متوسطها المرجَّح. "
+                        "الافتراضي: التوازن الجغرافي حسب الدولة فقط."
+                    )
+                    w1, w2, w3, w4 = st.columns(4)
+                    ranking_weights = {
+                        "geo": w1.slider("ندرة الدولة", 0.0, 1.0, DEFAULT_WEIGHTS["geo"], 0.05,
+                                         key="rank_weight_geo"),
+                        "continent": w2.slider("ندرة القارة", 0.0, 1.0, DEFAULT_WEIGHTS["continent"], 0.05,
+                                               key="rank_weight_continent"),
+                        "scarcity": w3.slider("ندرة التخصص الأول", 0.0, 1.0, DEFAULT_WEIGHTS["scarcity"], 0.05,
+                                              key="rank_weight_scarcity"),
+                        "choice": w4.slider("ندرة كل الخيارات (مرجحة بالرتبة)", 0.0, 1.0,
+                                            DEFAULT_WEIGHTS["choice"], 0.05, key="rank_weight_choice"),
+                    }
+
+                # Keep the allocation state across reruns so seat and target edits
+                # only extend, roll back or replay the affected acceptances
+                allocator_key = (
+                    hashlib.sha1(uploaded.getvalue()).hexdigest(),
+                    df.attrs.get("version", ""),
+                    balance_with_enrollment,
+                    tuple(ranking_weights.values()),
+                )
+                previous_key = st.session_state.get("allocator_key")
+                if previous_key != allocator_key:
+                    # A revised file under the same settings reuses its unchanged rows and
+                    # updates the existing plan instead of starting over
+                    previous = st.session_state.get("prepared_applicants")
+                    revising = previous is not None and previous_key[1:] == allocator_key[1:]
+                    prepared = PreparedApplicants(
+                        applicants_df=adf,
+                        current_students_df=df,
+                        discipline_index=discipline_index,
+                        balance_with_enrollment=balance_with_enrollment,
+                        weights=ranking_weights,
+                        previous=previous if revising else None,
+                    )
+                    st.session_state.upload_revision = None
+                    if revising:
+                        changes = st.session_state.allocator.revise(prepared)
+                        for scenario_allocator in st.session_state.scenario_allocators.values():
+                            scenario_allocator.revise(prepared)
+                        st.session_state.upload_revision = (
+                            allocator_key, prepared.revision_summary(previous), changes
+                        )
+                    else:
+                        st.session_state.allocator = IncrementalAllocator(prepared)
+                        st.session_state.scenario_allocators = {}
+                    st.session_state.prepared_applicants = prepared
+                    st.session_state.allocator_key = allocator_key
+                allocator = st.session_state.allocator
+                revision = st.session_state.get("upload_revision")
+                if revision is not None and revision[0] == allocator_key:
+                    render_upload_revision(*revision[1:])
+
+                whatif_seats = st.slider(
+                    "ماذا لو: عدد المقاعد الدولية",
+                    min_value=0,
+                    max_value=max(2 * intl_seats, intl_seats + 50),
+                    value=intl_seats,
+                    key=f"whatif_seats_{intl_seats}",
+                )
+                change = allocator.update(whatif_seats, country_targets_en)
+                results_df = allocator.result()
+                if API_PORT:
+                    api.publish_plan(results_df)
+                if any(change.values()):
+                    st.caption(
+                        f"آخر تعديل: أُضيف {len(change['added']):,} مقبول، "
+                        f"أُلغي {len(change['removed']):,}، "
+                        f"وأُعيدت معالجة {len(change['reassigned']):,}."
+                    )
+                intl_seats = whatif_seats
 
                 accepted_df = results_df[results_df["accepted"]].copy()
                 n_total    = len(results_df)
@@ -934,8 +1113,8 @@ def main():
                 show_accepted = accepted_df[[
                     "applicant_id", "nationality", "mapped_nationality",
                     "disc1", "disc2", "disc3",
-                    "assigned_discipline", "accepted_at_choice",
-                    "acceptance_reason"
+                    "assigned_discipline", "assigned_program", "assigned_college",
+                    "accepted_at_choice", "acceptance_reason"
                 ]].copy()
                 show_accepted["accepted_at_choice"] = show_accepted["accepted_at_choice"].map(choice_label)
                 show_accepted = show_accepted.rename(columns={
@@ -946,6 +1125,8 @@ def main():
                     "disc2":               "التخصص الثاني",
                     "disc3":               "التخصص الثالث",
                     "assigned_discipline": "التخصص المُسنَد",
+                    "assigned_program":    "البرنامج المطابق",
+                    "assigned_college":    "الكلية",
                     "accepted_at_choice":  "رتبة الخيار",
                     "acceptance_reason":   "سبب القبول",
                 })
@@ -956,9 +1137,9 @@ def main():
                 show_all = results_df[[
                     "applicant_id", "nationality", "mapped_nationality",
                     "disc1", "disc2", "disc3",
-                    "geo_score", "accepted",
-                    "assigned_discipline", "accepted_at_choice",
-                    "acceptance_reason"
+                    "geo_score", "rank_score", "accepted",
+                    "assigned_discipline", "assigned_program", "assigned_college",
+                    "accepted_at_choice", "acceptance_reason"
                 ]].copy()
                 show_all["accepted"] = show_all["accepted"].map(
                     {True: "مقبول", False: "غير مقبول"}
@@ -972,15 +1153,18 @@ def main():
                     "disc2":               "التخصص الثاني",
                     "disc3":               "التخصص الثالث",
                     "geo_score":           "نقاط التوازن الجغرافي",
+                    "rank_score":          "نقاط الترتيب",
                     "accepted":            "الحالة",
                     "assigned_discipline": "التخصص المُسنَد",
+                    "assigned_program":    "البرنامج المطابق",
+                    "assigned_college":    "الكلية",
                     "accepted_at_choice":  "رتبة الخيار",
                     "acceptance_reason":   "السبب",
                 })
                 st.dataframe(show_all, use_container_width=True, hide_index=True)
 
                 # ── Download
-                csv_out = show_all.to_csv(index=False).encode("utf-8-sig")
+                csv_out = export_csv(show_all, frame_digest(show_all))
                 st.download_button(
                     "📥 تنزيل النتائج (CSV)",
                     data=csv_out,
@@ -988,6 +1172,16 @@ def main():
                     mime="text/csv",
                 )
 
+                # ── Yield simulation
+                if not accepted_df.empty and st.checkbox(
+                    "محاكاة نسبة الالتحاق الفعلي للمقبولين", key="yield_sim_enabled"
+                ):
+                    render_yield_simulation(results_df, df, intl_seats, discipline_index)
+
+                # ── Scenario comparison
+                if st.checkbox("مقارنة عدة سيناريوهات للقبول", key="scenarios_enabled"):
+                    render_scenario_workspace(intl_seats, country_targets_en)
+
     with tab1:
         # Overview tab
         col1, col2 = st.columns(2)
@@ -995,71 +1189,28 @@ def main():
         with col1:
             # Students by College (was Program)
             st.subheader("عدد الطلاب حسب الكلية")
-            college_counts_overview = filtered_df['college'].value_counts().reset_index()
-            college_counts_overview.columns = ['college', 'count']
-            fig_college_overview = px.bar(
-                college_counts_overview,
-                x='college',
-                y='count',
-                labels={'count': 'عدد الطلاب', 'college': 'الكلية'}
-            )
-            fig_college_overview.update_traces(marker_color='#0d6efd', name='')
-            fig_college_overview.update_layout(showlegend=False)
-            st.plotly_chart(format_plot(fig_college_overview), use_container_width=True)
+            drillable_chart(scheduler.result("college_counts"), "overview_college_chart", "college")
 
         with col2:
             # Students by Status
             st.subheader("عدد الطلاب حسب الحالة الأكاديمية")
-            status_counts = filtered_df['status'].value_counts().reset_index()
-            status_counts.columns = ['status', 'count']
-            fig_status = px.pie(
-                status_counts,
-                values='count',
-                names='status',
-                color_discrete_sequence=px.colors.qualitative.Set2,
-                hole=0.5
-            )
-            # Update traces to show labels and hide hover info
-            fig_status.update_traces(textinfo='label+percent+value', hoverinfo='skip')
-            st.plotly_chart(format_plot(fig_status), use_container_width=True)
+            st.plotly_chart(scheduler.result("status"), use_container_width=True)
 
         col3, col4 = st.columns(2)
 
         with col3:
             # Gender Distribution
             st.subheader("التوزيع حسب الجنس")
-            # Filter out "غير محدد" from gender visualization
-            gender_df = filtered_df[filtered_df['gender'] != "غير محدد"]
-            gender_counts = gender_df['gender'].value_counts().reset_index()
-            gender_counts.columns = ['gender', 'count']
-            fig_gender = px.pie(
-                gender_counts,
-                values='count',
-                names='gender',
-                color_discrete_sequence=px.colors.qualitative.Pastel,
-                hole=0.5
-            )
-            # Update traces to show labels and hide hover info
-            fig_gender.update_traces(textinfo='label+percent+value', hoverinfo='skip')
-            st.plotly_chart(format_plot(fig_gender), use_container_width=True)
+            st.plotly_chart(scheduler.result("gender"), use_container_width=True)
 
         with col4:
             # Enrollment Trend
             st.subheader("عدد الطلاب المسجلين سنوياً")
-            timeline_df = filtered_df.dropna(subset=['timeline_year']).copy()
-            timeline_df['timeline_year'] = timeline_df['timeline_year'].astype(int)
-            enrollment_by_date = timeline_df.groupby('timeline_year').size().reset_index(name='count')
-            fig_trend = px.line(
-                enrollment_by_date,
-                x='timeline_year',
-                y='count',
-                markers=True,
-                labels={'count': 'عدد الطلاب', 'timeline_year': 'السنة الهجرية'}
+            st.plotly_chart(scheduler.result("enrollment_trend"), use_container_width=True)
+            st.caption(
+                f"الخط المتقطع توقع لـ{FORECAST_HORIZON} سنوات قادمة من آخر {len(forecast.years)} سنوات قبول، "
+                "والنطاق المظلل فترة التوقع (95% تقريباً)."
             )
-            fig_trend.update_traces(line_color='#636EFA', line_width=3, name='')
-            # Add "هـ" suffix with space for better readability in Hijri year labels
-            fig_trend.update_xaxes(ticksuffix=" هـ")
-            st.plotly_chart(format_plot(fig_trend), use_container_width=True)
 
     with tab2:
         # Geographic Analysis tab
@@ -1068,42 +1219,12 @@ def main():
         with col1:
             # World Map
             st.subheader("التوزيع بحسب الجنسية")
-
-            # Prepare data for map
-            map_data = filtered_df['country'].value_counts().reset_index()
-            map_data.columns = ['country_ar', 'count']
-
-            # Map Arabic names to English for Plotly
-            map_data['country_en'] = map_data['country_ar'].map(ARABIC_TO_ENGLISH)
-
-            fig_map = px.choropleth(
-                map_data,
-                locations='country_en',
-                locationmode='country names',
-                color='count',
-                hover_name='country_ar',
-                color_continuous_scale='Viridis',
-                labels={'count': 'عدد الطلاب'}
-            )
-            fig_map.update_layout(
-                geo=dict(
-                    showframe=False,
-                    showcoastlines=False,
-                    projection_type='equirectangular'
-                )
-            )
-            st.plotly_chart(format_plot(fig_map), use_container_width=True)
+            drillable_chart(scheduler.result("country_map"), "geo_country_map", "country")
 
         with col2:
             # Country statistics
             st.subheader("إحصائيات الدول")
-            country_stats = filtered_df.groupby('country').agg({
-                'student_id': 'count',
-                'gpa': 'mean'
-            }).round(2).reset_index()
-            country_stats.columns = ['الدولة', 'الطلاب', 'متوسط المعدل']
-            country_stats = country_stats.sort_values('الطلاب', ascending=False).head(10)
-            st.dataframe(country_stats, hide_index=True, use_container_width=True)
+            st.dataframe(scheduler.result("country_stats"), hide_index=True, use_container_width=True)
 
     with tab3:
         # Academic Performance tab
@@ -1112,53 +1233,42 @@ def main():
         with col1:
             # GPA Distribution by College
             st.subheader("توزيع المعدل التراكمي حسب الكلية")
-            fig_gpa_box = px.box(
-                filtered_df,
-                x='college',
-                y='gpa',
-                labels={'gpa': 'المعدل التراكمي', 'college': 'الكلية'}
-            )
-            fig_gpa_box.update_traces(marker_color='#0d6efd')
-            fig_gpa_box.update_layout(showlegend=False)
-            st.plotly_chart(format_plot(fig_gpa_box), use_container_width=True)
+            st.plotly_chart(scheduler.result("gpa_box"), use_container_width=True)
 
         with col2:
             # Average GPA by Program
             st.subheader("متوسط المعدل حسب البرنامج")
-            avg_gpa_program = filtered_df.groupby('program')['gpa'].mean().sort_values(ascending=False).reset_index()
-            fig_gpa_program = px.bar(
-                avg_gpa_program,
-                x='program',
-                y='gpa',
-                labels={'gpa': 'متوسط المعدل', 'program': 'البرنامج'}
-            )
-            fig_gpa_program.update_traces(marker_color='#0d6efd', name='')
-            fig_gpa_program.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(format_plot(fig_gpa_program), use_container_width=True)
+            st.plotly_chart(scheduler.result("gpa_by_program"), use_container_width=True)
 
         # KDE Chart of GPA
         st.subheader("توزيع كثافة المعدل التراكمي (KDE)")
-        gpa_data = filtered_df['gpa'].dropna()
-        if gpa_data.empty or len(gpa_data) < 2:
+        fig_kde = scheduler.result("gpa_kde")
+        if fig_kde is None:
             st.info("لا توجد بيانات كافية لعرض الرسم البياني")
         else:
-            # Calculate KDE manually to avoid scipy dependency
-            x_kde, y_kde = gaussian_kde(gpa_data)
-
-            fig_kde = px.area(
-                x=x_kde,
-                y=y_kde,
-                labels={'x': 'المعدل التراكمي', 'y': 'الكثافة'}
-            )
-            # Fix: 'fill_color' is not a valid property for update_traces in this context.
-            # Use 'fillcolor' (no underscore) for area charts in Plotly.
-            fig_kde.update_traces(line_color='#0d6efd', fillcolor='rgba(13, 110, 253, 0.2)', name='')
-            st.plotly_chart(format_plot(fig_kde), use_container_width=True)
+            st.plotly_chart(fig_kde, use_container_width=True)
+
+        # GPA × earned hours, binned here so the browser only gets the grid
+        st.subheader("كثافة الطلاب حسب المعدل والساعات المكتسبة")
+        density_facets = {"بدون تقسيم": None, "الكلية": "college", "فئة الحالة": "status_bucket"}
+        density_facet = st.radio("تقسيم حسب", list(density_facets), horizontal=True, key="density_facet")
+        fig_density = gpa_hours_density_figure(
+            get_density_bins(df, filter_index.version), filtered_df, density_facets[density_facet]
+        )
+        if fig_density is None:
+            st.info("لا توجد بيانات كافية لعرض الرسم البياني")
+        else:
+            st.plotly_chart(fig_density, use_container_width=True)
 
     with tab4:
         # Data Table tab
         st.subheader("بيانات الطلاب")
 
+        if quality_report is not None:
+            render_validation_report(quality_report, QUALITY_ISSUE_LABELS, "🧪 جودة بيانات المصدر", expanded=False)
+        if duplicate_index is not None:
+            render_duplicate_clusters(duplicate_index, df)
+
         # Search functionality
         search_term = st.text_input("🔍 البحث بالاسم أو الدولة أو الكلية أو التخصص", "")
 
@@ -1181,6 +1291,7 @@ def main():
             "program": "التخصص",
             "college": "الكلية",
             "status": "الحالة المختصرة",
+            "status_bucket": "فئة الحالة",
             "status_detail": "تفاصيل الحالة",
             "gpa": "المعدل التراكمي",
             "hours": "الساعات المكتسبة",
@@ -1192,6 +1303,8 @@ def main():
             "email": "البريد الإلكتروني",
             "mobile": "الجوال"
         }
+        if df['source'].nunique() > 1:
+            columns_to_show["source"] = "المصدر"
         display_df = display_df[list(columns_to_show.keys())].rename(columns=columns_to_show)
 
         # Display dataframe
@@ -1202,7 +1315,7 @@ def main():
         )
 
         # Download button
-        csv = display_df.to_csv(index=False).encode('utf-8-sig')
+        csv = export_csv(display_df, frame_digest(display_df))
         st.download_button(
             label="📥 تحميل البيانات كملف CSV",
             data=csv,
@@ -1210,6 +1323,21 @@ def main():
             mime="text/csv",
         )
 
+    if not scheduler.cached:
+        figure_cache.put(cache_key, scheduler.results(), scheduler.timings()["build_ms"].sum() / 1000)
+
+    # Anonymized usage record (combination and sections used), once per change in this session
+    sections = [name for name, used in [
+        ("drilldown", bool(drill_path)),
+        ("data_table", bool(search_term)),
+        ("admission_plan", uploaded is not None),
+    ] if used]
+    if st.session_state.get("usage_logged") != (usage_key, sections):
+        st.session_state.usage_logged = (usage_key, sections)
+        log_usage(usage_key, sections)
+
+    render_instrumentation(scheduler, get_prewarmer().status())
+
 
 if __name__ == "__main__":
     main()
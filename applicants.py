@@ -0,0 +1,192 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from quality import record_issue
+from utils import map_country, COUNTRY_TO_CONTINENT, UNDEFINED_AR
+
+# Canonical applicant columns and the lower-cased header aliases accepted for each
+APPLICANT_COLUMN_ALIASES = {
+    "applicant_id": ["id"],
+    "nationality": ["nationality", "national", "nation"],
+    "disc1": ["1st discipline", "1st desired discipline",
+              "disc1", "discipline1", "discipline_1", "first discipline"],
+    "disc2": ["2nd discipline", "2nd desired discipline",
+              "disc2", "discipline2", "discipline_2", "second discipline"],
+    "disc3": ["3rd discipline", "3rd desired discipline",
+              "disc3", "discipline3", "discipline_3", "third discipline"],
+}
+
+# Display names used when reporting missing columns
+APPLICANT_COLUMN_LABELS = {
+    "applicant_id": "ID",
+    "nationality": "Nationality",
+    "disc1": "1st Discipline",
+    "disc2": "2nd Discipline",
+    "disc3": "3rd Discipline",
+}
+
+DISCIPLINE_COLUMNS = ["disc1", "disc2", "disc3"]
+# Low-cardinality text columns kept as codes while reading
+CODED_COLUMNS = ["nationality", *DISCIPLINE_COLUMNS, "mapped_nationality"]
+APPLICANT_CHUNK_SIZE = 50_000
+
+VALIDATION_ISSUES = [
+    "missing_id",
+    "duplicate_id",
+    "missing_nationality",
+    "unknown_nationality",
+    "empty_choices",
+]
+
+
+def read_applicant_header(source) -> list[str]:
+    """Return the stripped header of an applicant CSV without reading its rows."""
+    header = pd.read_csv(source, nrows=0, encoding="utf-8-sig").columns
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return [str(c).strip() for c in header]
+
+
+def resolve_applicant_columns(header: list[str]) -> tuple[dict, list[str]]:
+    """Match header aliases once; returns ({file column: canonical}, missing labels)."""
+    lower_cols = {c.lower(): c for c in header}
+    rename = {}
+    missing = []
+    for canonical, patterns in APPLICANT_COLUMN_ALIASES.items():
+        found = next((lower_cols[p] for p in patterns if p in lower_cols), None)
+        if found is None:
+            missing.append(APPLICANT_COLUMN_LABELS[canonical])
+        else:
+            rename[found] = canonical
+    return rename, missing
+
+
+def _strip_text(series: pd.Series) -> pd.Series:
+    """Strip surrounding whitespace; empty strings become NA."""
+    stripped = series.str.strip()
+    return stripped.mask(stripped == "")
+
+
+def normalize_discipline(value: str):
+    """Collapse internal whitespace in a discipline name; blank names become NA."""
+    text = " ".join(str(value).split())
+    return text or pd.NA
+
+
+def map_unique(series: pd.Series, func, cache: dict) -> pd.Series:
+    """Apply ``func`` once per distinct value (memoized in ``cache``) and broadcast."""
+    for value in series.dropna().unique():
+        if value not in cache:
+            cache[value] = func(value)
+    return series.map(cache)
+
+
+def applicant_row_keys(applicants: pd.DataFrame) -> np.ndarray:
+    """``ID`` of each row, with repeats numbered (``ID#1``, ...); "" where the ID is missing."""
+    ids = applicants["applicant_id"]
+    repeat = applicants.groupby("applicant_id", sort=False).cumcount().fillna(0).astype(np.int64)
+    keys = ids.where(repeat == 0, ids + "#" + repeat.astype(str))
+    return keys.fillna("").to_numpy(dtype=object)
+
+
+def applicant_fingerprints(applicants: pd.DataFrame) -> np.ndarray:
+    """Hash of each row's uploaded nationality and choices, to spot rows changed between uploads."""
+    columns = ["nationality", *DISCIPLINE_COLUMNS]
+    return pd.util.hash_pandas_object(applicants.reindex(columns=columns), index=False).to_numpy()
+
+
+def new_validation_report() -> dict:
+    return {
+        "rows": 0,
+        "counts": {issue: 0 for issue in VALIDATION_ISSUES},
+        "samples": {issue: [] for issue in VALIDATION_ISSUES},
+    }
+
+
+def _record_issue(report: dict, issue: str, mask: pd.Series, chunk: pd.DataFrame) -> None:
+    record_issue(report, issue, mask, chunk, ["applicant_id", "nationality", *DISCIPLINE_COLUMNS])
+
+
+def validate_chunk(chunk: pd.DataFrame, seen_ids: set, report: dict) -> None:
+    """Collect row-level issues for one chunk into ``report``."""
+    report["rows"] += len(chunk)
+    ids = chunk["applicant_id"]
+    _record_issue(report, "missing_id", ids.isna(), chunk)
+
+    duplicate = ids.notna() & (ids.duplicated() | ids.isin(seen_ids))
+    _record_issue(report, "duplicate_id", duplicate, chunk)
+    seen_ids.update(ids.dropna().unique())
+
+    _record_issue(report, "missing_nationality", chunk["nationality"].isna(), chunk)
+    unknown = chunk["nationality"].notna() & ~chunk["mapped_nationality"].isin(COUNTRY_TO_CONTINENT)
+    _record_issue(report, "unknown_nationality", unknown, chunk)
+
+    empty = chunk[DISCIPLINE_COLUMNS].isna().all(axis=1)
+    _record_issue(report, "empty_choices", empty, chunk)
+
+
+def _encode(values: pd.Series, vocabulary: dict) -> np.ndarray:
+    """int32 codes of ``values`` in ``vocabulary`` (extended with unseen values); -1 where missing."""
+    local, uniques = pd.factorize(values)
+    shared = np.array([vocabulary.setdefault(value, len(vocabulary)) for value in uniques] + [-1], dtype=np.int32)
+    return shared[local]
+
+
+def read_applicants(source, rename: dict, chunksize: int = APPLICANT_CHUNK_SIZE,
+                    country_cache: dict | None = None) -> tuple[pd.DataFrame, dict]:
+    """Stream an applicant CSV in chunks, normalizing and validating each block.
+
+    Only the five resolved columns are parsed. Nationalities are mapped once
+    per distinct value and disciplines are whitespace-normalized. Each chunk
+    is validated and then reduced to its IDs plus int32 codes into one
+    vocabulary of the nationality, country and discipline values, so the
+    parsed text of a chunk is released before the next one is read. The
+    result still grows with the number of rows (the IDs and the codes), but
+    the text columns are materialized once, at the end, as references to
+    the shared distinct values.
+    Passing the ``country_cache`` of an earlier upload maps only the
+    nationalities it has not seen.
+    Returns the applicants (with ``mapped_nationality``) and a validation report.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    country_cache = {} if country_cache is None else country_cache
+    discipline_cache: dict = {}
+    seen_ids: set = set()
+    report = new_validation_report()
+    vocabulary: dict = {}
+    ids = []
+    codes = {col: [] for col in CODED_COLUMNS}
+    reader = pd.read_csv(
+        source,
+        usecols=lambda c: str(c).strip() in rename,
+        dtype=str,
+        encoding="utf-8-sig",
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        chunk.columns = [rename[str(c).strip()] for c in chunk.columns]
+        chunk = chunk.reindex(columns=list(APPLICANT_COLUMN_ALIASES))
+        chunk["applicant_id"] = _strip_text(chunk["applicant_id"])
+        chunk["nationality"] = _strip_text(chunk["nationality"])
+        for col in DISCIPLINE_COLUMNS:
+            chunk[col] = map_unique(chunk[col], normalize_discipline, discipline_cache)
+        chunk["mapped_nationality"] = map_unique(chunk["nationality"], map_country, country_cache)
+        chunk["mapped_nationality"] = chunk["mapped_nationality"].fillna(UNDEFINED_AR)
+        validate_chunk(chunk, seen_ids, report)
+        ids.append(chunk["applicant_id"].to_numpy(dtype=object))
+        for col in CODED_COLUMNS:
+            codes[col].append(_encode(chunk[col], vocabulary))
+
+    columns = [*APPLICANT_COLUMN_ALIASES, "mapped_nationality"]
+    if not ids:
+        return pd.DataFrame(columns=columns), report
+    # Code -1 (missing) picks the trailing NaN; each column's chunks are freed once joined
+    values = np.array([*vocabulary, np.nan], dtype=object)
+    data = {"applicant_id": np.concatenate(ids)}
+    del ids
+    for col in columns[1:]:
+        data[col] = values[np.concatenate(codes.pop(col))]
+    return pd.DataFrame(data, copy=False), report
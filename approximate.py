@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+# Selections larger than this render the distribution charts from the sample
+APPROXIMATE_THRESHOLD = 50_000
+SAMPLE_SIZE = 20_000
+SAMPLE_STRATA = ["college", "country"]
+WEIGHT_COLUMN = "_weight"
+
+
+class StratifiedSample:
+    """Fixed stratified sample of a dataset version, used for approximate charts.
+
+    Rows are sampled without replacement within each (college, country)
+    stratum, proportionally to the stratum size and with at least one row
+    per stratum, so small colleges and countries stay visible. Each sampled
+    row carries the inverse sampling fraction of its stratum as a weight,
+    making weighted counts and means unbiased for any filtered subset.
+    """
+
+    def __init__(self, df: pd.DataFrame, size: int = SAMPLE_SIZE, seed: int = 0):
+        n = len(df)
+        self.weights = np.zeros(n)
+        if n <= size:
+            self.weights[:] = 1.0
+        else:
+            codes = df.groupby(SAMPLE_STRATA, sort=False, dropna=False).ngroup().to_numpy()
+            counts = np.bincount(codes)
+            allocation = np.minimum(np.maximum(np.rint(counts * size / n), 1), counts).astype(np.int64)
+            # Random order inside each stratum; keep the first ``allocation`` rows of each
+            rng = np.random.default_rng(seed)
+            order = np.lexsort((rng.random(n), codes))
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            rank = np.empty(n, dtype=np.int64)
+            rank[order] = np.arange(n) - starts[codes[order]]
+            chosen = rank < allocation[codes]
+            self.weights[chosen] = (counts / allocation)[codes[chosen]]
+        self.in_sample = self.weights > 0
+        self.size = int(self.in_sample.sum())
+
+    def rows(self, filtered_df: pd.DataFrame) -> pd.DataFrame:
+        """Sampled rows of ``filtered_df`` (positions of the full dataset) with their weights."""
+        positions = filtered_df.index.to_numpy()
+        mask = self.in_sample[positions]
+        sample = filtered_df[mask].copy()
+        sample[WEIGHT_COLUMN] = self.weights[positions[mask]]
+        return sample
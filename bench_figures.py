@@ -0,0 +1,247 @@
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from utils import format_plot, LazyModule, ARABIC_TO_ENGLISH, UNDEFINED_AR
+import charts
+from charts import gaussian_kde
+from approximate import StratifiedSample, WEIGHT_COLUMN
+from figure_specs import rtl_template
+
+px = LazyModule("plotly.express")
+
+FIGURES = [
+    "college_counts_figure",
+    "status_figure",
+    "gender_figure",
+    "enrollment_trend_figure",
+    "country_map_figure",
+    "country_counts_figure",
+    "gpa_box_figure",
+    "gpa_by_program_figure",
+    "gpa_kde_figure",
+]
+WEIGHTED_FIGURES = {"country_map_figure", "gpa_by_program_figure", "gpa_kde_figure"}
+
+
+# ── Reference: the plotly.express + format_plot builders the figure specs replace
+
+def legacy_college_counts_figure(df: pd.DataFrame):
+    college_counts = df['college'].value_counts().reset_index()
+    college_counts.columns = ['college', 'count']
+    fig = px.bar(
+        college_counts,
+        x='college',
+        y='count',
+        labels={'count': 'عدد الطلاب', 'college': 'الكلية'}
+    )
+    fig.update_traces(marker_color='#0d6efd', name='')
+    fig.update_layout(showlegend=False)
+    return format_plot(fig)
+
+
+def legacy_status_figure(df: pd.DataFrame):
+    status_counts = df['status'].value_counts().reset_index()
+    status_counts.columns = ['status', 'count']
+    fig = px.pie(
+        status_counts,
+        values='count',
+        names='status',
+        color_discrete_sequence=px.colors.qualitative.Set2,
+        hole=0.5
+    )
+    # Update traces to show labels and hide hover info
+    fig.update_traces(textinfo='label+percent+value', hoverinfo='skip')
+    return format_plot(fig)
+
+
+def legacy_gender_figure(df: pd.DataFrame):
+    # Filter out "غير محدد" from gender visualization
+    gender_df = df[df['gender'] != UNDEFINED_AR]
+    gender_counts = gender_df['gender'].value_counts().reset_index()
+    gender_counts.columns = ['gender', 'count']
+    fig = px.pie(
+        gender_counts,
+        values='count',
+        names='gender',
+        color_discrete_sequence=px.colors.qualitative.Pastel,
+        hole=0.5
+    )
+    # Update traces to show labels and hide hover info
+    fig.update_traces(textinfo='label+percent+value', hoverinfo='skip')
+    return format_plot(fig)
+
+
+def legacy_enrollment_trend_figure(df: pd.DataFrame):
+    timeline_df = df.dropna(subset=['timeline_year']).copy()
+    timeline_df['timeline_year'] = timeline_df['timeline_year'].astype(int)
+    enrollment_by_date = timeline_df.groupby('timeline_year').size().reset_index(name='count')
+    fig = px.line(
+        enrollment_by_date,
+        x='timeline_year',
+        y='count',
+        markers=True,
+        labels={'count': 'عدد الطلاب', 'timeline_year': 'السنة الهجرية'}
+    )
+    fig.update_traces(line_color='#636EFA', line_width=3, name='')
+    # Add "هـ" suffix with space for better readability in Hijri year labels
+    fig.update_xaxes(ticksuffix=" هـ")
+    return format_plot(fig)
+
+
+def legacy_country_map_figure(df: pd.DataFrame, weight: str | None = None):
+    """Choropleth of students per country (estimated from ``weight`` when given)."""
+    if weight is None:
+        map_data = df['country'].value_counts().reset_index()
+    else:
+        map_data = df.groupby('country')[weight].sum().round().astype(int).reset_index()
+    map_data.columns = ['country_ar', 'count']
+
+    # Map Arabic names to English for Plotly
+    map_data['country_en'] = map_data['country_ar'].map(ARABIC_TO_ENGLISH)
+
+    fig = px.choropleth(
+        map_data,
+        locations='country_en',
+        locationmode='country names',
+        color='count',
+        hover_name='country_ar',
+        color_continuous_scale='Viridis',
+        labels={'count': 'عدد الطلاب'}
+    )
+    fig.update_layout(
+        geo=dict(
+            showframe=False,
+            showcoastlines=False,
+            projection_type='equirectangular'
+        )
+    )
+    return format_plot(fig)
+
+
+def legacy_country_counts_figure(df: pd.DataFrame, top: int = 15):
+    """Horizontal bar of the top countries (the map's offline stand-in)."""
+    country_counts = df['country'].value_counts().head(top).iloc[::-1].reset_index()
+    country_counts.columns = ['country', 'count']
+    fig = px.bar(
+        country_counts,
+        x='count',
+        y='country',
+        orientation='h',
+        labels={'count': 'عدد الطلاب', 'country': 'الدولة'}
+    )
+    fig.update_traces(marker_color='#0d6efd', name='')
+    return format_plot(fig)
+
+
+def legacy_gpa_box_figure(df: pd.DataFrame):
+    fig = px.box(
+        df,
+        x='college',
+        y='gpa',
+        labels={'gpa': 'المعدل التراكمي', 'college': 'الكلية'}
+    )
+    fig.update_traces(marker_color='#0d6efd')
+    fig.update_layout(showlegend=False)
+    return format_plot(fig)
+
+
+def legacy_gpa_by_program_figure(df: pd.DataFrame, weight: str | None = None):
+    if weight is None:
+        avg_gpa = df.groupby('program')['gpa'].mean()
+    else:
+        known = df[df['gpa'].notna()]
+        totals = (known['gpa'] * known[weight]).groupby(known['program']).sum()
+        avg_gpa = totals / known.groupby('program')[weight].sum()
+    avg_gpa_program = avg_gpa.sort_values(ascending=False).rename('gpa').reset_index()
+    fig = px.bar(
+        avg_gpa_program,
+        x='program',
+        y='gpa',
+        labels={'gpa': 'متوسط المعدل', 'program': 'البرنامج'}
+    )
+    fig.update_traces(marker_color='#0d6efd', name='')
+    fig.update_layout(xaxis_tickangle=-45)
+    return format_plot(fig)
+
+
+def legacy_gpa_kde_figure(df: pd.DataFrame, weight: str | None = None):
+    """GPA density curve, or None when there are fewer than two GPA values."""
+    known = df[df['gpa'].notna()]
+    if len(known) < 2:
+        return None
+    # Calculate KDE manually to avoid scipy dependency
+    x_kde, y_kde = gaussian_kde(known['gpa'], weights=None if weight is None else known[weight])
+    fig = px.area(
+        x=x_kde,
+        y=y_kde,
+        labels={'x': 'المعدل التراكمي', 'y': 'الكثافة'}
+    )
+    # Use 'fillcolor' (no underscore) for area charts in Plotly.
+    fig.update_traces(line_color='#0d6efd', fillcolor='rgba(13, 110, 253, 0.2)', name='')
+    return format_plot(fig)
+
+
+# ── Benchmark
+
+def streamlit_spec(fig) -> str:
+    """What st.plotly_chart does with a figure: coerce (validating dicts) and serialize."""
+    import plotly.io
+    import plotly.tools
+
+    figure = plotly.tools.return_figure_from_figure_or_data(fig, validate_figure=True)
+    return plotly.io.to_json(figure, validate=False)
+
+
+def measure(builder, args, runs: int) -> tuple[float, float]:
+    """Median build time and build + serialize time (seconds)."""
+    build, total = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fig = builder(*args)
+        built = time.perf_counter()
+        streamlit_spec(fig)
+        build.append(built - start)
+        total.append(time.perf_counter() - start)
+    return statistics.median(build), statistics.median(total)
+
+
+def selections(df: pd.DataFrame) -> list[tuple]:
+    """(name, frame, weight column) cases: everything, one college, the weighted sample."""
+    college = df["college"].value_counts().index[0]
+    return [
+        ("all rows", df, None),
+        ("largest college", df[df["college"] == college], None),
+        ("weighted sample", StratifiedSample(df, size=min(len(df), 5_000)).rows(df), WEIGHT_COLUMN),
+    ]
+
+
+def run_benchmark(runs: int) -> None:
+    from ingest import ingest_sources, load_manifest
+
+    df = ingest_sources(load_manifest())
+    # Process-level setup is excluded from both paths
+    px.load()
+    rtl_template()
+    for name, data, weight in selections(df):
+        print(f"\n{name} ({len(data):,} rows) — median of {runs} runs, ms")
+        print(f"{'figure':<26}{'px build':>10}{'px total':>10}{'spec build':>12}{'spec total':>12}{'speedup':>9}")
+        print("-" * 79)
+        sums = [0.0] * 4
+        for figure in FIGURES:
+            args = (data, weight) if figure in WEIGHTED_FIGURES else (data,)
+            legacy = measure(globals()[f"legacy_{figure}"], args, runs)
+            spec = measure(getattr(charts, figure), args, runs)
+            values = [*legacy, *spec]
+            sums = [a + b for a, b in zip(sums, values)]
+            print(f"{figure:<26}" + "".join(f"{v * 1000:>10.1f}" if i < 2 else f"{v * 1000:>12.1f}"
+                                            for i, v in enumerate(values)) + f"{legacy[1] / spec[1]:>8.1f}x")
+        print(f"{'total':<26}" + "".join(f"{v * 1000:>10.1f}" if i < 2 else f"{v * 1000:>12.1f}"
+                                         for i, v in enumerate(sums)) + f"{sums[1] / sums[3]:>8.1f}x")
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[sys.argv.index("--runs") + 1]) if "--runs" in sys.argv else 5
+    run_benchmark(runs)
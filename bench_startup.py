@@ -0,0 +1,88 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+IMPORT_MODULES = ["streamlit", "pandas", "numpy", "plotly.express", "utils", "ingest"]
+
+
+def measure_import(module: str, runs: int) -> float:
+    """Median wall time (seconds) to import ``module`` in a fresh interpreter."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True
+        )
+        samples.append(float(result.stdout.strip()))
+    return statistics.median(samples)
+
+
+def measure_paint() -> dict:
+    """Run app.py once through AppTest and time the first forward messages.
+
+    Executed in a child process so that every import and cache is cold.
+    ``first_paint`` is the first stat card, ``first_chart`` the first Plotly
+    figure and ``full_run`` the end of the cold run; ``rerun`` is a warm rerun.
+    """
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+    from streamlit.testing.v1 import AppTest
+
+    marks: dict = {}
+    original_enqueue = ForwardMsgQueue.enqueue
+
+    def timed_enqueue(self, msg):
+        if msg.WhichOneof("type") == "delta":
+            element = msg.delta.new_element
+            if "first_paint" not in marks and 'class="stat-card"' in element.markdown.body:
+                marks["first_paint"] = time.perf_counter()
+            if "first_chart" not in marks and element.WhichOneof("type") == "plotly_chart":
+                marks["first_chart"] = time.perf_counter()
+        return original_enqueue(self, msg)
+
+    ForwardMsgQueue.enqueue = timed_enqueue
+    start = time.perf_counter()
+    at = AppTest.from_file("app.py", default_timeout=600).run()
+    end = time.perf_counter()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    rerun_start = time.perf_counter()
+    at.run()
+    rerun_end = time.perf_counter()
+    timings = {name: mark - start for name, mark in marks.items()}
+    timings["full_run"] = end - start
+    timings["rerun"] = rerun_end - rerun_start
+    return timings
+
+
+def run_benchmark(runs: int) -> None:
+    print("Import cost (median of fresh interpreters)")
+    print("-" * 42)
+    for module in IMPORT_MODULES:
+        print(f"{module:<20} {measure_import(module, runs) * 1000:9.1f} ms")
+
+    print("\nApp startup (cold process, AppTest)")
+    print("-" * 42)
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, __file__, "--paint"], capture_output=True, text=True, cwd=ROOT, check=True
+        )
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    for key in ["first_paint", "first_chart", "full_run", "rerun"]:
+        values = [s[key] for s in samples if key in s]
+        if values:
+            print(f"{key:<20} {statistics.median(values) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    if "--paint" in sys.argv:
+        print(json.dumps(measure_paint()))
+    else:
+        runs = int(sys.argv[sys.argv.index("--runs") + 1]) if "--runs" in sys.argv else 3
+        run_benchmark(runs)
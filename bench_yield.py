@@ -0,0 +1,83 @@
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from yield_simulation import applicant_yield, estimate_yield_rates, simulate_yield, waitlist_limit
+
+DEFAULT_SEATS = [100, 250, 500]
+N_SIMS = 100_000
+# Seconds a 100k-simulation run may take in the admission tab
+TARGET_SECONDS = 1.0
+
+
+def candidate_probabilities(applicants_path: str, students_df: pd.DataFrame, seats: int,
+                            rate: float | None = None) -> tuple:
+    """Yield rates of the plan's candidates as the admission tab orders them.
+
+    Returns (probabilities, nationality codes of the planned admits), the
+    arrays the tab passes to the simulation. ``rate`` replaces every
+    historical rate, as an edited rates table would.
+    """
+    from admission import suggest_applicants
+    from applicants import read_applicant_header, read_applicants, resolve_applicant_columns
+    from disciplines import DisciplineIndex
+
+    rename, _ = resolve_applicant_columns(read_applicant_header(applicants_path))
+    applicants, _ = read_applicants(applicants_path, rename)
+    results = suggest_applicants(applicants, students_df, seats, {}, DisciplineIndex(students_df))
+    accepted = results[results["accepted"]]
+    waitlist = results[~results["accepted"]].sort_values("rank_score", ascending=False, kind="stable")
+    candidates = pd.concat([accepted, waitlist])
+    rates, overall = estimate_yield_rates(students_df, "country")
+    if rate is not None:
+        rates, overall = {}, rate
+    codes, _ = pd.factorize(accepted["mapped_nationality"])
+    return applicant_yield(candidates["mapped_nationality"], rates, overall), codes
+
+
+def measure(probabilities: np.ndarray, seats: int, planned: int, codes: np.ndarray, runs: int) -> float:
+    times = []
+    for run in range(runs):
+        start = time.perf_counter()
+        simulate_yield(probabilities, seats, planned, N_SIMS, 0.9, codes, seed=run)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run_benchmark(applicants_path: str, seat_levels: list, runs: int, rate: float | None = None) -> int:
+    from ingest import ingest_sources, load_manifest
+
+    students = ingest_sources(load_manifest())
+    rates = "historical rates" if rate is None else f"yield {rate:g} for everyone"
+    print(f"{N_SIMS:,} simulations, median of {runs} runs, applicants from {applicants_path}, {rates}")
+    print(f"{'seats':>6}{'planned':>9}{'groups':>8}{'all cand.':>11}{'all s':>8}{'capped':>8}{'capped s':>10}")
+    print("-" * 60)
+    slowest = 0.0
+    for seats in seat_levels:
+        probabilities, codes = candidate_probabilities(applicants_path, students, seats, rate)
+        planned = len(codes)
+        capped = probabilities[:waitlist_limit(probabilities, seats, planned)]
+        full_seconds = measure(probabilities, seats, planned, codes, 1)
+        capped_seconds = measure(capped, seats, planned, codes, runs)
+        slowest = max(slowest, capped_seconds)
+        print(f"{seats:>6}{planned:>9}{codes.max() + 1:>8}{len(probabilities):>11,}{full_seconds:>8.2f}"
+              f"{len(capped):>8,}{capped_seconds:>10.2f}")
+    ok = slowest < TARGET_SECONDS
+    print(f"\nslowest capped run {slowest:.2f} s; target < {TARGET_SECONDS:.1f} s: {'ok' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+def _arg(name: str, default: str) -> str:
+    return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+
+if __name__ == "__main__":
+    sys.exit(run_benchmark(
+        _arg("--applicants", "mock.csv"),
+        [int(v) for v in _arg("--seats", ",".join(map(str, DEFAULT_SEATS))).split(",")],
+        int(_arg("--runs", "3")),
+        float(_arg("--yield", "nan")) if "--yield" in sys.argv else None,
+    ))
@@ -0,0 +1,44 @@
+import sys
+from pprint import pformat
+
+from utils import build_mapping_tables, mapping_digest
+
+OUTPUT_FILE = "mapping_tables.py"
+
+
+def render_module() -> str:
+    lines = [
+        "# Generated by build_mapping_tables.py from utils.NATIONALITY_MAPPING. Do not edit;",
+        "# re-run `python build_mapping_tables.py` after changing the nationality mapping.",
+        "from types import MappingProxyType",
+        "",
+        f"SOURCE_DIGEST = {mapping_digest()!r}",
+    ]
+    for name, table in build_mapping_tables().items():
+        lines.append("")
+        lines.append(f"{name} = MappingProxyType({pformat(table, sort_dicts=False, width=100)})")
+    return "\n".join(lines) + "\n"
+
+
+def build_tables(check: bool = False) -> int:
+    content = render_module()
+    if check:
+        try:
+            with open(OUTPUT_FILE, encoding="utf-8") as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = ""
+        if current != content:
+            print(f"{OUTPUT_FILE} is out of date; run `python build_mapping_tables.py`")
+            return 1
+        print(f"{OUTPUT_FILE} is up to date")
+        return 0
+
+    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        f.write(content)
+    print(f"Successfully created {OUTPUT_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(build_tables(check="--check" in sys.argv))
@@ -0,0 +1,206 @@
+import html
+import importlib
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from charts import (
+    STAT_CARD_HTML,
+    summary_stats,
+    college_counts_figure,
+    status_figure,
+    gender_figure,
+    enrollment_trend_figure,
+    country_map_figure,
+    country_counts_figure,
+    country_stats_table,
+    gpa_box_figure,
+    gpa_by_program_figure,
+    gpa_kde_figure,
+)
+from ingest import ingest_sources, load_manifest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CSS_PATH = os.path.join(ROOT, "assets", "style.css")
+REPORTS_DIR = os.path.join(ROOT, "reports")
+# Plotly's world_110m.json (https://cdn.plot.ly/world_110m.json). Choropleths fetch
+# it from the CDN at view time, so it is inlined when present and the map is
+# replaced by a top-countries bar chart otherwise.
+TOPOJSON_PATH = os.path.join(ROOT, "assets", "world_110m.json")
+
+REPORT_CSS = """
+    body { max-width: 1200px; margin: 0 auto; padding: 24px; direction: rtl; font-family: sans-serif; }
+    .stat-row { display: grid; grid-template-columns: repeat(5, 1fr); gap: 12px; }
+    .chart-row { display: grid; grid-template-columns: 1fr 1fr; gap: 16px; }
+    table { border-collapse: collapse; width: 100%; }
+    th, td { border: 1px solid #e5e7eb; padding: 6px 10px; text-align: right; }
+"""
+
+# Report sections in dashboard tab order: (tab title, [(chart title, builder), ...])
+REPORT_SECTIONS = [
+    ("📈 نظرة عامة", [
+        ("عدد الطلاب حسب الكلية", college_counts_figure),
+        ("عدد الطلاب حسب الحالة الأكاديمية", status_figure),
+        ("التوزيع حسب الجنس", gender_figure),
+        ("عدد الطلاب المسجلين سنوياً", enrollment_trend_figure),
+    ]),
+    ("🌍 التحليل الجغرافي", [
+        ("التوزيع بحسب الجنسية", country_map_figure),
+        ("إحصائيات الدول", country_stats_table),
+    ]),
+    ("📊 الأداء الأكاديمي", [
+        ("توزيع المعدل التراكمي حسب الكلية", gpa_box_figure),
+        ("متوسط المعدل حسب البرنامج", gpa_by_program_figure),
+        ("توزيع كثافة المعدل التراكمي (KDE)", gpa_kde_figure),
+    ]),
+]
+
+# Set once per worker by _init_worker; with the fork start method the dataset
+# is inherited copy-on-write instead of being pickled to every process
+_dataset: pd.DataFrame | None = None
+_page_head: str = ""
+
+
+def _init_worker(dataset: pd.DataFrame, page_head: str) -> None:
+    global _dataset, _page_head
+    _dataset, _page_head = dataset, page_head
+
+
+def report_filename(college: str) -> str:
+    return re.sub(r"\W+", "_", college).strip("_") + ".html"
+
+
+def offline_map_available() -> bool:
+    return os.path.exists(TOPOJSON_PATH)
+
+
+def report_sections() -> list:
+    if offline_map_available():
+        return REPORT_SECTIONS
+    return [
+        (section, [(title, country_counts_figure if builder is country_map_figure else builder)
+                   for title, builder in items])
+        for section, items in REPORT_SECTIONS
+    ]
+
+
+def page_head() -> str:
+    """Stylesheet and inlined plotly.js (and map topology), so reports open offline."""
+    from plotly.offline import get_plotlyjs
+
+    with open(CSS_PATH, encoding="utf-8") as f:
+        # Web-font imports need network access; the report falls back to system fonts
+        css = re.sub(r"@import[^;]+;", "", f.read())
+    scripts = [get_plotlyjs()]
+    if offline_map_available():
+        with open(TOPOJSON_PATH, encoding="utf-8") as f:
+            # plotly.js looks up PlotlyGeoAssets before fetching topology from the CDN
+            scripts.insert(0, f"window.PlotlyGeoAssets = {{topojson: {{world_110m: {f.read()}}}}};")
+    return f"<style>{css}{REPORT_CSS}</style>\n" + "\n".join(
+        f'<script type="text/javascript">{script}</script>' for script in scripts
+    )
+
+
+def render_section_item(title: str, builder, df: pd.DataFrame) -> str:
+    content = builder(df)
+    if content is None:
+        body = "<p>لا توجد بيانات كافية لعرض الرسم البياني</p>"
+    elif isinstance(content, pd.DataFrame):
+        body = content.to_html(index=False, border=0)
+    else:
+        body = content.to_html(full_html=False, include_plotlyjs=False, config={"displaylogo": False})
+    return f"<div><h3>{html.escape(title)}</h3>{body}</div>"
+
+
+def render_report(college: str, df: pd.DataFrame, head: str, generated: str, sections: list) -> str:
+    cards = "".join(STAT_CARD_HTML.format(**stat) for stat in summary_stats(df))
+    rendered_sections = []
+    for section_title, items in sections:
+        rendered = "".join(render_section_item(title, builder, df) for title, builder in items)
+        rendered_sections.append(f'<h2>{section_title}</h2><div class="chart-row">{rendered}</div>')
+    return (
+        '<!DOCTYPE html>\n<html lang="ar" dir="rtl">\n<head>\n<meta charset="utf-8">\n'
+        f"<title>تقرير {html.escape(college)}</title>\n{head}\n</head>\n<body>\n"
+        f"<h1>🎓 تقرير الطلاب الدوليين – {html.escape(college)}</h1>\n"
+        f"<p>تاريخ الإنشاء: {generated}</p>\n"
+        f'<div class="stat-row">{cards}</div>\n'
+        + "\n".join(rendered_sections)
+        + "\n</body>\n</html>\n"
+    )
+
+
+def build_college_report(task: tuple) -> tuple[str, int, float]:
+    """Worker: render one college from the shared dataset; returns (college, rows, seconds)."""
+    college, positions, out_dir, generated = task
+    start = time.perf_counter()
+    college_df = _dataset.iloc[positions]
+    path = os.path.join(out_dir, report_filename(college))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_report(college, college_df, _page_head, generated, report_sections()))
+    return college, len(positions), time.perf_counter() - start
+
+
+def write_index(out_dir: str, results: list[tuple[str, int, float]], generated: str) -> None:
+    rows = "".join(
+        f'<tr><td><a href="{report_filename(college)}">{html.escape(college)}</a></td><td>{rows:,}</td></tr>'
+        for college, rows, _ in sorted(results)
+    )
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(
+            '<!DOCTYPE html>\n<html lang="ar" dir="rtl">\n<head>\n<meta charset="utf-8">\n'
+            f"<title>تقارير الكليات</title>\n<style>{REPORT_CSS}</style>\n</head>\n<body>\n"
+            f"<h1>تقارير الكليات – {generated}</h1>\n"
+            f"<table><tr><th>الكلية</th><th>عدد الطلاب</th></tr>{rows}</table>\n</body>\n</html>\n"
+        )
+
+
+def build_reports(out_dir: str, colleges: list[str] | None = None, max_workers: int | None = None) -> list:
+    """Render one offline HTML report per college in a process pool.
+
+    The dataset, the college -> row positions index and the page head (CSS
+    plus ~3.5 MB of plotly.js) are prepared once in the parent. Workers only
+    receive a college name and its row positions.
+    """
+    start = time.perf_counter()
+    dataset = ingest_sources(load_manifest())
+    groups = dataset.groupby("college", sort=True).indices
+    if colleges:
+        groups = {college: groups[college] for college in colleges if college in groups}
+    head = page_head()
+    # Import plotly.express before forking so workers inherit it instead of importing it again
+    importlib.import_module("plotly.express")
+    generated = datetime.now().strftime("%Y-%m-%d %H:%M")
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks = [(college, positions, out_dir, generated) for college, positions in groups.items()]
+    # Largest colleges first so a slow one does not start last
+    tasks.sort(key=lambda task: -len(task[1]))
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=context,
+        initializer=_init_worker, initargs=(dataset, head),
+    ) as pool:
+        results = list(pool.map(build_college_report, tasks))
+
+    write_index(out_dir, results, generated)
+    for college, rows, seconds in results:
+        print(f"{college:<40} {rows:>7,} rows {seconds * 1000:8.0f} ms")
+    print(f"{len(results)} reports written to {out_dir} in {time.perf_counter() - start:.1f} s")
+    return results
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    out = args[args.index("--out") + 1] if "--out" in args else os.path.join(
+        REPORTS_DIR, datetime.now().strftime("%Y%m%d")
+    )
+    workers = int(args[args.index("--workers") + 1]) if "--workers" in args else None
+    selected = [args[i + 1] for i, arg in enumerate(args) if arg == "--college"]
+    build_reports(out, selected or None, workers)
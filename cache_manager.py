@@ -0,0 +1,260 @@
+import functools
+import hashlib
+import inspect
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Memory the app's caches may hold together, per process
+CACHE_BUDGET_MB = float(os.environ.get("DASHBOARD_CACHE_BUDGET_MB", 512))
+
+
+# ── Size estimates
+
+def estimate_bytes(value, seen: set | None = None, shared=frozenset()) -> int:
+    """Approximate memory held by ``value``; objects already in ``seen`` or in ``shared`` are not counted again.
+
+    ``shared`` is only read, so a container other threads update can be passed as is.
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen or id(value) in shared:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return int(pd.Series(value.ravel()).memory_usage(index=False, deep=True))
+        return value.nbytes
+    if isinstance(value, (str, bytes, bytearray, int, float, bool, type(None))):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_bytes(k, seen, shared) + estimate_bytes(v, seen, shared) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_bytes(item, seen, shared) for item in value)
+    # Plain objects (indexes, samples, figure specs): their attributes
+    attributes = getattr(value, "__dict__", None)
+    if attributes is not None:
+        return sys.getsizeof(value) + estimate_bytes(attributes, seen, shared)
+    return sys.getsizeof(value)
+
+
+def _referenced(value) -> set:
+    """Ids of ``value`` and of its direct items, which other entries may share."""
+    items = value if isinstance(value, (tuple, list)) else ()
+    return {id(value), *(id(item) for item in items)}
+
+
+def cache_key(value):
+    """Hashable, compact stand-in for an argument: byte strings and arrays are digested."""
+    if isinstance(value, (bytes, bytearray)):
+        return "sha1", hashlib.sha1(value).hexdigest()
+    if isinstance(value, np.ndarray):
+        return "array", value.dtype.str, value.shape, hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest()
+    if isinstance(value, dict):
+        return tuple((k, cache_key(v)) for k, v in sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(cache_key(v) for v in value)
+    return value
+
+
+def frame_digest(frame: pd.DataFrame) -> str:
+    """Content hash of a frame (values and column names), much cheaper than serializing it."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    digest.update("\x1f".join(map(str, frame.columns)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# ── Manager
+
+class _Entry:
+    __slots__ = ("value", "size", "cost", "credit", "pinned")
+
+    def __init__(self, value, size: int, cost: float, credit: float, pinned: bool):
+        self.value = value
+        self.size = size
+        self.cost = cost
+        self.credit = credit
+        self.pinned = pinned
+
+
+class CacheManager:
+    """One memory budget for every cache of the process, split into namespaces.
+
+    Each entry records its approximate size and how many seconds it took to
+    compute. Eviction is GreedyDual-Size: an entry's credit is the clock plus
+    its recompute cost per megabyte, renewed on every hit. Over budget, the
+    entry with the lowest credit goes and the clock advances to it, so
+    large entries that are quick to rebuild leave first and entries nobody
+    reads age out as in an LRU. Pinned entries (the dataset) count toward
+    the budget but are never evicted. Bytes an entry shares with one already
+    cached (e.g. an index holding the dataset) are counted once: the ids
+    other entries may share are reference-counted as entries come and go,
+    so sizing a new value is one walk over it, done outside the lock.
+    """
+
+    def __init__(self, budget_bytes: int = int(CACHE_BUDGET_MB * 1024 * 1024)):
+        self.budget_bytes = budget_bytes
+        self._entries = {}
+        self._clock = 0.0
+        self._bytes = 0
+        # id -> number of entries referencing it (see _referenced)
+        self._shared = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def _namespace_stats(self, namespace: str) -> dict:
+        return self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0})
+
+    def _credit(self, entry: _Entry) -> float:
+        return self._clock + entry.cost * 1024 * 1024 / max(entry.size, 1)
+
+    def get(self, namespace: str, key, default=None, record: bool = True):
+        """Cached value or ``default``; ``record=False`` looks up without counting a hit or miss."""
+        with self._lock:
+            stats = self._namespace_stats(namespace)
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                if record:
+                    stats["misses"] += 1
+                return default
+            if record:
+                stats["hits"] += 1
+            entry.credit = self._credit(entry)
+            return entry.value
+
+    def __contains__(self, namespaced_key: tuple) -> bool:
+        with self._lock:
+            return namespaced_key in self._entries
+
+    def put(self, namespace: str, key, value, cost: float, pinned: bool = False) -> None:
+        """Store ``value`` computed in ``cost`` seconds, then evict down to the budget."""
+        # The replaced entry goes first, so its own objects do not count as shared
+        with self._lock:
+            self._remove((namespace, key))
+        # Dict lookups are atomic, so the walk can read _shared while other threads insert
+        size = estimate_bytes(value, shared=self._shared)
+        with self._lock:
+            self._remove((namespace, key))
+            entry = _Entry(value, size, cost, 0.0, pinned)
+            entry.credit = self._credit(entry)
+            self._entries[(namespace, key)] = entry
+            for object_id in _referenced(value):
+                self._shared[object_id] = self._shared.get(object_id, 0) + 1
+            stats = self._namespace_stats(namespace)
+            stats["entries"] += 1
+            stats["bytes"] += size
+            self._bytes += size
+            self._evict()
+
+    def _remove(self, namespaced_key: tuple) -> _Entry | None:
+        entry = self._entries.pop(namespaced_key, None)
+        if entry is not None:
+            stats = self._namespace_stats(namespaced_key[0])
+            stats["entries"] -= 1
+            stats["bytes"] -= entry.size
+            self._bytes -= entry.size
+            for object_id in _referenced(entry.value):
+                if self._shared[object_id] == 1:
+                    del self._shared[object_id]
+                else:
+                    self._shared[object_id] -= 1
+        return entry
+
+    def _evict(self) -> None:
+        while self._bytes > self.budget_bytes:
+            candidates = [(entry.credit, key) for key, entry in self._entries.items() if not entry.pinned]
+            if not candidates:
+                return
+            credit, key = min(candidates, key=lambda candidate: candidate[0])
+            self._clock = credit
+            self._remove(key)
+            self._namespace_stats(key[0])["evictions"] += 1
+
+    @contextmanager
+    def computing(self, namespaced_key: tuple):
+        """Held while computing one entry, so concurrent misses of the same key compute it once."""
+        with self._lock:
+            lock, waiting = self._key_locks.get(namespaced_key, (threading.Lock(), 0))
+            self._key_locks[namespaced_key] = (lock, waiting + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, waiting = self._key_locks[namespaced_key]
+                if waiting == 1:
+                    del self._key_locks[namespaced_key]
+                else:
+                    self._key_locks[namespaced_key] = (lock, waiting - 1)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> pd.DataFrame:
+        """Entries, bytes, hits, misses, hit rate and evictions per namespace."""
+        with self._lock:
+            rows = [{"namespace": namespace, **stats} for namespace, stats in sorted(self._stats.items())]
+        columns = ["namespace", "entries", "bytes", "hits", "misses", "evictions"]
+        table = pd.DataFrame(rows, columns=columns)
+        lookups = table["hits"] + table["misses"]
+        table["hit_rate"] = (table["hits"] / lookups.where(lookups > 0)).round(3)
+        return table
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_cache_manager() -> CacheManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = CacheManager()
+        return _manager
+
+
+def cached(namespace: str, pinned: bool = False):
+    """Memoize a function in ``namespace`` of the process cache manager.
+
+    As with Streamlit's caches, parameters whose names start with ``_`` are
+    left out of the key (pass a version next to them instead). Exceptions are
+    not cached.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__qualname__, *(cache_key(value) for name, value in bound.arguments.items()
+                                        if not name.startswith("_")))
+            manager = get_cache_manager()
+            missing = object()
+            value = manager.get(namespace, key, missing)
+            if value is not missing:
+                return value
+            with manager.computing((namespace, key)):
+                # Another session may have computed it while this one waited
+                value = manager.get(namespace, key, missing, record=False)
+                if value is not missing:
+                    return value
+                start = time.perf_counter()
+                value = func(*args, **kwargs)
+                manager.put(namespace, key, value, time.perf_counter() - start, pinned=pinned)
+                return value
+
+        return wrapper
+
+    return decorator
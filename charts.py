@@ -0,0 +1,330 @@
+import numpy as np
+import pandas as pd
+
+from utils import LazyModule, ARABIC_TO_ENGLISH, UNDEFINED_AR
+from figure_specs import (
+    FigureSpec,
+    axis_titles,
+    bar_trace,
+    pie_trace,
+    line_trace,
+    area_trace,
+    interval_trace,
+    box_trace,
+    heatmap_trace,
+    colorscale,
+    hovertemplate,
+)
+
+# Palettes only; figures are plain specs, so plotly.express itself is never imported here
+colors = LazyModule("plotly.colors")
+
+# Stat-card markup shared by the dashboard header and the offline reports
+STAT_CARD_HTML = """
+    <div class="stat-card" style="--accent: {color}">
+        <div class="stat-icon">{icon}</div>
+        <div class="stat-content">
+            <p>{label}</p>
+            <h3>{value}</h3>
+        </div>
+    </div>
+"""
+
+
+def gaussian_kde(data, bandwidth=None, weights=None):
+    """
+    Compute Gaussian KDE manually to avoid scipy dependency.
+    Optional ``weights`` (e.g. sampling weights) weight each point's kernel.
+    """
+    data = np.asarray(data)
+    n = len(data)
+    if n == 0:
+        return np.array([]), np.array([])
+    weights = np.ones(n) if weights is None else np.asarray(weights, dtype=np.float64)
+    weights = weights / weights.sum()
+
+    mean = (weights * data).sum()
+    std = np.sqrt((weights * (data - mean) ** 2).sum())
+    if std == 0:
+        # If all values are the same, return a spike
+        return np.array([data[0]]), np.array([1.0])
+
+    if bandwidth is None:
+        # Scott's Rule (with the effective sample size when weighted)
+        n_eff = 1 / (weights ** 2).sum()
+        bandwidth = 1.06 * std * (n_eff ** (-1 / 5))
+
+    if bandwidth == 0:
+        bandwidth = 0.1
+
+    min_x = data.min() - 3 * bandwidth
+    max_x = data.max() + 3 * bandwidth
+    x = np.linspace(min_x, max_x, 200)
+
+    # Vectorized calculation
+    # x[:, None] is (200, 1), data[None, :] is (1, n)
+    # diff is (200, n)
+    diff = (x[:, None] - data[None, :]) / bandwidth
+    # pdf is (200,)
+    pdf = (np.exp(-0.5 * diff ** 2) / np.sqrt(2 * np.pi)) @ weights / bandwidth
+
+    return x, pdf
+
+
+def summary_stats(df: pd.DataFrame) -> list[dict]:
+    """Header stat cards (label, value, icon, color) for a filtered dataset."""
+    avg_gpa = df['gpa'].mean()
+    return [
+        {
+            "label": "إجمالي الطلاب",
+            "value": f"{len(df):,}",
+            "icon": "👥",
+            "color": "#0d6efd"
+        },
+        {
+            "label": "الطلاب النشطون",
+            "value": f"{len(df[df['status'] == 'نشط']):,}",
+            "icon": "✅",
+            "color": "#22c55e"
+        },
+        {
+            "label": "الخريجون",
+            "value": f"{len(df[df['status'] == 'متخرج']):,}",
+            "icon": "🎓",
+            "color": "#f97316"
+        },
+        {
+            "label": "متوسط المعدل",
+            "value": f"{avg_gpa:.2f}" if not np.isnan(avg_gpa) else "--",
+            "icon": "⭐",
+            "color": "#8b5cf6"
+        },
+        {
+            "label": "عدد الدول",
+            "value": f"{df['country'].nunique():,}",
+            "icon": "🌍",
+            "color": "#14b8a6"
+        }
+    ]
+
+
+# ── Overview (tab 1)
+
+def college_counts_figure(df: pd.DataFrame):
+    college_counts = df['college'].value_counts()
+    return FigureSpec(
+        [bar_trace(college_counts.index.to_numpy(), college_counts.to_numpy(), 'الكلية', 'عدد الطلاب', '#0d6efd')],
+        axis_titles('الكلية', 'عدد الطلاب'),
+    )
+
+
+def status_figure(df: pd.DataFrame):
+    status_counts = df['status'].value_counts()
+    return FigureSpec(
+        [pie_trace(status_counts.index.to_numpy(), status_counts.to_numpy())],
+        {"piecolorway": colors.qualitative.Set2},
+    )
+
+
+def gender_figure(df: pd.DataFrame):
+    # Filter out "غير محدد" from gender visualization
+    gender = df['gender']
+    gender_counts = gender[gender != UNDEFINED_AR].value_counts()
+    return FigureSpec(
+        [pie_trace(gender_counts.index.to_numpy(), gender_counts.to_numpy())],
+        {"piecolorway": colors.qualitative.Pastel},
+    )
+
+
+def enrollment_trend_figure(df: pd.DataFrame, forecast=None):
+    """Students per intake year; with an ``EnrollmentForecast``, its projection as a dashed segment and band."""
+    years = df['timeline_year'].dropna().astype(int)
+    enrollment_by_date = years.value_counts().sort_index()
+    layout = axis_titles('السنة الهجرية', 'عدد الطلاب')
+    # Add "هـ" suffix with space for better readability in Hijri year labels
+    layout["xaxis"]["ticksuffix"] = " هـ"
+    traces = [line_trace(enrollment_by_date.index.to_numpy(), enrollment_by_date.to_numpy(),
+                         'السنة الهجرية', 'عدد الطلاب', '#636EFA')]
+    if forecast is not None and len(forecast.years):
+        window_years, counts, future_years, point, low, high = forecast.project(df)
+        # The projection starts from the last observed year so the segments join
+        x = np.concatenate([window_years[-1:], future_years])
+        traces.insert(0, interval_trace(x, np.concatenate([counts[-1:], low]),
+                                        np.concatenate([counts[-1:], high]), 'rgba(99, 110, 250, 0.15)'))
+        traces.append(line_trace(x, np.concatenate([counts[-1:], point.round()]),
+                                 'السنة الهجرية', 'العدد المتوقع', '#636EFA', dash="dash"))
+    return FigureSpec(traces, layout)
+
+
+# ── Geographic analysis (tab 2)
+
+def country_map_figure(df: pd.DataFrame, weight: str | None = None):
+    """Choropleth of students per country (estimated from ``weight`` when given)."""
+    if weight is None:
+        counts = df['country'].value_counts()
+    else:
+        counts = df.groupby('country')[weight].sum().round().astype(int)
+    return FigureSpec(
+        [{
+            "type": "choropleth",
+            # Plotly locates countries by their English names
+            "locations": counts.index.map(ARABIC_TO_ENGLISH).to_numpy(),
+            "locationmode": "country names",
+            "z": counts.to_numpy(),
+            "hovertext": counts.index.to_numpy(),
+            "coloraxis": "coloraxis",
+            "name": "",
+            "hovertemplate": "<b>%{hovertext}</b><br><br>" + hovertemplate(("country_en", "location"), ("عدد الطلاب", "z")),
+        }],
+        {
+            "geo": {"showframe": False, "showcoastlines": False, "projection": {"type": "equirectangular"}},
+            "coloraxis": {
+                "colorscale": colorscale(colors.sequential.Viridis),
+                "colorbar": {"title": {"text": "عدد الطلاب"}},
+            },
+        },
+    )
+
+
+def country_counts_figure(df: pd.DataFrame, top: int = 15):
+    """Horizontal bar of the top countries (the map's offline stand-in)."""
+    country_counts = df['country'].value_counts().head(top).iloc[::-1]
+    return FigureSpec(
+        [bar_trace(country_counts.to_numpy(), country_counts.index.to_numpy(), 'عدد الطلاب', 'الدولة',
+                   '#0d6efd', orientation='h')],
+        axis_titles('عدد الطلاب', 'الدولة'),
+    )
+
+
+def country_stats_table(df: pd.DataFrame, top: int = 10) -> pd.DataFrame:
+    country_stats = df.groupby('country').agg({
+        'student_id': 'count',
+        'gpa': 'mean'
+    }).round(2).reset_index()
+    country_stats.columns = ['الدولة', 'الطلاب', 'متوسط المعدل']
+    return country_stats.sort_values('الطلاب', ascending=False).head(top)
+
+
+# ── Academic performance (tab 3)
+
+def gpa_box_figure(df: pd.DataFrame):
+    layout = axis_titles('الكلية', 'المعدل التراكمي')
+    layout["boxmode"] = "group"
+    return FigureSpec(
+        [box_trace(df['college'].to_numpy(), df['gpa'].to_numpy(), 'الكلية', 'المعدل التراكمي', '#0d6efd')],
+        layout,
+    )
+
+
+def gpa_by_program_figure(df: pd.DataFrame, weight: str | None = None):
+    if weight is None:
+        avg_gpa = df.groupby('program')['gpa'].mean()
+    else:
+        known = df[df['gpa'].notna()]
+        totals = (known['gpa'] * known[weight]).groupby(known['program']).sum()
+        avg_gpa = totals / known.groupby('program')[weight].sum()
+    avg_gpa = avg_gpa.sort_values(ascending=False)
+    layout = axis_titles('البرنامج', 'متوسط المعدل')
+    layout["xaxis"]["tickangle"] = -45
+    return FigureSpec(
+        [bar_trace(avg_gpa.index.to_numpy(), avg_gpa.to_numpy(), 'البرنامج', 'متوسط المعدل', '#0d6efd')],
+        layout,
+    )
+
+
+def gpa_kde_figure(df: pd.DataFrame, weight: str | None = None):
+    """GPA density curve, or None when there are fewer than two GPA values."""
+    known = df[df['gpa'].notna()]
+    if len(known) < 2:
+        return None
+    # Calculate KDE manually to avoid scipy dependency
+    x_kde, y_kde = gaussian_kde(known['gpa'], weights=None if weight is None else known[weight])
+    return FigureSpec(
+        [area_trace(x_kde, y_kde, 'المعدل التراكمي', 'الكثافة', '#0d6efd', 'rgba(13, 110, 253, 0.2)')],
+        axis_titles('المعدل التراكمي', 'الكثافة'),
+    )
+
+
+# ── GPA × earned hours density (tab 3)
+
+DENSITY_COLUMNS = 3
+DENSITY_GAP = 0.07
+
+
+def gpa_hours_density_figure(bins, df: pd.DataFrame, facet: str | None = None, weight: str | None = None):
+    """Binned GPA × earned-hours heatmap from a version's ``DensityBins``, one panel per facet.
+
+    Only the fixed grid of counts is sent to the browser. Returns None when
+    no student in ``df`` has both a GPA and earned hours.
+    """
+    labels, counts = bins.grid(df, facet, weight)
+    if not counts.sum():
+        return None
+    x = (bins.hours_edges[:-1] + bins.hours_edges[1:]) / 2
+    y = (bins.gpa_edges[:-1] + bins.gpa_edges[1:]) / 2
+    # Empty cells stay blank instead of taking the lowest color
+    z = np.where(counts > 0, np.round(counts), np.nan)
+
+    columns = min(len(labels), DENSITY_COLUMNS)
+    rows = -(-len(labels) // columns)
+    width = (1 - DENSITY_GAP * (columns - 1)) / columns
+    height = (1 - DENSITY_GAP * (rows - 1)) / rows
+    layout = {
+        "coloraxis": {
+            "colorscale": colorscale(colors.sequential.Blues),
+            "colorbar": {"title": {"text": "الطلاب"}},
+        },
+        "height": 420 if rows == 1 else 300 * rows,
+        "annotations": [],
+    }
+    traces = []
+    for i, label in enumerate(labels):
+        axes = "" if i == 0 else str(i + 1)
+        row, column = divmod(i, columns)
+        left = column * (width + DENSITY_GAP)
+        top = 1 - row * (height + DENSITY_GAP)
+        traces.append(heatmap_trace(x, y, z[i], 'الساعات المكتسبة', 'المعدل التراكمي', 'الطلاب', axes))
+        layout[f"xaxis{axes}"] = {
+            "domain": [left, min(left + width, 1.0)],
+            "anchor": f"y{axes}",
+            "title": {"text": 'الساعات المكتسبة' if row == rows - 1 else ""},
+        }
+        layout[f"yaxis{axes}"] = {
+            "domain": [max(top - height, 0.0), top],
+            "anchor": f"x{axes}",
+            "range": [bins.gpa_edges[0], bins.gpa_edges[-1]],
+            "title": {"text": 'المعدل التراكمي' if column == 0 else ""},
+        }
+        if label is not None:
+            layout["annotations"].append({
+                "text": str(label), "x": left + width / 2, "y": top,
+                "xref": "paper", "yref": "paper", "xanchor": "center", "yanchor": "bottom",
+                "showarrow": False,
+            })
+    if layout["annotations"]:
+        layout["margin"] = {"t": 40, "l": 50, "r": 50, "b": 20}
+    return FigureSpec(traces, layout)
+
+
+# ── Dashboard figure set
+
+def dashboard_figures(filtered_df: pd.DataFrame, chart_df: pd.DataFrame, chart_weight: str | None = None,
+                      forecast=None) -> list:
+    """(name, builder, args) of the tab 1-3 figures, in page order.
+
+    Count charts read the exact ``filtered_df``; the distribution charts read
+    ``chart_df``, which is the weighted sample for approximate views.
+    ``forecast`` (the version's ``EnrollmentForecast``) adds the projected
+    segment to the enrollment trend.
+    """
+    return [
+        ("college_counts", college_counts_figure, (filtered_df,)),
+        ("status", status_figure, (filtered_df,)),
+        ("gender", gender_figure, (filtered_df,)),
+        ("enrollment_trend", enrollment_trend_figure, (filtered_df, forecast)),
+        ("country_map", country_map_figure, (chart_df, chart_weight)),
+        ("country_stats", country_stats_table, (filtered_df,)),
+        ("gpa_box", gpa_box_figure, (chart_df,)),
+        ("gpa_by_program", gpa_by_program_figure, (chart_df, chart_weight)),
+        ("gpa_kde", gpa_kde_figure, (chart_df, chart_weight)),
+    ]
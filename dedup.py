@@ -0,0 +1,263 @@
+import re
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from disciplines import normalize_arabic
+from utils import UNDEFINED_AR
+
+# Letters dropped after the first one when building the name skeleton: long
+# vowels and the folded ta marbuta, which vary most between spellings
+_SKELETON_DROP = re.compile(r"(?<!^)[اويه]")
+_COMPOUND = re.compile(r"\b(عبد|ابو) (?=ال)")
+# Lineage words ("son/daughter of") that some exports include and others omit
+NAME_STOPWORDS = {"بن", "بنت", "ابن"}
+NAME_PREFIX = 6
+# Blocks larger than this are too common to say anything (e.g. a placeholder
+# number or a very common name start) and are not compared
+MAX_BLOCK_SIZE = 30
+# Name similarity needed alongside a shared mobile or email, and on its own
+NAME_SUPPORT = 0.6
+NAME_MATCH = 0.9
+# Name-only matches need this many name parts, or fewer (down to
+# NAME_MATCH_MIN_TOKENS) plus a shared corroborating field, so that common
+# three-part names such as "محمد ابراهيم علي" are not merged on the name alone
+NAME_MATCH_TOKENS = 4
+NAME_MATCH_MIN_TOKENS = 3
+CORROBORATING_COLUMNS = ["college", "program"]
+MOBILE_DIGITS = 9
+
+REASON_LABELS = {
+    "student_id": "الرقم الجامعي",
+    "mobile": "الجوال",
+    "email": "البريد الإلكتروني",
+    "name": "الاسم",
+}
+
+
+def normalize_name(name) -> str:
+    """Folded Arabic/Latin name with compound prefixes such as "عبد ال" joined and "بن"/"بنت" dropped."""
+    tokens = _COMPOUND.sub(r"\1", normalize_arabic(name)).split()
+    return " ".join(token for token in tokens if token not in NAME_STOPWORDS)
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Similarity of two normalized names; 0 unless their first names are identical.
+
+    The score is the better of the share of the shorter name's parts found
+    in the longer one (so an added or dropped middle name still scores high)
+    and the character ratio, which is only computed when the former falls short.
+    """
+    if not a or not b:
+        return 0.0
+    tokens_a, tokens_b = a.split(), b.split()
+    # Near-identical first names are usually siblings ("حسين" / "حسن"), not a respelling
+    if tokens_a[0] != tokens_b[0]:
+        return 0.0
+    set_a, set_b = set(tokens_a), set(tokens_b)
+    containment = len(set_a & set_b) / min(len(set_a), len(set_b))
+    if containment >= NAME_MATCH:
+        return containment
+    return max(containment, SequenceMatcher(None, a, b).ratio())
+
+
+def name_skeleton(normalized: str) -> str:
+    """Spelling-tolerant blocking key: the name without spaces and inner long vowels, truncated."""
+    return _SKELETON_DROP.sub("", normalized.replace(" ", ""))[:NAME_PREFIX]
+
+
+def _per_distinct(values: pd.Series, func) -> np.ndarray:
+    codes, uniques = pd.factorize(values)
+    mapped = np.array([func(value) for value in uniques] + [None], dtype=object)
+    return mapped[codes]
+
+
+def email_local_part(email) -> str | None:
+    if pd.isna(email) or "@" not in str(email):
+        return None
+    return str(email).split("@")[0].strip().lower() or None
+
+
+def normalize_mobile(mobile) -> str | None:
+    """Last nine digits (country code and trunk zero dropped); None for placeholders."""
+    if pd.isna(mobile):
+        return None
+    digits = re.sub(r"\D", "", re.sub(r"\.0$", "", str(mobile)))
+    if len(digits) < MOBILE_DIGITS - 1 or len(set(digits)) < 3:
+        return None
+    return digits[-MOBILE_DIGITS:]
+
+
+def first_names(names: np.ndarray) -> np.ndarray:
+    return np.array([name.split()[0] if name else None for name in names], dtype=object)
+
+
+def shared_contacts(contacts: np.ndarray, firsts: np.ndarray) -> np.ndarray:
+    """``contacts`` with values used by students of different first names dropped.
+
+    A number or address written down for people with different first names
+    is a family phone, a sponsor's office or a placeholder, not evidence
+    that two records are the same student.
+    """
+    codes, uniques = pd.factorize(pd.Series(contacts, dtype=object))
+    first_codes, _ = pd.factorize(pd.Series(firsts, dtype=object))
+    known = (codes >= 0) & (first_codes >= 0)
+    # Distinct first names per contact value
+    pairs = np.unique(np.column_stack([codes[known], first_codes[known]]), axis=0)
+    # Missing contacts (code -1) read the trailing zero
+    spread = np.append(np.bincount(pairs[:, 0], minlength=len(uniques)), 0)
+    contacts = contacts.copy()
+    contacts[spread[codes] > 1] = None
+    return contacts
+
+
+def block_pairs(keys: np.ndarray) -> np.ndarray:
+    """(left, right) row pairs sharing a key, left < right; missing keys and oversized blocks skipped."""
+    codes, _ = pd.factorize(pd.Series(keys, dtype=object))
+    rows = np.flatnonzero(codes >= 0)
+    codes = codes[rows]
+    sizes = np.bincount(codes)
+    in_block = (sizes[codes] >= 2) & (sizes[codes] <= MAX_BLOCK_SIZE)
+    rows, codes = rows[in_block], codes[in_block]
+    order = np.argsort(codes, kind="stable")
+    rows, codes = rows[order], codes[order]
+    pairs = [np.empty((0, 2), dtype=np.int64)]
+    # Blocks of one size at a time form a (blocks, size) matrix, so pairs come out vectorized
+    block_sizes = sizes[codes]
+    for size in np.unique(block_sizes):
+        members = rows[block_sizes == size].reshape(-1, size)
+        left, right = np.triu_indices(size, k=1)
+        pairs.append(np.column_stack([members[:, left].ravel(), members[:, right].ravel()]))
+    return np.concatenate(pairs)
+
+
+def connected_components(n: int, pairs: np.ndarray) -> np.ndarray:
+    """Smallest row position of each row's component (label propagation with pointer jumping)."""
+    labels = np.arange(n)
+    if not len(pairs):
+        return labels
+    left, right = pairs[:, 0], pairs[:, 1]
+    while True:
+        low = np.minimum(labels[left], labels[right])
+        previous = labels.copy()
+        np.minimum.at(labels, left, low)
+        np.minimum.at(labels, right, low)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+class DuplicateIndex:
+    """Probable duplicate students (re-admitted or re-keyed under another ``STD_ID``) of a dataset version.
+
+    Rows are only compared inside blocks that share a key: the name
+    skeleton, the email local part or the normalized mobile, plus the
+    student id itself. This keeps the pass near-linear instead of comparing
+    every pair. A mobile or email shared by different first names is
+    ignored. A candidate pair matches when it shares a mobile or email and
+    the names are similar, or when the names are nearly identical with the
+    same gender and country and either have four parts or share the
+    college or program; either way the first names must be identical. Matches are joined into clusters, and each cluster's most recent
+    record (by last term) is its primary row in deduplicated counts.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.n = len(df)
+        names = _per_distinct(df["name"], normalize_name)
+        firsts = first_names(names)
+        mobiles = shared_contacts(_per_distinct(df["mobile"], normalize_mobile), firsts)
+        emails = shared_contacts(_per_distinct(df["email"], email_local_part), firsts)
+        ids = df["student_id"].astype(object).where(df["student_id"].notna(), None).to_numpy()
+
+        candidates = {
+            "student_id": block_pairs(ids),
+            "mobile": block_pairs(mobiles),
+            "email": block_pairs(emails),
+            "name": block_pairs(_per_distinct(pd.Series(names), name_skeleton)),
+        }
+        pair_codes = np.unique(np.concatenate([p[:, 0] * self.n + p[:, 1] for p in candidates.values()]))
+        left, right = pair_codes // max(self.n, 1), pair_codes % max(self.n, 1)
+
+        same_id = _equal(ids, left, right)
+        same_mobile = _equal(mobiles, left, right)
+        same_email = _equal(emails, left, right)
+        # Records of one student mostly repeat the same names; score each distinct name pair once
+        name_codes, distinct_names = pd.factorize(pd.Series(names, dtype=object))
+        distinct_names = np.append(np.asarray(distinct_names, dtype=object), "")
+        width = len(distinct_names)
+        # Missing names (code -1) point at the trailing ""
+        name_codes = name_codes % width
+        name_pairs, name_pair_index = np.unique(name_codes[left] * width + name_codes[right], return_inverse=True)
+        similarity = np.array([
+            name_similarity(distinct_names[a // width], distinct_names[a % width]) for a in name_pairs
+        ], dtype=np.float64)[name_pair_index]
+        tokens = np.array([len(set(name.split())) if name else 0 for name in names])
+        gender = df["gender"].to_numpy()
+        country = df["country"].to_numpy()
+        shortest = np.minimum(tokens[left], tokens[right])
+        corroborated = np.zeros(len(left), dtype=bool)
+        for column in CORROBORATING_COLUMNS:
+            values = df[column].astype(object)
+            corroborated |= _equal(values.where(values != UNDEFINED_AR).to_numpy(), left, right)
+        name_only = ((similarity >= NAME_MATCH) & (gender[left] == gender[right])
+                     & (country[left] == country[right])
+                     & ((shortest >= NAME_MATCH_TOKENS)
+                        | ((shortest >= NAME_MATCH_MIN_TOKENS) & corroborated)))
+        contact = (same_mobile | same_email) & (similarity >= NAME_SUPPORT)
+        matched = same_id | contact | name_only
+
+        reasons = np.select(
+            [same_id, contact & same_mobile, contact, name_only],
+            list(REASON_LABELS.values()),
+            default="",
+        )
+        self.pairs = pd.DataFrame({
+            "left": left[matched],
+            "right": right[matched],
+            "name_similarity": similarity[matched].round(2),
+            "reason": reasons[matched],
+        })
+        self.entity = connected_components(self.n, np.column_stack([left[matched], right[matched]]))
+
+        # Most recent record first: last term, then admission year, then file order
+        recency = np.lexsort((
+            -np.arange(self.n),
+            -df["admit_year"].fillna(-1).to_numpy(),
+            -df["last_term_year"].fillna(-1).to_numpy(),
+        ))
+        self.priority = np.empty(self.n, dtype=np.int64)
+        self.priority[recency] = np.arange(self.n)
+        sizes = np.bincount(self.entity, minlength=self.n)
+        self.duplicate_rows = int((sizes[self.entity] > 1).sum())
+        self.cluster_count = int((sizes > 1).sum())
+
+    def deduplicate(self, subset: pd.DataFrame) -> pd.DataFrame:
+        """One row per student of ``subset`` (rows by dataset position): the most recent one present."""
+        positions = subset.index.to_numpy()
+        order = np.argsort(self.priority[positions], kind="stable")
+        _, first = np.unique(self.entity[positions][order], return_index=True)
+        return subset.iloc[np.sort(order[first])]
+
+    def clusters(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rows of every cluster with more than one record, the primary record first in each."""
+        sizes = np.bincount(self.entity, minlength=self.n)
+        rows = np.flatnonzero(sizes[self.entity] > 1)
+        rows = rows[np.lexsort((self.priority[rows], self.entity[rows]))]
+        result = df.iloc[rows][["student_id", "name", "mobile", "email", "college", "status", "last_term"]].copy()
+        cluster_numbers = pd.factorize(self.entity[rows])[0] + 1
+        result.insert(0, "cluster", cluster_numbers)
+        reasons = pd.concat([
+            pd.Series(self.entity[self.pairs["left"].to_numpy()]),
+            pd.Series(self.entity[self.pairs["right"].to_numpy()]),
+        ], ignore_index=True)
+        labels = pd.concat([self.pairs["reason"]] * 2, ignore_index=True)
+        by_cluster = labels.groupby(reasons.to_numpy()).agg(lambda r: "، ".join(sorted(set(r))))
+        result["reason"] = by_cluster.reindex(self.entity[rows]).to_numpy()
+        return result.reset_index(drop=True)
+
+
+def _equal(values: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Whether both rows of each pair have the same non-missing value."""
+    codes, _ = pd.factorize(pd.Series(values, dtype=object))
+    return (codes[left] == codes[right]) & (codes[left] >= 0)
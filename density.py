@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from quality import GPA_RANGE
+
+GPA_BINS = 20
+HOURS_BINS = 24
+# Hours above this quantile share the last bin, so a few outliers do not stretch the axis
+HOURS_QUANTILE = 0.99
+# Largest facets drawn as their own panel; the rest are pooled into "أخرى"
+MAX_FACETS = 6
+OTHER_FACET = "أخرى"
+
+
+class DensityBins:
+    """GPA × earned-hours bin edges and per-row bin indexes of a dataset version.
+
+    Each row's cell (GPA bin × hours bin, -1 when either is missing or the
+    GPA is out of range) is computed once, so the density of any filtered
+    subset is a gather plus one ``np.bincount``. The grid is always
+    ``GPA_BINS × HOURS_BINS`` per facet, whatever the number of students.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        gpa = df["gpa"].to_numpy(dtype=np.float64)
+        hours = df["hours"].to_numpy(dtype=np.float64)
+        self.gpa_edges = np.linspace(*GPA_RANGE, GPA_BINS + 1)
+        known_hours = hours[~np.isnan(hours) & (hours >= 0)]
+        top = np.quantile(known_hours, HOURS_QUANTILE) if len(known_hours) else HOURS_BINS
+        step = max(1, int(np.ceil(top / HOURS_BINS)))
+        self.hours_edges = np.arange(HOURS_BINS + 1, dtype=np.float64) * step
+
+        # The last GPA bin is closed so a 5.0 is counted
+        gpa_bin = np.clip(np.searchsorted(self.gpa_edges, gpa, side="right") - 1, 0, GPA_BINS - 1)
+        hours_bin = np.clip(np.searchsorted(self.hours_edges, hours, side="right") - 1, 0, HOURS_BINS - 1)
+        valid = (gpa >= GPA_RANGE[0]) & (gpa <= GPA_RANGE[1]) & (hours >= 0)
+        self.cells = np.where(valid, gpa_bin * HOURS_BINS + hours_bin, -1).astype(np.int16)
+
+    def grid(self, subset: pd.DataFrame, facet: str | None = None, weight: str | None = None) -> tuple:
+        """(facet labels, counts of shape ``(facets, GPA_BINS, HOURS_BINS)``) of ``subset``.
+
+        ``subset`` holds rows of the dataset by position, as the filter index
+        and the stratified sample return them. Without ``facet`` there is one
+        panel labelled None.
+        """
+        cells = self.cells[subset.index.to_numpy()]
+        valid = cells >= 0
+        cells = cells[valid].astype(np.int64)
+        weights = None if weight is None else subset[weight].to_numpy(dtype=np.float64)[valid]
+        size = GPA_BINS * HOURS_BINS
+        if facet is None:
+            counts = np.bincount(cells, weights, minlength=size)
+            return [None], counts.reshape(1, GPA_BINS, HOURS_BINS)
+
+        codes, values = pd.factorize(subset[facet].to_numpy()[valid])
+        totals = np.bincount(codes, weights, minlength=len(values))
+        top = np.argsort(-totals, kind="stable")[:MAX_FACETS]
+        panel = np.full(len(values), len(top), dtype=np.int64)
+        panel[top] = np.arange(len(top))
+        labels = [values[i] for i in top]
+        if len(values) > len(top):
+            labels.append(OTHER_FACET)
+        counts = np.bincount(panel[codes] * size + cells, weights, minlength=len(labels) * size)
+        return labels, counts[:len(labels) * size].reshape(len(labels), GPA_BINS, HOURS_BINS)
@@ -0,0 +1,146 @@
+import re
+from collections import Counter
+
+import pandas as pd
+
+from utils import UNDEFINED_AR
+
+# Arabic diacritics (tashkeel), superscript alef and tatweel are dropped before matching
+_DIACRITICS = re.compile(r"[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]")
+_NON_WORD = re.compile(r"[^\w\s]")
+_ARABIC_FOLDING = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ة": "ه", "ؤ": "و", "ئ": "ي",
+})
+
+# Words that describe the kind of offering rather than the discipline itself
+DISCIPLINE_STOPWORDS = {"مسار", "شعبه", "قسم", "كليه", "برنامج", "تخصص", "و", "في", "من"}
+
+# Minimum similarity for a fuzzy match to be accepted
+MATCH_THRESHOLD = 0.55
+
+
+def normalize_arabic(text) -> str:
+    """Fold Arabic spelling variants so equivalent discipline names compare equal."""
+    if pd.isna(text):
+        return ""
+    text = _DIACRITICS.sub("", str(text))
+    text = text.translate(_ARABIC_FOLDING)
+    text = _NON_WORD.sub(" ", text).replace("_", " ")
+    return " ".join(text.lower().split())
+
+
+def discipline_tokens(normalized: str) -> list[str]:
+    """Content tokens with the conjunction "و" and article "ال" prefixes removed."""
+    tokens = []
+    for token in normalized.split():
+        if token.startswith("وال") and len(token) > 4:
+            token = token[3:]
+        elif token.startswith("ال") and len(token) > 3:
+            token = token[2:]
+        if token and token not in DISCIPLINE_STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def char_ngrams(tokens: list[str], n: int = 3) -> set[str]:
+    grams = set()
+    for token in tokens:
+        padded = f" {token} "
+        grams.update(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+    return grams
+
+
+class DisciplineIndex:
+    """Maps free-text applicant disciplines to enrolled ``program``/``college`` pairs.
+
+    Programs are indexed by their normalized token key, by token and by
+    character trigram. Each distinct applicant string is resolved once and
+    memoized, so repeated uploads only pay for strings not seen before.
+    """
+
+    def __init__(self, students_df: pd.DataFrame):
+        pairs = students_df[["program", "college"]].dropna()
+        pairs = pairs[pairs["program"] != UNDEFINED_AR]
+        # A program offered by several colleges is attributed to the one enrolling most students
+        top_college = (
+            pairs.groupby(["program", "college"]).size()
+            .sort_values(ascending=False)
+            .reset_index()
+            .drop_duplicates("program")
+        )
+        self.programs: list[str] = top_college["program"].tolist()
+        self.colleges: list[str] = top_college["college"].tolist()
+
+        self._exact: dict[str, int] = {}
+        self._token_sets: list[set[str]] = []
+        self._gram_sets: list[set[str]] = []
+        self._by_token: dict[str, set[int]] = {}
+        self._by_gram: dict[str, set[int]] = {}
+        for pid, program in enumerate(self.programs):
+            tokens = discipline_tokens(normalize_arabic(program))
+            grams = char_ngrams(tokens)
+            self._exact.setdefault(" ".join(tokens), pid)
+            self._token_sets.append(set(tokens))
+            self._gram_sets.append(grams)
+            for token in tokens:
+                self._by_token.setdefault(token, set()).add(pid)
+            for gram in grams:
+                self._by_gram.setdefault(gram, set()).add(pid)
+
+        self._cache: dict = {}
+
+    def _score(self, pid: int, tokens: set[str], grams: set[str]) -> float:
+        program_grams = self._gram_sets[pid]
+        dice = 2 * len(grams & program_grams) / (len(grams) + len(program_grams) or 1)
+        union = tokens | self._token_sets[pid]
+        jaccard = len(tokens & self._token_sets[pid]) / (len(union) or 1)
+        return 0.6 * dice + 0.4 * jaccard
+
+    def _resolve(self, text) -> tuple:
+        tokens = discipline_tokens(normalize_arabic(text))
+        if not tokens:
+            return None, None, 0.0
+        key = " ".join(tokens)
+        if key in self._exact:
+            pid = self._exact[key]
+            return self.programs[pid], self.colleges[pid], 1.0
+
+        token_set = set(tokens)
+        grams = char_ngrams(tokens)
+        candidates = Counter()
+        for token in token_set:
+            candidates.update(self._by_token.get(token, ()))
+        for gram in grams:
+            candidates.update(self._by_gram.get(gram, ()))
+        best_pid, best_score = None, 0.0
+        # Only the programs sharing the most tokens/trigrams are worth scoring exactly
+        for pid, _ in candidates.most_common(20):
+            score = self._score(pid, token_set, grams)
+            if score > best_score:
+                best_pid, best_score = pid, score
+        if best_pid is None or best_score < MATCH_THRESHOLD:
+            return None, None, round(best_score, 3)
+        return self.programs[best_pid], self.colleges[best_pid], round(best_score, 3)
+
+    def match(self, text) -> tuple:
+        """Return ``(program, college, score)``; program is None when nothing is close enough."""
+        if text not in self._cache:
+            self._cache[text] = self._resolve(text)
+        return self._cache[text]
+
+    def mapping_table(self, values: pd.Series) -> pd.DataFrame:
+        """Resolve each distinct value once and return a discipline -> program table."""
+        distinct = pd.Series(values.dropna().unique())
+        matches = [self.match(value) for value in distinct]
+        return pd.DataFrame({
+            "discipline": distinct,
+            "program": [m[0] for m in matches],
+            "college": [m[1] for m in matches],
+            "score": [m[2] for m in matches],
+        })
+
+    def map_programs(self, values: pd.Series) -> pd.Series:
+        """Vectorized discipline -> program lookup (distinct values resolved once)."""
+        lookup = {value: self.match(value)[0] for value in values.dropna().unique()}
+        return values.map(lookup)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+# Drill-down hierarchy, coarsest first
+DRILL_LEVELS = ["continent", "country", "college", "program"]
+DRILL_LABELS = {
+    "continent": "القارة",
+    "country": "الدولة",
+    "college": "الكلية",
+    "program": "البرنامج",
+}
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """Student counts and GPA sums per (continent, country, college, program, status).
+
+    The cube has one row per populated combination (a few thousand at most), so
+    every drill-down view is an aggregation over it rather than over the rows.
+    """
+    gpa = df["gpa"]
+    cube = pd.DataFrame({
+        **{level: df[level] for level in DRILL_LEVELS},
+        "status": df["status"],
+        "gpa_sum": gpa.fillna(0.0),
+        "gpa_n": gpa.notna().astype(np.int64),
+    }).groupby([*DRILL_LEVELS, "status"], sort=False, dropna=False).agg(
+        count=("gpa_n", "size"), gpa_sum=("gpa_sum", "sum"), gpa_n=("gpa_n", "sum"),
+    )
+    return cube.reset_index()
+
+
+def next_level(path: dict) -> str | None:
+    """First hierarchy level not fixed by ``path``."""
+    return next((level for level in DRILL_LEVELS if level not in path), None)
+
+
+def cube_slice(cube: pd.DataFrame, path: dict) -> pd.DataFrame:
+    mask = np.ones(len(cube), dtype=bool)
+    for level, value in path.items():
+        mask &= (cube[level] == value).to_numpy()
+    return cube[mask]
+
+
+def summarize(cube: pd.DataFrame, path: dict, by: str) -> pd.DataFrame:
+    """Count and mean GPA per ``by`` value inside the drill ``path``, largest first."""
+    grouped = cube_slice(cube, path).groupby(by, sort=False)[["count", "gpa_sum", "gpa_n"]].sum()
+    grouped["gpa_mean"] = (grouped["gpa_sum"] / grouped["gpa_n"].replace(0, np.nan)).round(2)
+    return grouped[["count", "gpa_mean"]].sort_values("count", ascending=False).reset_index()
+
+
+def valid_path(cube: pd.DataFrame, path: dict) -> dict:
+    """Drop path entries (and everything after them) that no longer match any row."""
+    kept = {}
+    for level in DRILL_LEVELS:
+        if level not in path:
+            continue
+        candidate = {**kept, level: path[level]}
+        if cube_slice(cube, candidate).empty:
+            break
+        kept = candidate
+    return kept
+
+
+def apply_path(df: pd.DataFrame, path: dict) -> pd.DataFrame:
+    """Rows of ``df`` inside the drill ``path``."""
+    if not path:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    for level, value in path.items():
+        mask &= (df[level] == value).to_numpy()
+    return df[mask]
@@ -0,0 +1,222 @@
+import importlib
+from functools import lru_cache
+
+import numpy as np
+from plotly.basedatatypes import BaseFigure
+
+TEMPLATE_NAME = "dashboard_rtl"
+# Layout shared by every dashboard figure (what utils.format_plot applies to px figures)
+RTL_LAYOUT = {
+    "showlegend": False,
+    "font": {"family": "Inter, sans-serif"},
+    "margin": {"t": 20, "l": 50, "r": 50, "b": 20},
+    # Right-aligned hover labels without the trace name
+    "hoverlabel": {"align": "right", "namelength": 0},
+}
+
+
+@lru_cache(maxsize=1)
+def rtl_template() -> dict:
+    """Register the dashboard template with plotly.io (once per process) and return it as JSON."""
+    pio = importlib.import_module("plotly.io")
+    go = importlib.import_module("plotly.graph_objects")
+    template = go.layout.Template(pio.templates["plotly"])
+    template.layout.update(RTL_LAYOUT)
+    pio.templates[TEMPLATE_NAME] = template
+    return template.to_plotly_json()
+
+
+class FigureSpec(BaseFigure):
+    """A plain figure dict that Streamlit and plotly.io treat as an already validated figure.
+
+    ``BaseFigure.__init__`` is deliberately not called: no graph objects or
+    property validators are created, and ``to_dict`` hands the spec out as
+    is. Traces are built from precomputed aggregates by the helpers below;
+    the shared styling comes from the registered RTL template.
+
+    The spec is read-only. Only the export methods below are supported; every
+    other ``BaseFigure`` attribute (``update_layout``, ``add_trace``,
+    ``data``, ...) raises an AttributeError naming the alternative, rather
+    than failing on the graph-object state that was never built.
+    """
+
+    def __init__(self, data: list, layout: dict):
+        self._spec = {
+            "data": data,
+            "layout": {"template": rtl_template(), "title": {"text": ""}, **layout},
+        }
+
+    @classmethod
+    def _from_spec(cls, spec: dict) -> "FigureSpec":
+        figure = cls.__new__(cls)
+        figure._spec = spec
+        return figure
+
+    def to_dict(self) -> dict:
+        return self._spec
+
+    def to_plotly_json(self) -> dict:
+        return self._spec
+
+    def to_json(self, **kwargs) -> str:
+        return importlib.import_module("plotly.io").to_json(self._spec, validate=False, **kwargs)
+
+    def to_html(self, **kwargs) -> str:
+        return importlib.import_module("plotly.io").to_html(self._spec, validate=False, **kwargs)
+
+    def write_html(self, file, **kwargs) -> None:
+        importlib.import_module("plotly.io").write_html(self._spec, file, validate=False, **kwargs)
+
+    def show(self, **kwargs) -> None:
+        importlib.import_module("plotly.io").show(self._spec, validate=False, **kwargs)
+
+    def __reduce__(self):
+        return FigureSpec._from_spec, (self._spec,)
+
+    def __getitem__(self, key: str):
+        return self._spec[key]
+
+    def __iter__(self):
+        return iter(self._spec)
+
+    def __contains__(self, key) -> bool:
+        return key in self._spec
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FigureSpec) and self._spec == other._spec
+
+    __hash__ = None
+    __setattr__ = object.__setattr__
+
+    def __setitem__(self, key, value):
+        raise TypeError("FigureSpec is read-only; build plotly.graph_objects.Figure(spec.to_dict()) to edit it")
+
+    def __repr__(self) -> str:
+        return f"FigureSpec({[trace['type'] for trace in self._spec['data']]})"
+
+
+def _unsupported(name: str) -> property:
+    def fail(self):
+        raise AttributeError(
+            f"FigureSpec.{name} is not available: the spec is a plain dict without graph objects; "
+            f"use plotly.graph_objects.Figure(spec.to_dict()).{name} instead"
+        )
+    return property(fail)
+
+
+# Block the inherited graph-object API (mutators, accessors, image export)
+for _name in dir(BaseFigure):
+    if not _name.startswith("_") and _name not in vars(FigureSpec):
+        setattr(FigureSpec, _name, _unsupported(_name))
+
+
+def hovertemplate(*fields: tuple) -> str:
+    """Hover text of ``(label, variable)`` pairs, as plotly.express writes it."""
+    return "<br>".join(f"{label}=%{{{variable}}}" for label, variable in fields) + "<extra></extra>"
+
+
+def axis_titles(x_title: str, y_title: str) -> dict:
+    return {"xaxis": {"title": {"text": x_title}}, "yaxis": {"title": {"text": y_title}}}
+
+
+def bar_trace(x, y, x_label: str, y_label: str, color: str, orientation: str = "v") -> dict:
+    return {
+        "type": "bar",
+        "x": x,
+        "y": y,
+        "orientation": orientation,
+        "marker": {"color": color},
+        "name": "",
+        "showlegend": False,
+        "hovertemplate": hovertemplate((x_label, "x"), (y_label, "y")),
+    }
+
+
+def pie_trace(labels, values, hole: float = 0.5) -> dict:
+    return {
+        "type": "pie",
+        "labels": labels,
+        "values": values,
+        "hole": hole,
+        "textinfo": "label+percent+value",
+        "hoverinfo": "skip",
+        "name": "",
+    }
+
+
+def line_trace(x, y, x_label: str, y_label: str, color: str, width: int = 3, markers: bool = True,
+               dash: str = "solid") -> dict:
+    return {
+        "type": "scatter",
+        "x": x,
+        "y": y,
+        "mode": "lines+markers" if markers else "lines",
+        "line": {"color": color, "width": width, "dash": dash},
+        "name": "",
+        "showlegend": False,
+        "hovertemplate": hovertemplate((x_label, "x"), (y_label, "y")),
+    }
+
+
+def area_trace(x, y, x_label: str, y_label: str, color: str, fillcolor: str) -> dict:
+    return {
+        "type": "scatter",
+        "x": x,
+        "y": y,
+        "mode": "lines",
+        "stackgroup": "1",
+        "line": {"color": color},
+        "fillcolor": fillcolor,
+        "name": "",
+        "showlegend": False,
+        "hovertemplate": hovertemplate((x_label, "x"), (y_label, "y")),
+    }
+
+
+def interval_trace(x, low, high, fillcolor: str) -> dict:
+    """Shaded band between ``low`` and ``high`` (e.g. a forecast interval), drawn as one closed shape."""
+    return {
+        "type": "scatter",
+        "x": np.concatenate([x, x[::-1]]),
+        "y": np.concatenate([high, low[::-1]]),
+        "mode": "lines",
+        "fill": "toself",
+        "fillcolor": fillcolor,
+        "line": {"width": 0},
+        "name": "",
+        "showlegend": False,
+        "hoverinfo": "skip",
+    }
+
+
+def box_trace(x, y, x_label: str, y_label: str, color: str) -> dict:
+    return {
+        "type": "box",
+        "x": x,
+        "y": y,
+        "marker": {"color": color},
+        "name": "",
+        "showlegend": False,
+        "hovertemplate": hovertemplate((x_label, "x"), (y_label, "y")),
+    }
+
+
+def heatmap_trace(x, y, z, x_label: str, y_label: str, z_label: str, axes: str = "") -> dict:
+    """Heatmap on the shared ``coloraxis``; ``axes`` is the subplot suffix ("", "2", ...)."""
+    return {
+        "type": "heatmap",
+        "x": x,
+        "y": y,
+        "z": z,
+        "coloraxis": "coloraxis",
+        "xaxis": f"x{axes}",
+        "yaxis": f"y{axes}",
+        "name": "",
+        "hovertemplate": hovertemplate((x_label, "x"), (y_label, "y"), (z_label, "z")),
+    }
+
+
+def colorscale(colors: list) -> list:
+    """Evenly spaced ``[[position, color], ...]`` scale from a list of colors."""
+    last = max(len(colors) - 1, 1)
+    return [[i / last, color] for i, color in enumerate(colors)]
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+# Columns with a single-value selectbox filter, in the sidebar's order
+FILTER_COLUMNS = ["country", "college", "program", "status", "status_bucket", "gender"]
+ALL_OPTION = "الكل"
+
+
+class FilterIndex:
+    """Row positions per filter value, built once per dataset version.
+
+    A selection is answered by intersecting the (sorted) position arrays of
+    the selected values, starting from the smallest, and then applying the
+    GPA range to those positions only. The result keeps the dataset's row
+    order, so it matches the boolean-mask filtering it replaces.
+    """
+
+    def __init__(self, df: pd.DataFrame, positions: dict | None = None):
+        self.df = df
+        self.version = df.attrs.get("version", "")
+        # ``positions`` ({column: {value: sorted positions}}) lets a prebuilt index be
+        # attached, e.g. memory-mapped arrays from the shared dataset store
+        self._positions = positions or {
+            column: df.groupby(column, sort=True).indices for column in FILTER_COLUMNS
+        }
+        gpa = df["gpa"].to_numpy(dtype=np.float64)
+        known = gpa[~np.isnan(gpa)]
+        self.gpa_min = float(known.min()) if len(known) else 0.0
+        self.gpa_max = float(known.max()) if len(known) else 5.0
+        if self.gpa_min == self.gpa_max:
+            self.gpa_max = self.gpa_min + 1
+        # Missing GPAs sit at the minimum so the full range keeps them
+        self._gpa = np.where(np.isnan(gpa), self.gpa_min, gpa)
+
+    def options(self, column: str) -> list:
+        """Distinct values of ``column`` (sorted), without the "all" option."""
+        return list(self._positions[column])
+
+    def positions(self, selections: dict, gpa_range: tuple | None = None) -> np.ndarray:
+        """Sorted row positions matching ``{column: value}`` and the inclusive GPA range.
+
+        Columns missing from ``selections`` or set to ``ALL_OPTION`` are not filtered.
+        """
+        groups = []
+        for column in FILTER_COLUMNS:
+            value = selections.get(column, ALL_OPTION)
+            if value != ALL_OPTION:
+                groups.append(self._positions[column].get(value, np.empty(0, dtype=np.int64)))
+        if groups:
+            groups.sort(key=len)
+            positions = groups[0]
+            for other in groups[1:]:
+                positions = np.intersect1d(positions, other, assume_unique=True)
+        else:
+            positions = np.arange(len(self.df))
+        if gpa_range is not None:
+            gpa = self._gpa[positions]
+            positions = positions[(gpa >= gpa_range[0]) & (gpa <= gpa_range[1])]
+        return positions
+
+    def filter(self, selections: dict, gpa_range: tuple | None = None) -> pd.DataFrame:
+        return self.df.iloc[self.positions(selections, gpa_range)]
+
+    def apply_changes(self, df: pd.DataFrame, removed: np.ndarray) -> "FilterIndex":
+        """Index for ``df``: this index's rows minus the sorted ``removed`` positions, plus new rows at the end.
+
+        Only the value groups of removed and appended rows are rebuilt; the
+        other groups are just shifted past the removed positions.
+        """
+        kept = len(self.df) - len(removed)
+        appended = np.arange(kept, len(df))
+        positions = {}
+        for column in FILTER_COLUMNS:
+            groups = dict(self._positions[column])
+            old_values = self.df[column].to_numpy()[removed]
+            for value in pd.unique(old_values):
+                groups[value] = np.setdiff1d(groups[value], removed, assume_unique=True)
+            if len(removed):
+                groups = {value: group - np.searchsorted(removed, group) for value, group in groups.items()}
+            new_values = df[column].to_numpy()[appended]
+            for value, rows in pd.Series(appended).groupby(new_values, sort=False).indices.items():
+                groups[value] = np.concatenate([groups.get(value, np.empty(0, dtype=np.int64)), appended[rows]])
+            positions[column] = {value: groups[value] for value in sorted(groups) if len(groups[value])}
+        return FilterIndex(df, positions)
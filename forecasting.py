@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Intake years projected past the last year in the data
+FORECAST_HORIZON = 3
+# Most recent intake years the models are fitted on
+FORECAST_WINDOW = 10
+# "holt" (exponential smoothing with a trend) or "linear" (least-squares trend)
+FORECAST_METHOD = os.environ.get("DASHBOARD_FORECAST_METHOD", "holt")
+# Normal quantile of the two-sided ~95% prediction interval
+INTERVAL_Z = 1.96
+# Smoothing parameters tried for every group at once; each group keeps the
+# pair with the smallest one-step-ahead error
+HOLT_ALPHAS = np.array([0.2, 0.4, 0.6, 0.8])
+HOLT_BETAS = np.array([0.05, 0.1, 0.2, 0.4])
+FORECAST_GROUPS = ["country", "college"]
+
+
+def linear_trend(counts: np.ndarray, years: np.ndarray, future_years: np.ndarray) -> tuple:
+    """Least-squares line per row of ``counts`` (groups × years); returns (point, standard error)."""
+    x = years - years.mean()
+    sxx = max(float((x ** 2).sum()), 1e-9)
+    mean = counts.mean(axis=1)
+    slope = counts @ x / sxx
+    residuals = counts - (mean[:, None] + slope[:, None] * x)
+    variance = (residuals ** 2).sum(axis=1) / max(len(years) - 2, 1)
+    ahead = future_years - years.mean()
+    point = mean[:, None] + slope[:, None] * ahead
+    error = np.sqrt(variance[:, None] * (1 + 1 / len(years) + ahead ** 2 / sxx))
+    return point, error
+
+
+def holt(counts: np.ndarray, horizon: int) -> tuple:
+    """Holt's linear exponential smoothing per row of ``counts``; returns (point, standard error).
+
+    Every group and every (alpha, beta) pair is smoothed in the same array
+    pass, one step per year. The interval uses the one-step error variance
+    widened by Holt's ``1 + sum(alpha² (1 + j·beta)²)`` factor per step ahead.
+    """
+    alpha, beta = (grid.ravel() for grid in np.meshgrid(HOLT_ALPHAS, HOLT_BETAS, indexing="ij"))
+    groups, years = counts.shape
+    level = np.repeat(counts[:, :1], len(alpha), axis=1)
+    trend = np.repeat(counts[:, 1:2] - counts[:, :1], len(alpha), axis=1)
+    squared = np.zeros_like(level)
+    for t in range(1, years):
+        expected = level + trend
+        # The first step only sets the initial trend, so it is not scored
+        if t >= 2:
+            squared += (counts[:, t:t + 1] - expected) ** 2
+        new_level = alpha * counts[:, t:t + 1] + (1 - alpha) * expected
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        level = new_level
+
+    best = squared.argmin(axis=1)
+    rows = np.arange(groups)
+    level, trend, variance = level[rows, best], trend[rows, best], squared[rows, best] / max(years - 2, 1)
+    alpha, beta = alpha[best], beta[best]
+    steps = np.arange(1, horizon + 1)
+    point = level[:, None] + steps * trend[:, None]
+    growth = (alpha[:, None] * (1 + steps[:-1] * beta[:, None])) ** 2
+    factor = 1 + np.concatenate([np.zeros((groups, 1)), np.cumsum(growth, axis=1)], axis=1)
+    return point, np.sqrt(variance[:, None] * factor)
+
+
+def forecast_counts(counts: np.ndarray, years: np.ndarray, horizon: int = FORECAST_HORIZON,
+                    method: str = FORECAST_METHOD) -> tuple:
+    """Yearly counts projected ``horizon`` years past ``years`` for every row of ``counts``.
+
+    Returns ``(future years, point, low, high)``, each count array of shape
+    (groups, horizon) and floored at zero. With fewer than three years the
+    last count is carried forward without an interval.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    last = int(years[-1]) if len(years) else 0
+    future_years = np.arange(last + 1, last + horizon + 1)
+    if len(years) < 3:
+        point = np.repeat(counts[:, -1:] if len(years) else np.zeros((len(counts), 1)), horizon, axis=1)
+        error = np.zeros_like(point)
+    elif method == "linear":
+        point, error = linear_trend(counts, years.astype(np.float64), future_years.astype(np.float64))
+    else:
+        point, error = holt(counts, horizon)
+    low = np.maximum(point - INTERVAL_Z * error, 0)
+    high = np.maximum(point + INTERVAL_Z * error, 0)
+    return future_years, np.maximum(point, 0), low, high
+
+
+class EnrollmentForecast:
+    """Yearly intake (``timeline_year``) per country and college of a dataset version, and its projection.
+
+    The (group × year) count matrices are built with one ``np.bincount``
+    per grouping and every group is fitted at once. Only years present in
+    the dataset are columns: a year missing from the whole export is a gap
+    in the data, not a year without students. Each row's window year is
+    kept, so the projection of any filtered subset is a gather plus one
+    more bincount.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        years = df["timeline_year"].to_numpy(dtype=np.float64)
+        self.years = np.unique(years[~np.isnan(years)]).astype(np.int64)[-FORECAST_WINDOW:]
+        position = np.searchsorted(self.years, years)
+        inside = ~np.isnan(years) & (position < len(self.years))
+        inside[inside] = self.years[position[inside]] == years[inside]
+        # Window year of each row, -1 when its year is missing or before the window
+        self.year_codes = np.where(inside, position, -1)
+
+        self.groups = {}
+        for column in FORECAST_GROUPS:
+            codes, labels = pd.factorize(df[column])
+            valid = (codes >= 0) & inside
+            counts = np.bincount(
+                codes[valid] * len(self.years) + self.year_codes[valid],
+                minlength=len(labels) * len(self.years),
+            ).reshape(len(labels), len(self.years))
+            future_years, point, low, high = forecast_counts(counts, self.years)
+            self.groups[column] = (np.asarray(labels), counts, point, low, high)
+        self.future_years = future_years
+
+    def project(self, subset: pd.DataFrame) -> tuple:
+        """(years, counts, future years, point, low, high) of the rows of ``subset`` (by dataset position)."""
+        codes = self.year_codes[subset.index.to_numpy()]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.years))
+        future_years, point, low, high = forecast_counts(counts[None, :], self.years)
+        return self.years, counts, future_years, point[0], low[0], high[0]
+
+    def table(self, column: str) -> pd.DataFrame:
+        """Last intake and next-year projection with its interval per group, largest projection first."""
+        labels, counts, point, low, high = self.groups[column]
+        table = pd.DataFrame({
+            column: labels,
+            "last": counts[:, -1] if counts.shape[1] else 0,
+            "forecast": point[:, 0].round(1),
+            "low": low[:, 0].round(1),
+            "high": high[:, 0].round(1),
+        })
+        return table.sort_values("forecast", ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,175 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from quality import check_source, merge_reports
+from status_rules import get_status_classifier
+from utils import (
+    map_country,
+    map_continent,
+    parse_hijri_year,
+    format_hijri_date,
+    map_gender,
+    UNDEFINED_AR,
+)
+
+# Default manifest location (DASHBOARD_MANIFEST overrides it) and the single-workbook
+# fallback used when it is missing
+MANIFEST_PATH = os.environ.get("DASHBOARD_MANIFEST", os.path.join("data", "sources.json"))
+DEFAULT_SOURCES = [{"name": "data", "path": os.path.join("data", "data.xlsx"), "sheet": 0}]
+
+# Registrar export columns consumed by process_frame
+REGISTRAR_COLUMNS = [
+    "STD_ID", "STD_NAME", "GENDER", "CITZ_DESC", "MAJR_DESC", "COLL_DESC",
+    "LAST_STST", "CELG_CODE", "STD_GPA", "STD_HRS", "TERM_ADMIT", "LAST_TERM",
+    "LEVL_DESC", "EMAIL", "MOBILE",
+]
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> list[dict]:
+    """Read the source manifest and expand multi-sheet entries into one task per sheet.
+
+    Each entry needs a ``path``; ``name``, ``sheet`` (name, index or list of them),
+    ``columns`` (source column -> registrar column) and ``defaults`` (registrar
+    column -> constant, e.g. ``LEVL_DESC`` for a per-level export) are optional. Relative
+    paths are resolved from the working directory, like ``data/data.xlsx``.
+    """
+    if not os.path.exists(path):
+        return [dict(entry) for entry in DEFAULT_SOURCES]
+
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    tasks = []
+    for entry in manifest.get("sources", []):
+        file_path = entry["path"]
+        base_name = entry.get("name") or os.path.splitext(os.path.basename(file_path))[0]
+        sheets = entry.get("sheet", 0)
+        if not isinstance(sheets, list):
+            sheets = [sheets]
+        for sheet in sheets:
+            name = base_name if len(sheets) == 1 else f"{base_name}:{sheet}"
+            tasks.append({
+                "name": name,
+                "path": file_path,
+                "sheet": sheet,
+                "columns": entry.get("columns", {}),
+                "defaults": entry.get("defaults", {}),
+            })
+    return tasks
+
+
+def read_source(source: dict) -> pd.DataFrame:
+    """Read one workbook sheet, CSV or Parquet file and rename it to registrar columns."""
+    path = source["path"]
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm", ".xls"):
+        df = pd.read_excel(path, sheet_name=source.get("sheet", 0))
+    elif ext == ".csv":
+        df = pd.read_csv(path, encoding="utf-8-sig")
+    elif ext == ".parquet":
+        df = pd.read_parquet(path)
+    else:
+        raise ValueError(f"Unsupported source format: {path}")
+    df.columns = [str(c).strip() for c in df.columns]
+    df = df.rename(columns=source.get("columns", {}))
+    for col, value in source.get("defaults", {}).items():
+        df[col] = df[col].fillna(value) if col in df.columns else value
+    return df
+
+
+def process_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize a raw registrar export into the dashboard's derived columns."""
+    # Sources exported without some columns still produce the full schema
+    df = df.reindex(columns=list(dict.fromkeys(list(df.columns) + REGISTRAR_COLUMNS)))
+    processed = pd.DataFrame({
+        "student_id": df.get("STD_ID"),
+        "name": df.get("STD_NAME"),
+        "gender": df.get("GENDER").apply(map_gender),
+        "country": df.get("CITZ_DESC").apply(map_country),
+        "program": df.get("MAJR_DESC").fillna(UNDEFINED_AR),
+        "college": df.get("COLL_DESC").fillna(UNDEFINED_AR),
+        "status_detail": df.get("LAST_STST").fillna(UNDEFINED_AR),
+        "funding": df.get("CELG_CODE").fillna(UNDEFINED_AR),
+        "gpa": pd.to_numeric(df.get("STD_GPA"), errors="coerce"),
+        "hours": pd.to_numeric(df.get("STD_HRS"), errors="coerce"),
+        "term_admit": df.get("TERM_ADMIT"),
+        "last_term": df.get("LAST_TERM"),
+        "level": df.get("LEVL_DESC").fillna(UNDEFINED_AR),
+        "email": df.get("EMAIL"),
+        "mobile": df.get("MOBILE"),
+    })
+
+    # Coarse status and finer bucket from the ordered rules in data/status_rules.json
+    processed[["status", "status_bucket"]] = get_status_classifier().classify_series(processed["status_detail"])
+    processed["admit_year"] = processed["term_admit"].apply(parse_hijri_year)
+    processed["last_term_year"] = processed["last_term"].apply(parse_hijri_year)
+    processed["timeline_year"] = processed["admit_year"].fillna(processed["last_term_year"])
+    processed["continent"] = processed["country"].apply(map_continent)
+    # Add formatted Hijri date columns
+    processed["admit_date_hijri"] = processed["term_admit"].apply(format_hijri_date)
+    processed["last_term_hijri"] = processed["last_term"].apply(format_hijri_date)
+    return processed
+
+
+def raw_fingerprints(raw: pd.DataFrame) -> np.ndarray:
+    """Per-row hash of the registrar columns of a raw export, to spot changed rows."""
+    return pd.util.hash_pandas_object(raw.reindex(columns=REGISTRAR_COLUMNS), index=False).to_numpy()
+
+
+def ingest_source(source: dict, with_details: bool = False):
+    """Read and normalize a single source; runs inside a worker process.
+
+    With ``with_details`` returns ``(processed, raw row fingerprints, quality report)``.
+    """
+    raw = read_source(source)
+    processed = process_frame(raw)
+    processed["source"] = source["name"]
+    if with_details:
+        return processed, raw_fingerprints(raw), check_source(raw, source["name"])
+    return processed
+
+
+def ingest_sources(sources: list[dict], max_workers: int | None = None, with_details: bool = False):
+    """Ingest every source in parallel and concatenate them in manifest order.
+
+    Each file is read and normalized in its own worker process, so the total
+    time tracks the slowest source rather than the sum of all of them.
+    With ``with_details`` returns ``(dataset, raw row fingerprints, per-source
+    quality reports, merged quality report)``.
+    """
+    if not sources:
+        raise ValueError("Source manifest is empty")
+    ingest = partial(ingest_source, with_details=with_details)
+    if len(sources) == 1:
+        results = [ingest(sources[0])]
+    else:
+        workers = min(len(sources), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(ingest, sources))
+    frames = [result[0] for result in results] if with_details else results
+    combined = pd.concat(frames, ignore_index=True)
+    combined.attrs["version"] = dataset_version(combined)
+    if with_details:
+        reports = {source["name"]: result[2] for source, result in zip(sources, results)}
+        fingerprints = np.concatenate([result[1] for result in results])
+        return combined, fingerprints, reports, merge_reports(list(reports.values()), combined)
+    return combined
+
+
+def row_hash_sum(df: pd.DataFrame) -> int:
+    """Sum of the row hashes (mod 2**64); additive, so it can be updated row by row."""
+    return int(pd.util.hash_pandas_object(df, index=False).to_numpy().sum())
+
+
+def format_version(rows: int, hash_sum: int) -> str:
+    return f"{rows}-{hash_sum & 0xFFFFFFFFFFFF:012x}"
+
+
+def dataset_version(df: pd.DataFrame) -> str:
+    """Content fingerprint of a processed dataset, used to key derived caches."""
+    return format_version(len(df), row_hash_sum(df))
@@ -0,0 +1,306 @@
+import gc
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ROWS = [10_000]
+DEFAULT_SESSIONS = [1, 2, 4, 8]
+STEPS_PER_SESSION = 10
+APPLICANTS_PER_FILE = 2_000
+
+# Runs app.py with st.file_uploader answering from session state, since AppTest
+# cannot upload files: a session "uploads" by setting LOADTEST_UPLOAD_KEY.
+LOADTEST_UPLOAD_KEY = "loadtest_applicants"
+WRAPPER_SCRIPT = """
+import io
+import os
+import runpy
+import sys
+
+import streamlit as st
+
+sys.path.insert(0, {root!r})
+os.chdir({root!r})
+
+
+class _Upload(io.BytesIO):
+    name = "applicants.csv"
+
+
+_file_uploader = st.file_uploader
+
+
+def _session_uploader(label, *args, **kwargs):
+    if kwargs.get("key") == "applicants_upload":
+        path = st.session_state.get({key!r})
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return _Upload(f.read())
+    return _file_uploader(label, *args, **kwargs)
+
+
+st.file_uploader = _session_uploader
+runpy.run_path(os.path.join({root!r}, "app.py"), run_name="__main__")
+"""
+
+
+# ── Generated inputs
+
+def generate_dataset(rows: int, directory: str, seed: int = 0) -> str:
+    """Registrar export of ``rows`` students resampled from the real sources; returns its manifest path.
+
+    Rows are drawn with replacement, get fresh ``STD_ID``s and a jittered
+    GPA, so the value distributions (countries, colleges, statuses) match
+    production while the size is arbitrary.
+    """
+    from ingest import load_manifest, read_source
+
+    source = pd.concat([read_source(s) for s in load_manifest()], ignore_index=True)
+    rng = np.random.default_rng(seed)
+    export = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+    export["STD_ID"] = np.arange(400_000_000, 400_000_000 + rows)
+    gpa = pd.to_numeric(export["STD_GPA"], errors="coerce")
+    export["STD_GPA"] = (gpa + rng.normal(0, 0.1, rows)).clip(0, 5).round(2)
+    csv_path = os.path.join(directory, f"students_{rows}.csv")
+    export.to_csv(csv_path, index=False, encoding="utf-8-sig")
+    manifest_path = os.path.join(directory, f"sources_{rows}.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"sources": [{"name": "loadtest", "path": csv_path}]}, f, ensure_ascii=False)
+    return manifest_path
+
+
+def generate_applicants(directory: str, count: int = APPLICANTS_PER_FILE, files: int = 3, seed: int = 0) -> list:
+    """mock.csv-style applicant files (ID, Nationality, three disciplines) from the dataset's values."""
+    from ingest import load_manifest, ingest_sources
+    from utils import ARABIC_TO_ENGLISH
+
+    students = ingest_sources(load_manifest())
+    countries = [ARABIC_TO_ENGLISH[c] for c in students["country"].unique() if c in ARABIC_TO_ENGLISH]
+    programs = students["program"].unique()
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(files):
+        applicants = pd.DataFrame({
+            "ID": [f"LT{i}{n:05d}" for n in range(count)],
+            "Nationality": rng.choice(countries, count),
+            "1st Discipline": rng.choice(programs, count),
+            "2nd Discipline": rng.choice(programs, count),
+            "3rd Discipline": rng.choice(programs, count),
+        })
+        path = os.path.join(directory, f"applicants_{i}.csv")
+        applicants.to_csv(path, index=False, encoding="utf-8-sig")
+        paths.append(path)
+    return paths
+
+
+# ── Simulated sessions
+
+def _sidebar_select(at, label: str, rng: random.Random) -> None:
+    box = next(box for box in at.sidebar.selectbox if box.label == label)
+    box.set_value(rng.choice(box.options))
+
+
+def session_actions(applicants: list) -> dict:
+    """Named interactions an admissions user performs; each is followed by one rerun."""
+    def filter_country(at, rng):
+        _sidebar_select(at, "اختر الدولة", rng)
+
+    def filter_college(at, rng):
+        _sidebar_select(at, "اختر الكلية", rng)
+
+    def filter_status(at, rng):
+        _sidebar_select(at, "اختر الحالة", rng)
+
+    def clear_filters(at, rng):
+        for box in at.sidebar.selectbox:
+            box.set_value(box.options[0])
+
+    def gpa_range(at, rng):
+        slider = at.sidebar.slider[0]
+        low = round(rng.uniform(slider.min, slider.max - 1), 1)
+        slider.set_range(low, slider.max)
+
+    def search(at, rng):
+        box = next(box for box in at.text_input if box.label.startswith("🔍"))
+        box.set_value(rng.choice(["محمد", "عبد", "مصر", "الشريعة", ""]))
+
+    def upload_applicants(at, rng):
+        at.session_state[LOADTEST_UPLOAD_KEY] = rng.choice(applicants)
+
+    def adjust_seats(at, rng):
+        at.number_input(key="local_students_input").set_value(rng.randrange(500, 4_000, 50))
+
+    return {
+        "filter_country": (filter_country, 3),
+        "filter_college": (filter_college, 2),
+        "filter_status": (filter_status, 1),
+        "clear_filters": (clear_filters, 1),
+        "gpa_range": (gpa_range, 1),
+        "search": (search, 2),
+        "upload_applicants": (upload_applicants, 1),
+        "adjust_seats": (adjust_seats, 2),
+    }
+
+
+def share_test_runtime() -> None:
+    """Let AppTest sessions run concurrently in this process.
+
+    AppTest installs a mock Runtime singleton around each run and clears it
+    afterwards, so overlapping runs would remove it from under each other;
+    one mock runtime is pinned for the whole process instead.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+
+
+def run_session(script: str, actions: dict, steps: int, seed: int, samples: list, errors: list) -> None:
+    """One user: open the app, then ``steps`` weighted-random interactions; appends (action, seconds)."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    names = list(actions)
+    weights = [actions[name][1] for name in names]
+    start = time.perf_counter()
+    at = AppTest.from_file(script, default_timeout=600).run()
+    samples.append(("open", time.perf_counter() - start))
+    for _ in range(steps):
+        name = rng.choices(names, weights)[0]
+        try:
+            actions[name][0](at, rng)
+            start = time.perf_counter()
+            at.run()
+            samples.append((name, time.perf_counter() - start))
+            if at.exception:
+                errors.append(f"{name}: {at.exception[0].value}")
+        except Exception as e:
+            errors.append(f"{name}: {e!r}")
+
+
+def rss_mb() -> float:
+    """Resident set size of this process, after a full collection."""
+    gc.collect()
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    # Peak rather than current RSS where /proc is unavailable (kB on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure_level(script: str, applicants: list, sessions: int, steps: int) -> dict:
+    """Run in a fresh process: warm the caches with one session, then ``sessions`` concurrent ones."""
+    share_test_runtime()
+    actions = session_actions(applicants)
+    run_session(script, actions, 0, 0, [], [])
+    baseline = rss_mb()
+    samples: list = []
+    errors: list = []
+    threads = [
+        threading.Thread(target=run_session, args=(script, actions, steps, seed, samples, errors))
+        for seed in range(1, sessions + 1)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    reruns = [seconds for action, seconds in samples if action != "open"]
+    quantiles = np.quantile(reruns, [0.5, 0.95, 0.99]) if reruns else [float("nan")] * 3
+    growth = rss_mb() - baseline
+    return {
+        "sessions": sessions,
+        "reruns": len(reruns),
+        "p50": float(quantiles[0]),
+        "p95": float(quantiles[1]),
+        "p99": float(quantiles[2]),
+        "throughput": len(samples) / wall,
+        "rss_baseline_mb": baseline,
+        "rss_growth_mb": growth,
+        "rss_per_session_mb": growth / sessions,
+        "by_action": {
+            action: statistics.median(s for a, s in samples if a == action)
+            for action in sorted({a for a, _ in samples})
+        },
+        "errors": errors[:5],
+    }
+
+
+# ── Driver
+
+def run_load_test(rows_levels: list, session_levels: list, steps: int) -> None:
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as directory:
+        script = os.path.join(directory, "app_under_test.py")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(WRAPPER_SCRIPT.format(root=ROOT, key=LOADTEST_UPLOAD_KEY))
+        applicants = generate_applicants(directory)
+        for rows in rows_levels:
+            manifest = generate_dataset(rows, directory)
+            print(f"\nDataset: {rows:,} generated students, {steps} interactions per session")
+            print(f"{'sessions':>8} {'reruns':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+                  f"{'reruns/s':>9} {'RSS MB':>8} {'+MB':>7} {'+MB/sess':>9}")
+            print("-" * 80)
+            for sessions in session_levels:
+                # Each level runs in its own process, so caches and RSS start from the same point
+                env = {
+                    **os.environ,
+                    "DASHBOARD_MANIFEST": manifest,
+                    "DASHBOARD_USAGE_LOG": os.path.join(directory, "usage.jsonl"),
+                }
+                result = subprocess.run(
+                    [sys.executable, __file__, "--level", str(sessions), "--steps", str(steps),
+                     "--script", script, "--applicants", ",".join(applicants)],
+                    capture_output=True, text=True, cwd=ROOT, env=env, check=True,
+                )
+                level = json.loads(result.stdout.strip().splitlines()[-1])
+                print(f"{level['sessions']:>8} {level['reruns']:>7} {level['p50']:>7.2f} {level['p95']:>7.2f} "
+                      f"{level['p99']:>7.2f} {level['throughput']:>9.2f} {level['rss_baseline_mb']:>8.0f} "
+                      f"{level['rss_growth_mb']:>7.0f} {level['rss_per_session_mb']:>9.1f}")
+                for error in level["errors"]:
+                    print(f"{'':>8} ! {error}")
+            print("median rerun by interaction (last level): " + ", ".join(
+                f"{action} {seconds:.2f}s" for action, seconds in level["by_action"].items()))
+
+
+def _arg(name: str, default: str) -> str:
+    return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+
+if __name__ == "__main__":
+    if "--level" in sys.argv:
+        print(json.dumps(measure_level(
+            _arg("--script", ""), _arg("--applicants", "").split(","),
+            int(_arg("--level", "1")), int(_arg("--steps", str(STEPS_PER_SESSION))),
+        )))
+    else:
+        run_load_test(
+            [int(v) for v in _arg("--rows", ",".join(map(str, DEFAULT_ROWS))).split(",")],
+            [int(v) for v in _arg("--sessions", ",".join(map(str, DEFAULT_SESSIONS))).split(",")],
+            int(_arg("--steps", str(STEPS_PER_SESSION))),
+        )
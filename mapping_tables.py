@@ -0,0 +1,504 @@
+# Generated by build_mapping_tables.py from utils.NATIONALITY_MAPPING. Do not edit;
+# re-run `python build_mapping_tables.py` after changing the nationality mapping.
+from types import MappingProxyType
+
+SOURCE_DIGEST = '517f6c709e253cc850ae7e140d43993d32eb74fd'
+
+ARABIC_TO_ENGLISH = MappingProxyType({'الأردن': 'Jordan',
+ 'ألمانيا': 'Germany',
+ 'الولايات المتحدة الأمريكية': 'United States',
+ 'أوزبكستان': 'Uzbekistan',
+ 'أوغندا': 'Uganda',
+ 'أوكرانيا': 'Ukraine',
+ 'الإمارات العربية المتحدة': 'United Arab Emirates',
+ 'إثيوبيا': 'Ethiopia',
+ 'أذربيجان': 'Azerbaijan',
+ 'الأرجنتين': 'Argentina',
+ 'إريتريا': 'Eritrea',
+ 'أستراليا': 'Australia',
+ 'أفغانستان': 'Afghanistan',
+ 'الاتحاد الأوروبي': 'Europe',
+ 'ألبانيا': 'Albania',
+ 'الجبل الأسود': 'Montenegro',
+ 'الكونغو': 'Congo',
+ 'المملكة المتحدة': 'United Kingdom',
+ 'اليابان': 'Japan',
+ 'إندونيسيا': 'Indonesia',
+ 'إيران': 'Iran',
+ 'إيطاليا': 'Italy',
+ 'باكستان': 'Pakistan',
+ 'البحرين': 'Bahrain',
+ 'البرتغال': 'Portugal',
+ 'بلجيكا': 'Belgium',
+ 'بلغاريا': 'Bulgaria',
+ 'بنغلاديش': 'Bangladesh',
+ 'بنين': 'Benin',
+ 'بوركينا فاسو': 'Burkina Faso',
+ 'بوروندي': 'Burundi',
+ 'البوسنة والهرسك': 'Bosnia and Herzegovina',
+ 'بولندا': 'Poland',
+ 'بيلاروسيا': 'Belarus',
+ 'تايلاند': 'Thailand',
+ 'تركستان': 'Turkestan',
+ 'تركمانستان': 'Turkmenistan',
+ 'تركيا': 'Turkey',
+ 'ترينيداد وتوباغو': 'Trinidad and Tobago',
+ 'تشاد': 'Chad',
+ 'تنزانيا': 'Tanzania',
+ 'توغو': 'Togo',
+ 'تونس': 'Tunisia',
+ 'جمهورية أفريقيا الوسطى': 'Central African Republic',
+ 'جامايكا': 'Jamaica',
+ 'الجزائر': 'Algeria',
+ 'جزر القمر': 'Comoros',
+ 'جزر فيرجن البريطانية': 'British Virgin Islands',
+ 'جنوب أفريقيا': 'South Africa',
+ 'جورجيا': 'Georgia',
+ 'جيبوتي': 'Djibouti',
+ 'الدنمارك': 'Denmark',
+ 'جمهورية الدومينيكان': 'Dominican Republic',
+ 'رواندا': 'Rwanda',
+ 'روسيا': 'Russia',
+ 'زيمبابوي': 'Zimbabwe',
+ 'سانت كيتس ونيفيس': 'Saint Kitts and Nevis',
+ 'سريلانكا': 'Sri Lanka',
+ 'السعودية': 'Saudi Arabia',
+ 'سنغافورة': 'Singapore',
+ 'السنغال': 'Senegal',
+ 'السودان': 'Sudan',
+ 'سوريا': 'Syria',
+ 'السويد': 'Sweden',
+ 'سويسرا': 'Switzerland',
+ 'سيراليون': 'Sierra Leone',
+ 'صربيا': 'Serbia',
+ 'الصومال': 'Somalia',
+ 'الصين': 'China',
+ 'طاجيكستان': 'Tajikistan',
+ 'ساحل العاج': "Cote d'Ivoire",
+ 'العراق': 'Iraq',
+ 'عُمان': 'Oman',
+ 'الغابون': 'Gabon',
+ 'غامبيا': 'Gambia',
+ 'غانا': 'Ghana',
+ 'غينيا': 'Guinea',
+ 'غينيا بيساو': 'Guinea-Bissau',
+ 'غينيا الاستوائية': 'Equatorial Guinea',
+ 'فرنسا': 'France',
+ 'الفلبين': 'Philippines',
+ 'فلسطين': 'Palestine',
+ 'فنلندا': 'Finland',
+ 'قطر': 'Qatar',
+ 'قيرغيزستان': 'Kyrgyzstan',
+ 'كازاخستان': 'Kazakhstan',
+ 'الكاميرون': 'Cameroon',
+ 'كمبوديا': 'Cambodia',
+ 'كندا': 'Canada',
+ 'كوريا': 'South Korea',
+ 'كوسوفو': 'Kosovo',
+ 'جمهورية الكونغو الديمقراطية': 'Democratic Republic of the Congo',
+ 'الكويت': 'Kuwait',
+ 'كينيا': 'Kenya',
+ 'لبنان': 'Lebanon',
+ 'ليبيا': 'Libya',
+ 'ليبيريا': 'Liberia',
+ 'المالديف': 'Maldives',
+ 'مالطا': 'Malta',
+ 'مالي': 'Mali',
+ 'ماليزيا': 'Malaysia',
+ 'المجر': 'Hungary',
+ 'مدغشقر': 'Madagascar',
+ 'مصر': 'Egypt',
+ 'المغرب': 'Morocco',
+ 'مقدونيا الشمالية': 'North Macedonia',
+ 'منغوليا': 'Mongolia',
+ 'موريتانيا': 'Mauritania',
+ 'موزمبيق': 'Mozambique',
+ 'ميانمار': 'Myanmar',
+ 'النرويج': 'Norway',
+ 'النمسا': 'Austria',
+ 'نيبال': 'Nepal',
+ 'النيجر': 'Niger',
+ 'نيجيريا': 'Nigeria',
+ 'نيوزيلندا': 'New Zealand',
+ 'الهند': 'India',
+ 'هولندا': 'Netherlands',
+ 'اليمن': 'Yemen',
+ 'يوغوسلافيا': 'Yugoslavia'})
+
+ENGLISH_TO_ARABIC = MappingProxyType({'Jordan': 'الأردن',
+ 'Germany': 'ألمانيا',
+ 'United States': 'الولايات المتحدة الأمريكية',
+ 'Uzbekistan': 'أوزبكستان',
+ 'Uganda': 'أوغندا',
+ 'Ukraine': 'أوكرانيا',
+ 'United Arab Emirates': 'الإمارات العربية المتحدة',
+ 'Ethiopia': 'إثيوبيا',
+ 'Azerbaijan': 'أذربيجان',
+ 'Argentina': 'الأرجنتين',
+ 'Eritrea': 'إريتريا',
+ 'Australia': 'أستراليا',
+ 'Afghanistan': 'أفغانستان',
+ 'Europe': 'الاتحاد الأوروبي',
+ 'Albania': 'ألبانيا',
+ 'Montenegro': 'الجبل الأسود',
+ 'Congo': 'الكونغو',
+ 'United Kingdom': 'المملكة المتحدة',
+ 'Japan': 'اليابان',
+ 'Indonesia': 'إندونيسيا',
+ 'Iran': 'إيران',
+ 'Italy': 'إيطاليا',
+ 'Pakistan': 'باكستان',
+ 'Bahrain': 'البحرين',
+ 'Portugal': 'البرتغال',
+ 'Belgium': 'بلجيكا',
+ 'Bulgaria': 'بلغاريا',
+ 'Bangladesh': 'بنغلاديش',
+ 'Benin': 'بنين',
+ 'Burkina Faso': 'بوركينا فاسو',
+ 'Burundi': 'بوروندي',
+ 'Bosnia and Herzegovina': 'البوسنة والهرسك',
+ 'Poland': 'بولندا',
+ 'Belarus': 'بيلاروسيا',
+ 'Thailand': 'تايلاند',
+ 'Turkestan': 'تركستان',
+ 'Turkmenistan': 'تركمانستان',
+ 'Turkey': 'تركيا',
+ 'Trinidad and Tobago': 'ترينيداد وتوباغو',
+ 'Chad': 'تشاد',
+ 'Tanzania': 'تنزانيا',
+ 'Togo': 'توغو',
+ 'Tunisia': 'تونس',
+ 'Central African Republic': 'جمهورية أفريقيا الوسطى',
+ 'Jamaica': 'جامايكا',
+ 'Algeria': 'الجزائر',
+ 'Comoros': 'جزر القمر',
+ 'British Virgin Islands': 'جزر فيرجن البريطانية',
+ 'South Africa': 'جنوب أفريقيا',
+ 'Georgia': 'جورجيا',
+ 'Djibouti': 'جيبوتي',
+ 'Denmark': 'الدنمارك',
+ 'Dominican Republic': 'جمهورية الدومينيكان',
+ 'Rwanda': 'رواندا',
+ 'Russia': 'روسيا',
+ 'Zimbabwe': 'زيمبابوي',
+ 'Saint Kitts and Nevis': 'سانت كيتس ونيفيس',
+ 'Sri Lanka': 'سريلانكا',
+ 'Saudi Arabia': 'السعودية',
+ 'Singapore': 'سنغافورة',
+ 'Senegal': 'السنغال',
+ 'Sudan': 'السودان',
+ 'Syria': 'سوريا',
+ 'Sweden': 'السويد',
+ 'Switzerland': 'سويسرا',
+ 'Sierra Leone': 'سيراليون',
+ 'Serbia': 'صربيا',
+ 'Somalia': 'الصومال',
+ 'China': 'الصين',
+ 'Tajikistan': 'طاجيكستان',
+ "Cote d'Ivoire": 'ساحل العاج',
+ 'Iraq': 'العراق',
+ 'Oman': 'عُمان',
+ 'Gabon': 'الغابون',
+ 'Gambia': 'غامبيا',
+ 'Ghana': 'غانا',
+ 'Guinea': 'غينيا',
+ 'Guinea-Bissau': 'غينيا بيساو',
+ 'Equatorial Guinea': 'غينيا الاستوائية',
+ 'France': 'فرنسا',
+ 'Philippines': 'الفلبين',
+ 'Palestine': 'فلسطين',
+ 'Finland': 'فنلندا',
+ 'Qatar': 'قطر',
+ 'Kyrgyzstan': 'قيرغيزستان',
+ 'Kazakhstan': 'كازاخستان',
+ 'Cameroon': 'الكاميرون',
+ 'Cambodia': 'كمبوديا',
+ 'Canada': 'كندا',
+ 'South Korea': 'كوريا',
+ 'Kosovo': 'كوسوفو',
+ 'Democratic Republic of the Congo': 'جمهورية الكونغو الديمقراطية',
+ 'Kuwait': 'الكويت',
+ 'Kenya': 'كينيا',
+ 'Lebanon': 'لبنان',
+ 'Libya': 'ليبيا',
+ 'Liberia': 'ليبيريا',
+ 'Maldives': 'المالديف',
+ 'Malta': 'مالطا',
+ 'Mali': 'مالي',
+ 'Malaysia': 'ماليزيا',
+ 'Hungary': 'المجر',
+ 'Madagascar': 'مدغشقر',
+ 'Egypt': 'مصر',
+ 'Morocco': 'المغرب',
+ 'North Macedonia': 'مقدونيا الشمالية',
+ 'Mongolia': 'منغوليا',
+ 'Mauritania': 'موريتانيا',
+ 'Mozambique': 'موزمبيق',
+ 'Myanmar': 'ميانمار',
+ 'Norway': 'النرويج',
+ 'Austria': 'النمسا',
+ 'Nepal': 'نيبال',
+ 'Niger': 'النيجر',
+ 'Nigeria': 'نيجيريا',
+ 'New Zealand': 'نيوزيلندا',
+ 'India': 'الهند',
+ 'Netherlands': 'هولندا',
+ 'Yemen': 'اليمن',
+ 'Yugoslavia': 'يوغوسلافيا'})
+
+COUNTRY_TO_CONTINENT = MappingProxyType({'غير محدد': 'غير محدد',
+ 'الأردن': 'آسيا',
+ 'ألمانيا': 'أوروبا',
+ 'الولايات المتحدة الأمريكية': 'أمريكا الشمالية',
+ 'أوزبكستان': 'آسيا',
+ 'أوغندا': 'أفريقيا',
+ 'أوكرانيا': 'أوروبا',
+ 'الإمارات العربية المتحدة': 'آسيا',
+ 'إثيوبيا': 'أفريقيا',
+ 'أذربيجان': 'آسيا',
+ 'الأرجنتين': 'أمريكا الجنوبية',
+ 'إريتريا': 'أفريقيا',
+ 'أستراليا': 'أستراليا',
+ 'أفغانستان': 'آسيا',
+ 'الاتحاد الأوروبي': 'أوروبا',
+ 'ألبانيا': 'أوروبا',
+ 'الجبل الأسود': 'أوروبا',
+ 'الكونغو': 'أفريقيا',
+ 'المملكة المتحدة': 'أوروبا',
+ 'اليابان': 'آسيا',
+ 'إندونيسيا': 'آسيا',
+ 'إيران': 'آسيا',
+ 'إيطاليا': 'أوروبا',
+ 'باكستان': 'آسيا',
+ 'البحرين': 'آسيا',
+ 'البرتغال': 'أوروبا',
+ 'بلجيكا': 'أوروبا',
+ 'بلغاريا': 'أوروبا',
+ 'بنغلاديش': 'آسيا',
+ 'بنين': 'أفريقيا',
+ 'بوركينا فاسو': 'أفريقيا',
+ 'بوروندي': 'أفريقيا',
+ 'البوسنة والهرسك': 'أوروبا',
+ 'بولندا': 'أوروبا',
+ 'بيلاروسيا': 'أوروبا',
+ 'تايلاند': 'آسيا',
+ 'تركستان': 'آسيا',
+ 'تركمانستان': 'آسيا',
+ 'تركيا': 'آسيا',
+ 'ترينيداد وتوباغو': 'أمريكا الشمالية',
+ 'تشاد': 'أفريقيا',
+ 'تنزانيا': 'أفريقيا',
+ 'توغو': 'أفريقيا',
+ 'تونس': 'أفريقيا',
+ 'جمهورية أفريقيا الوسطى': 'أفريقيا',
+ 'جامايكا': 'أمريكا الشمالية',
+ 'الجزائر': 'أفريقيا',
+ 'جزر القمر': 'أفريقيا',
+ 'جزر فيرجن البريطانية': 'أمريكا الشمالية',
+ 'جنوب أفريقيا': 'أفريقيا',
+ 'جورجيا': 'آسيا',
+ 'جيبوتي': 'أفريقيا',
+ 'الدنمارك': 'أوروبا',
+ 'جمهورية الدومينيكان': 'أمريكا الشمالية',
+ 'رواندا': 'أفريقيا',
+ 'روسيا': 'أوروبا',
+ 'زيمبابوي': 'أفريقيا',
+ 'سانت كيتس ونيفيس': 'أمريكا الشمالية',
+ 'سريلانكا': 'آسيا',
+ 'السعودية': 'آسيا',
+ 'سنغافورة': 'آسيا',
+ 'السنغال': 'أفريقيا',
+ 'السودان': 'أفريقيا',
+ 'سوريا': 'آسيا',
+ 'السويد': 'أوروبا',
+ 'سويسرا': 'أوروبا',
+ 'سيراليون': 'أفريقيا',
+ 'صربيا': 'أوروبا',
+ 'الصومال': 'أفريقيا',
+ 'الصين': 'آسيا',
+ 'طاجيكستان': 'آسيا',
+ 'ساحل العاج': 'أفريقيا',
+ 'العراق': 'آسيا',
+ 'عُمان': 'آسيا',
+ 'الغابون': 'أفريقيا',
+ 'غامبيا': 'أفريقيا',
+ 'غانا': 'أفريقيا',
+ 'غينيا': 'أفريقيا',
+ 'غينيا بيساو': 'أفريقيا',
+ 'غينيا الاستوائية': 'أفريقيا',
+ 'فرنسا': 'أوروبا',
+ 'الفلبين': 'آسيا',
+ 'فلسطين': 'آسيا',
+ 'فنلندا': 'أوروبا',
+ 'قطر': 'آسيا',
+ 'قيرغيزستان': 'آسيا',
+ 'كازاخستان': 'آسيا',
+ 'الكاميرون': 'أفريقيا',
+ 'كمبوديا': 'آسيا',
+ 'كندا': 'أمريكا الشمالية',
+ 'كوريا': 'آسيا',
+ 'كوسوفو': 'أوروبا',
+ 'جمهورية الكونغو الديمقراطية': 'أفريقيا',
+ 'الكويت': 'آسيا',
+ 'كينيا': 'أفريقيا',
+ 'لبنان': 'آسيا',
+ 'ليبيا': 'أفريقيا',
+ 'ليبيريا': 'أفريقيا',
+ 'المالديف': 'آسيا',
+ 'مالطا': 'أوروبا',
+ 'مالي': 'أفريقيا',
+ 'ماليزيا': 'آسيا',
+ 'المجر': 'أوروبا',
+ 'مدغشقر': 'أفريقيا',
+ 'مصر': 'أفريقيا',
+ 'المغرب': 'أفريقيا',
+ 'مقدونيا الشمالية': 'أوروبا',
+ 'منغوليا': 'آسيا',
+ 'موريتانيا': 'أفريقيا',
+ 'موزمبيق': 'أفريقيا',
+ 'ميانمار': 'آسيا',
+ 'النرويج': 'أوروبا',
+ 'النمسا': 'أوروبا',
+ 'نيبال': 'آسيا',
+ 'النيجر': 'أفريقيا',
+ 'نيجيريا': 'أفريقيا',
+ 'نيوزيلندا': 'أستراليا',
+ 'الهند': 'آسيا',
+ 'هولندا': 'أوروبا',
+ 'اليمن': 'آسيا',
+ 'يوغوسلافيا': 'أوروبا'})
+
+NATIONALITY_INDEX = MappingProxyType({'أردني': ('الأردن', 'آسيا'),
+ 'ألماني': ('ألمانيا', 'أوروبا'),
+ 'أمريكي': ('الولايات المتحدة الأمريكية', 'أمريكا الشمالية'),
+ 'أوزبكستاني': ('أوزبكستان', 'آسيا'),
+ 'أوغندي': ('أوغندا', 'أفريقيا'),
+ 'أوكراني': ('أوكرانيا', 'أوروبا'),
+ 'إماراتي': ('الإمارات العربية المتحدة', 'آسيا'),
+ 'اثيوبي': ('إثيوبيا', 'أفريقيا'),
+ 'اذربيجاني': ('أذربيجان', 'آسيا'),
+ 'ارجنتيني': ('الأرجنتين', 'أمريكا الجنوبية'),
+ 'اريتيري': ('إريتريا', 'أفريقيا'),
+ 'استرالي': ('أستراليا', 'أستراليا'),
+ 'افغانستاني': ('أفغانستان', 'آسيا'),
+ 'الاتحاد الأوروبي': ('الاتحاد الأوروبي', 'أوروبا'),
+ 'الباني': ('ألبانيا', 'أوروبا'),
+ 'الجبل الاسود': ('الجبل الأسود', 'أوروبا'),
+ 'الجنسية تحت الإجراء': ('غير محدد', 'غير محدد'),
+ 'القبائل النازح': ('غير محدد', 'غير محدد'),
+ 'القبائل النازحة': ('غير محدد', 'غير محدد'),
+ 'الكنغو': ('الكونغو', 'أفريقيا'),
+ 'المملكة المتحدة والجزر الشمالي': ('المملكة المتحدة', 'أوروبا'),
+ 'اليابان': ('اليابان', 'آسيا'),
+ 'اندونيسي': ('إندونيسيا', 'آسيا'),
+ 'ايراني': ('إيران', 'آسيا'),
+ 'ايطالي': ('إيطاليا', 'أوروبا'),
+ 'باكستاني': ('باكستان', 'آسيا'),
+ 'بحريني': ('البحرين', 'آسيا'),
+ 'بدون': ('غير محدد', 'غير محدد'),
+ 'برتغالي': ('البرتغال', 'أوروبا'),
+ 'بريطاني': ('المملكة المتحدة', 'أوروبا'),
+ 'بلجيكي': ('بلجيكا', 'أوروبا'),
+ 'بلغاري': ('بلغاريا', 'أوروبا'),
+ 'بنغلاديشي': ('بنغلاديش', 'آسيا'),
+ 'بنيني': ('بنين', 'أفريقيا'),
+ 'بوركيني': ('بوركينا فاسو', 'أفريقيا'),
+ 'بوروندي': ('بوروندي', 'أفريقيا'),
+ 'بوسني': ('البوسنة والهرسك', 'أوروبا'),
+ 'بولندي': ('بولندا', 'أوروبا'),
+ 'بيلاروسي': ('بيلاروسيا', 'أوروبا'),
+ 'تايلندي': ('تايلاند', 'آسيا'),
+ 'تركستاني': ('تركستان', 'آسيا'),
+ 'تركمنستاني': ('تركمانستان', 'آسيا'),
+ 'تركي': ('تركيا', 'آسيا'),
+ 'ترينيداد وتوباغو': ('ترينيداد وتوباغو', 'أمريكا الشمالية'),
+ 'تشادي': ('تشاد', 'أفريقيا'),
+ 'تنزاني': ('تنزانيا', 'أفريقيا'),
+ 'توغوي': ('توغو', 'أفريقيا'),
+ 'تونسي': ('تونس', 'أفريقيا'),
+ 'ج أفريقيا الوسطى': ('جمهورية أفريقيا الوسطى', 'أفريقيا'),
+ 'جامايكي': ('جامايكا', 'أمريكا الشمالية'),
+ 'جزائري': ('الجزائر', 'أفريقيا'),
+ 'جزر القمر': ('جزر القمر', 'أفريقيا'),
+ 'جزر فيرجين البريطانية': ('جزر فيرجن البريطانية', 'أمريكا الشمالية'),
+ 'جنوب افريقي': ('جنوب أفريقيا', 'أفريقيا'),
+ 'جورجي': ('جورجيا', 'آسيا'),
+ 'جيبوتي': ('جيبوتي', 'أفريقيا'),
+ 'دانمركي': ('الدنمارك', 'أوروبا'),
+ 'دومينيكي': ('جمهورية الدومينيكان', 'أمريكا الشمالية'),
+ 'رواندي': ('رواندا', 'أفريقيا'),
+ 'روسي': ('روسيا', 'أوروبا'),
+ 'زمبابوي': ('زيمبابوي', 'أفريقيا'),
+ 'سانت كيتس ونيفس': ('سانت كيتس ونيفيس', 'أمريكا الشمالية'),
+ 'سري لانكي': ('سريلانكا', 'آسيا'),
+ 'سعودي من جهة الأم': ('السعودية', 'آسيا'),
+ 'سنغافوري': ('سنغافورة', 'آسيا'),
+ 'سنغالي': ('السنغال', 'أفريقيا'),
+ 'سوداني': ('السودان', 'أفريقيا'),
+ 'سوري': ('سوريا', 'آسيا'),
+ 'سويدي': ('السويد', 'أوروبا'),
+ 'سويسري': ('سويسرا', 'أوروبا'),
+ 'سيراليوني': ('سيراليون', 'أفريقيا'),
+ 'صربيا': ('صربيا', 'أوروبا'),
+ 'صومالي': ('الصومال', 'أفريقيا'),
+ 'صيني': ('الصين', 'آسيا'),
+ 'طاجكستان': ('طاجيكستان', 'آسيا'),
+ 'عاجي': ('ساحل العاج', 'أفريقيا'),
+ 'عراقي': ('العراق', 'آسيا'),
+ 'عماني': ('عُمان', 'آسيا'),
+ 'غابوني': ('الغابون', 'أفريقيا'),
+ 'غامبي': ('غامبيا', 'أفريقيا'),
+ 'غاني': ('غانا', 'أفريقيا'),
+ 'غير سعودي': ('غير محدد', 'غير محدد'),
+ 'غيني': ('غينيا', 'أفريقيا'),
+ 'غينيا - بيساو': ('غينيا بيساو', 'أفريقيا'),
+ 'غينيا الاستوائية': ('غينيا الاستوائية', 'أفريقيا'),
+ 'فرنسي': ('فرنسا', 'أوروبا'),
+ 'فلبيني': ('الفلبين', 'آسيا'),
+ 'فلسطيني': ('فلسطين', 'آسيا'),
+ 'فلسطينية بوثيقة مصري': ('فلسطين', 'آسيا'),
+ 'فنلندي': ('فنلندا', 'أوروبا'),
+ 'قبائل نازحة / الحليفه': ('غير محدد', 'غير محدد'),
+ 'قبائل نازحة / الكويت': ('غير محدد', 'غير محدد'),
+ 'قطري': ('قطر', 'آسيا'),
+ 'قيرغيزستان': ('قيرغيزستان', 'آسيا'),
+ 'كازاخستاني': ('كازاخستان', 'آسيا'),
+ 'كاميروني': ('الكاميرون', 'أفريقيا'),
+ 'كمبودي': ('كمبوديا', 'آسيا'),
+ 'كندي': ('كندا', 'أمريكا الشمالية'),
+ 'كوري': ('كوريا', 'آسيا'),
+ 'كوسوفا': ('كوسوفو', 'أوروبا'),
+ 'كونغوليا': ('جمهورية الكونغو الديمقراطية', 'أفريقيا'),
+ 'كويتي': ('الكويت', 'آسيا'),
+ 'كيني': ('كينيا', 'أفريقيا'),
+ 'لبناني': ('لبنان', 'آسيا'),
+ 'ليبي': ('ليبيا', 'أفريقيا'),
+ 'ليبيري': ('ليبيريا', 'أفريقيا'),
+ 'مالديفي': ('المالديف', 'آسيا'),
+ 'مالطي': ('مالطا', 'أوروبا'),
+ 'مالي': ('مالي', 'أفريقيا'),
+ 'ماليزي': ('ماليزيا', 'آسيا'),
+ 'مجري': ('المجر', 'أوروبا'),
+ 'مدغشقري': ('مدغشقر', 'أفريقيا'),
+ 'مصري': ('مصر', 'أفريقيا'),
+ 'مغربي': ('المغرب', 'أفريقيا'),
+ 'مقدوني': ('مقدونيا الشمالية', 'أوروبا'),
+ 'مقيم': ('غير محدد', 'غير محدد'),
+ 'مقيم / نازح': ('غير محدد', 'غير محدد'),
+ 'مقيم بلوشي': ('غير محدد', 'غير محدد'),
+ 'منغولي': ('منغوليا', 'آسيا'),
+ 'موريتاني': ('موريتانيا', 'أفريقيا'),
+ 'موزامبيقي': ('موزمبيق', 'أفريقيا'),
+ 'ميانمار/جواز باكستاني': ('ميانمار', 'آسيا'),
+ 'ميانماري': ('ميانمار', 'آسيا'),
+ 'نازح': ('غير محدد', 'غير محدد'),
+ 'نرويجي': ('النرويج', 'أوروبا'),
+ 'نمساوي': ('النمسا', 'أوروبا'),
+ 'نيبالي': ('نيبال', 'آسيا'),
+ 'نيجري': ('النيجر', 'أفريقيا'),
+ 'نيجيري': ('نيجيريا', 'أفريقيا'),
+ 'نيوزيلندي': ('نيوزيلندا', 'أستراليا'),
+ 'هندي': ('الهند', 'آسيا'),
+ 'هولندي': ('هولندا', 'أوروبا'),
+ 'يمني': ('اليمن', 'آسيا'),
+ 'يوغوسلافيا': ('يوغوسلافيا', 'أوروبا')})
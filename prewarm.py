@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+
+from cache_manager import CacheManager, get_cache_manager
+from approximate import APPROXIMATE_THRESHOLD, WEIGHT_COLUMN
+from charts import dashboard_figures
+from usage_log import top_combinations
+
+PREWARM_TOP_N = int(os.environ.get("DASHBOARD_PREWARM_TOP_N", 20))
+# Share of one core the prewarmer may use; it sleeps between figures to stay under it
+PREWARM_CPU_BUDGET = float(os.environ.get("DASHBOARD_PREWARM_CPU", 0.25))
+
+
+def figure_key(version: str, key: tuple, drill_path: dict, chart_mode: str) -> tuple:
+    """Cache key of a figure set: dataset version, filter combination, drill path and chart mode."""
+    return version, key, tuple(drill_path.items()), chart_mode
+
+
+class FigureCache:
+    """Built figure sets in the "figures" namespace of the process cache manager.
+
+    Shared by the sessions of a process and the prewarmer; each set is
+    stored with the seconds its figures took to build, so the manager keeps
+    expensive sets longer.
+    """
+
+    namespace = "figures"
+
+    def __init__(self, manager: CacheManager | None = None):
+        self.manager = manager or get_cache_manager()
+
+    def get(self, key: tuple) -> dict | None:
+        return self.manager.get(self.namespace, key)
+
+    def put(self, key: tuple, figures: dict, build_seconds: float) -> None:
+        self.manager.put(self.namespace, key, figures, build_seconds)
+
+    def __contains__(self, key: tuple) -> bool:
+        return (self.namespace, key) in self.manager
+
+
+class Prewarmer:
+    """Builds the figure sets of the most used combinations when a dataset version goes live.
+
+    ``start`` is cheap to call on every rerun: it only launches a daemon
+    thread when the version changes, and a newer version supersedes a run
+    still in progress. The thread builds one figure at a time and then
+    sleeps in proportion to the CPU time it used, keeping its average load
+    under ``cpu_budget`` of a core so live sessions are not starved.
+    """
+
+    def __init__(self, cache: FigureCache, top_n: int = PREWARM_TOP_N, cpu_budget: float = PREWARM_CPU_BUDGET):
+        self.cache = cache
+        self.top_n = top_n
+        self.cpu_budget = min(max(cpu_budget, 0.01), 1.0)
+        self._lock = threading.Lock()
+        self._status = {"version": None, "state": "idle", "total": 0, "done": 0, "skipped": 0,
+                        "cpu_seconds": 0.0, "elapsed": 0.0}
+
+    def status(self) -> dict:
+        with self._lock:
+            return dict(self._status)
+
+    def start(self, filter_index, sample_factory, forecast_factory=None) -> None:
+        """Prewarm ``filter_index``'s version unless it is already being or has been warmed.
+
+        ``sample_factory`` and ``forecast_factory`` return the version's
+        stratified sample and enrollment forecast when first needed.
+        """
+        with self._lock:
+            if self._status["version"] == filter_index.version:
+                return
+            self._status = {"version": filter_index.version, "state": "running", "total": 0, "done": 0,
+                            "skipped": 0, "cpu_seconds": 0.0, "elapsed": 0.0}
+        threading.Thread(target=self._run, args=(filter_index, sample_factory, forecast_factory),
+                         name="prewarm", daemon=True).start()
+
+    def _update(self, version: str, **changes) -> bool:
+        """Apply ``changes`` if ``version`` is still the one being warmed; False once superseded."""
+        with self._lock:
+            if self._status["version"] != version:
+                return False
+            self._status.update(changes)
+            return True
+
+    def _run(self, filter_index, sample_factory, forecast_factory) -> None:
+        try:
+            self._warm(filter_index, sample_factory, forecast_factory)
+        except Exception as e:
+            # A failed warm-up only costs the cold start it was meant to save
+            self._update(filter_index.version, state=f"failed: {e}")
+
+    def _warm(self, filter_index, sample_factory, forecast_factory) -> None:
+        version = filter_index.version
+        started = time.perf_counter()
+        combinations = top_combinations(self.top_n)
+        self._update(version, total=len(combinations))
+        forecast = forecast_factory() if forecast_factory is not None else None
+        sample = None
+        cpu_used = 0.0
+        skipped = 0
+        for done, key in enumerate(combinations, start=1):
+            filters, gpa_range = key
+            filtered_df = filter_index.filter(dict(filters), gpa_range)
+            # The live default: the weighted sample above the approximate threshold
+            chart_df, chart_weight, chart_mode = filtered_df, None, "exact"
+            if len(filtered_df) > APPROXIMATE_THRESHOLD:
+                if sample is None:
+                    sample = sample_factory()
+                chart_df, chart_weight, chart_mode = sample.rows(filtered_df), WEIGHT_COLUMN, "sample"
+            cache_key = figure_key(version, key, {}, chart_mode)
+            if cache_key in self.cache:
+                skipped += 1
+                if not self._update(version, done=done, skipped=skipped):
+                    return
+                continue
+            figures = {}
+            build_seconds = 0.0
+            for name, builder, args in dashboard_figures(filtered_df, chart_df, chart_weight, forecast):
+                cpu_start, build_start = time.thread_time(), time.perf_counter()
+                figures[name] = builder(*args)
+                build_seconds += time.perf_counter() - build_start
+                cpu = time.thread_time() - cpu_start
+                cpu_used += cpu
+                time.sleep(cpu * (1 - self.cpu_budget) / self.cpu_budget)
+            self.cache.put(cache_key, figures, build_seconds)
+            if not self._update(version, done=done, cpu_seconds=cpu_used,
+                                elapsed=time.perf_counter() - started):
+                return
+        self._update(version, state="done", elapsed=time.perf_counter() - started)
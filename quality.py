@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+from utils import map_country, COUNTRY_TO_CONTINENT
+
+# Valid cumulative GPA range on the registrar's 5-point scale
+GPA_RANGE = (0.0, 5.0)
+# Number of example rows kept per issue
+SAMPLE_ROWS = 5
+# Semester order inside a Hijri year; the supplementary term comes last
+SEMESTER_ORDER = {"التكميلي": 4, "الثالث": 3, "الثاني": 2, "الأول": 1}
+
+QUALITY_ISSUES = [
+    "gpa_not_numeric",
+    "gpa_out_of_range",
+    "hours_not_numeric",
+    "negative_hours",
+    "duplicate_id",
+    "unmapped_nationality",
+    "unparseable_term_admit",
+    "unparseable_last_term",
+    "last_term_before_admit",
+]
+
+# Raw columns shown in the sample rows of each issue
+ISSUE_COLUMNS = {
+    "gpa_not_numeric": ["STD_GPA"],
+    "gpa_out_of_range": ["STD_GPA"],
+    "hours_not_numeric": ["STD_HRS"],
+    "negative_hours": ["STD_HRS"],
+    "duplicate_id": ["COLL_DESC", "MAJR_DESC"],
+    "unmapped_nationality": ["CITZ_DESC"],
+    "unparseable_term_admit": ["TERM_ADMIT"],
+    "unparseable_last_term": ["LAST_TERM"],
+    "last_term_before_admit": ["TERM_ADMIT", "LAST_TERM"],
+}
+
+# Registrar columns identifying the student in every sample row, after its source and row
+SAMPLE_ID_COLUMNS = ["STD_ID", "STD_NAME"]
+# Dataset columns the cross-source duplicate samples are read from, by registrar column
+DATASET_COLUMNS = {"STD_ID": "student_id", "STD_NAME": "name", "COLL_DESC": "college", "MAJR_DESC": "program"}
+
+# Registrar columns the checks and samples read
+CHECKED_COLUMNS = [*SAMPLE_ID_COLUMNS, *dict.fromkeys(c for columns in ISSUE_COLUMNS.values() for c in columns)]
+
+
+def sample_columns(issue: str) -> list[str]:
+    """Columns of the sample rows of ``issue``, the same for per-source and merged reports."""
+    return ["source", "row", *SAMPLE_ID_COLUMNS, *ISSUE_COLUMNS[issue]]
+
+
+def _sample_records(sample: pd.DataFrame) -> list[dict]:
+    return sample.astype(object).where(sample.notna(), None).to_dict("records")
+
+
+def new_quality_report() -> dict:
+    return {
+        "rows": 0,
+        "counts": {issue: 0 for issue in QUALITY_ISSUES},
+        "samples": {issue: [] for issue in QUALITY_ISSUES},
+    }
+
+
+def record_issue(report: dict, issue: str, mask, frame: pd.DataFrame, columns: list[str], **leading) -> None:
+    """Count the rows of ``frame`` flagged by ``mask`` and keep the first ``SAMPLE_ROWS`` as samples.
+
+    Shared by the registrar checks here and the applicant upload checks.
+    Each sample holds the ``leading`` values (e.g. ``source``), the row
+    number and ``columns``; ``frame`` is indexed by 0-based data row.
+    """
+    count = int(mask.sum())
+    if not count:
+        return
+    report["counts"][issue] += count
+    room = SAMPLE_ROWS - len(report["samples"][issue])
+    if room > 0:
+        sample = frame.loc[mask, columns].head(room)
+        # Report 1-based data row numbers as they appear after the header
+        sample.insert(0, "row", sample.index + 1)
+        for position, (name, value) in enumerate(leading.items()):
+            sample.insert(position, name, value)
+        report["samples"][issue].extend(_sample_records(sample))
+
+
+def term_order(terms: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """(Hijri year, semester rank) per term; NaN where missing. Parsed once per distinct term."""
+    codes, uniques = pd.factorize(terms)
+    text = pd.Series(uniques, dtype=object).astype(str)
+    years = pd.to_numeric(text.str.extract(r"(\d{3,4})", expand=False), errors="coerce").to_numpy()
+    semesters = np.full(len(uniques), np.nan)
+    # Ordered so that "التكميلي" is matched before the "الأول" it contains
+    for name, rank in SEMESTER_ORDER.items():
+        semesters[np.isnan(semesters) & text.str.contains(name, regex=False).to_numpy()] = rank
+    # Code -1 (missing) picks the trailing NaN
+    years = np.append(years, np.nan)[codes]
+    semesters = np.append(semesters, np.nan)[codes]
+    return years, semesters
+
+
+def mapped_nationality(values: pd.Series) -> np.ndarray:
+    """Whether each nationality maps to a known country; mapped once per distinct value."""
+    codes, uniques = pd.factorize(values)
+    known = np.array([map_country(value) in COUNTRY_TO_CONTINENT for value in uniques] + [False])
+    return known[codes]
+
+
+def check_source(raw: pd.DataFrame, source: str) -> dict:
+    """Vectorized quality checks of one raw registrar export.
+
+    Duplicate ids are only checked inside the source here; ``merge_reports``
+    repeats the check across sources.
+    """
+    report = new_quality_report()
+    report["rows"] = len(raw)
+    missing = [column for column in CHECKED_COLUMNS if column not in raw.columns]
+    if missing:
+        raw = raw.assign(**{column: np.nan for column in missing})
+
+    def record(issue: str, mask: np.ndarray) -> None:
+        record_issue(report, issue, mask, raw, [*SAMPLE_ID_COLUMNS, *ISSUE_COLUMNS[issue]], source=source)
+
+    gpa = pd.to_numeric(raw["STD_GPA"], errors="coerce").to_numpy(dtype=np.float64)
+    record("gpa_not_numeric", raw["STD_GPA"].notna().to_numpy() & np.isnan(gpa))
+    record("gpa_out_of_range", (gpa < GPA_RANGE[0]) | (gpa > GPA_RANGE[1]))
+    hours = pd.to_numeric(raw["STD_HRS"], errors="coerce").to_numpy(dtype=np.float64)
+    record("hours_not_numeric", raw["STD_HRS"].notna().to_numpy() & np.isnan(hours))
+    record("negative_hours", hours < 0)
+
+    ids = raw["STD_ID"]
+    record("duplicate_id", (ids.notna() & ids.duplicated(keep=False)).to_numpy())
+    unmapped = raw["CITZ_DESC"].notna().to_numpy() & ~mapped_nationality(raw["CITZ_DESC"])
+    record("unmapped_nationality", unmapped)
+
+    admit_year, admit_semester = term_order(raw["TERM_ADMIT"])
+    last_year, last_semester = term_order(raw["LAST_TERM"])
+    record("unparseable_term_admit", raw["TERM_ADMIT"].notna().to_numpy() & np.isnan(admit_year))
+    record("unparseable_last_term", raw["LAST_TERM"].notna().to_numpy() & np.isnan(last_year))
+    # Same year: only compare semesters when both are known
+    before = (last_year < admit_year) | ((last_year == admit_year) & (last_semester < admit_semester))
+    record("last_term_before_admit", before)
+    return report
+
+
+def merge_reports(reports: list[dict], combined: pd.DataFrame) -> dict:
+    """One report for the whole dataset; duplicate ids are recounted across all sources."""
+    merged = new_quality_report()
+    for report in reports:
+        merged["rows"] += report["rows"]
+        for issue in QUALITY_ISSUES:
+            merged["counts"][issue] += report["counts"][issue]
+            room = SAMPLE_ROWS - len(merged["samples"][issue])
+            merged["samples"][issue].extend(report["samples"][issue][:max(room, 0)])
+    if len(reports) > 1:
+        ids = combined["student_id"]
+        duplicate = (ids.notna() & ids.duplicated(keep=False)).to_numpy()
+        merged["counts"]["duplicate_id"] = int(duplicate.sum())
+        if duplicate.any() and not merged["samples"]["duplicate_id"]:
+            columns = sample_columns("duplicate_id")
+            # Raw row numbers are not kept in the dataset, so "row" stays empty
+            sample = combined.loc[duplicate].head(SAMPLE_ROWS).reindex(
+                columns=[DATASET_COLUMNS.get(column, column) for column in columns]
+            )
+            sample.columns = columns
+            merged["samples"]["duplicate_id"] = _sample_records(sample)
+    return merged
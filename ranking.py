@@ -0,0 +1,136 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils import COUNTRY_TO_CONTINENT, UNDEFINED_AR
+
+# Phase-2 ranking criteria, each scaled to [0, 1] with higher meaning "admit first":
+#   geo        – low share of the applicant's country in current enrollment
+#   continent  – low share of the applicant's continent in current enrollment
+#   scarcity   – low load of the applicant's first-choice discipline
+#   choice     – scarcity of all listed choices, weighted 1, 1/2, 1/3 by choice rank
+RANKING_CRITERIA = ["geo", "continent", "scarcity", "choice"]
+DEFAULT_WEIGHTS = {"geo": 1.0, "continent": 0.0, "scarcity": 0.0, "choice": 0.0}
+CHOICE_RANK_WEIGHTS = np.array([1.0, 1 / 2, 1 / 3])
+
+# Positions materialized by the first top-k selection
+TOP_K_INITIAL = 256
+
+
+def _min_max(values: np.ndarray) -> np.ndarray:
+    low, high = values.min(initial=0.0), values.max(initial=0.0)
+    if high - low <= 0:
+        return np.zeros_like(values)
+    return (values - low) / (high - low)
+
+
+def _share_lookup(keys: pd.Series, counts: pd.Series, total: int) -> np.ndarray:
+    """Share of ``total`` held by each key, looked up once per distinct key."""
+    codes, uniques = pd.factorize(keys)
+    shares = counts.reindex(uniques).fillna(0).to_numpy(dtype=np.float64) / max(total, 1)
+    result = np.zeros(len(keys))
+    present = codes >= 0
+    result[present] = shares[codes[present]]
+    return result
+
+
+def ranking_criteria(data: pd.DataFrame, current_students_df: pd.DataFrame,
+                     choice_keys: list[pd.Series], demand_counts: pd.Series | None = None,
+                     demand_total: int | None = None) -> dict[str, np.ndarray]:
+    """Vectorized raw criteria for every applicant, from precomputed share arrays.
+
+    ``choice_keys`` are the load keys of disc1..disc3 (matched program, else the
+    discipline text). Discipline scarcity uses current enrollment per program
+    when the keys are programs, and the applicants' own first-choice demand
+    otherwise. When ``data`` is only some of the applicants, pass the
+    first-choice ``demand_counts`` and ``demand_total`` of all of them.
+    """
+    total_current = len(current_students_df)
+    country_share = _share_lookup(
+        data["mapped_nationality"], current_students_df["country"].value_counts(), total_current
+    )
+    continents = data["mapped_nationality"].map(COUNTRY_TO_CONTINENT).fillna(UNDEFINED_AR)
+    continent_share = _share_lookup(
+        continents, current_students_df["continent"].value_counts(), total_current
+    )
+
+    program_counts = current_students_df["program"].value_counts()
+    if demand_counts is None:
+        demand_counts, demand_total = choice_keys[0].value_counts(), len(data)
+    scarcities = []
+    for keys in choice_keys:
+        enrolled = _share_lookup(keys, program_counts, total_current)
+        demand = _share_lookup(keys, demand_counts, demand_total)
+        known = keys.isin(program_counts.index).to_numpy()
+        scarcity = 1.0 - np.where(known, enrolled, demand)
+        scarcities.append(np.where(keys.isna().to_numpy(), np.nan, scarcity))
+    scarcity_matrix = np.column_stack(scarcities)
+
+    present = ~np.isnan(scarcity_matrix)
+    weights = present * CHOICE_RANK_WEIGHTS
+    weighted = np.nansum(scarcity_matrix * CHOICE_RANK_WEIGHTS, axis=1)
+    choice = np.divide(weighted, weights.sum(axis=1), out=np.zeros(len(data)), where=weights.sum(axis=1) > 0)
+
+    return {
+        "geo": np.round(1.0 - country_share, 4),
+        "continent": 1.0 - continent_share,
+        "scarcity": np.nan_to_num(scarcity_matrix[:, 0], nan=0.0),
+        "choice": choice,
+    }
+
+
+def combined_score(criteria: dict[str, np.ndarray], weights: dict[str, float]) -> np.ndarray:
+    """Weighted mean of the min-max scaled criteria (a lone criterion keeps its order)."""
+    total_weight = sum(max(weights.get(name, 0.0), 0.0) for name in RANKING_CRITERIA)
+    if total_weight <= 0:
+        weights, total_weight = DEFAULT_WEIGHTS, 1.0
+    score = np.zeros(len(next(iter(criteria.values()))))
+    for name in RANKING_CRITERIA:
+        weight = max(weights.get(name, 0.0), 0.0)
+        if weight:
+            score += weight * _min_max(criteria[name])
+    return score / total_weight
+
+
+class TopKOrder:
+    """Applicant positions by descending score (ties in file order), materialized lazily.
+
+    Phase 2 usually needs only the first few hundred positions, so instead of
+    sorting every applicant the order is built with a partial selection: an
+    O(n) ``np.partition`` finds the k-th score, then only the candidates at or
+    above it are sorted. Reading past the materialized prefix doubles k.
+
+    The order is shared by every allocator built on one PreparedApplicants,
+    so the prefix is only ever replaced, under a lock, by a longer one.
+    """
+
+    def __init__(self, scores: np.ndarray):
+        self._neg_scores = -np.asarray(scores, dtype=np.float64)
+        self._prefix = np.empty(0, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._neg_scores)
+
+    def _materialize(self, k: int) -> np.ndarray:
+        with self._lock:
+            # Another reader may have grown the prefix while this one waited
+            if k <= len(self._prefix):
+                return self._prefix
+            n = len(self._neg_scores)
+            k = min(n, max(k, TOP_K_INITIAL, 2 * len(self._prefix)))
+            if k >= n:
+                self._prefix = np.argsort(self._neg_scores, kind="stable")
+                return self._prefix
+            kth = np.partition(self._neg_scores, k - 1)[k - 1]
+            # Every applicant tied with the k-th score is kept, so this is an exact prefix
+            candidates = np.flatnonzero(self._neg_scores <= kth)
+            self._prefix = candidates[np.argsort(self._neg_scores[candidates], kind="stable")]
+            return self._prefix
+
+    def __getitem__(self, position: int) -> int:
+        prefix = self._prefix
+        if position >= len(prefix):
+            prefix = self._materialize(position + 1)
+        return int(prefix[position])
@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+
+# Threads building figures for all sessions of this process
+RENDER_WORKERS = int(os.environ.get("DASHBOARD_RENDER_WORKERS", 0)) or min(4, os.cpu_count() or 1)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="render")
+        return _pool
+
+
+class RenderScheduler:
+    """Builds the figures of one rerun concurrently and hands them out in layout order.
+
+    ``submit`` queues a builder (aggregation plus figure construction, no
+    Streamlit calls) on the shared render pool; ``result`` blocks until that
+    figure is ready, so the page emits charts in its own order while the
+    later ones keep building. pandas/NumPy release the GIL during their
+    heavy loops, which is where the overlap comes from. Each job records
+    when it was queued, started and finished for the timings panel.
+    Figures found in ``cached`` (a previously built set) are not rebuilt.
+    """
+
+    def __init__(self, cached: dict | None = None):
+        self.started = time.perf_counter()
+        self.cached = cached or {}
+        self._futures = {}
+        self._timings = {}
+
+    def _run(self, name: str, builder, args):
+        start = time.perf_counter()
+        try:
+            return builder(*args)
+        finally:
+            self._timings[name].update(start=start, end=time.perf_counter(),
+                                       thread=threading.current_thread().name)
+
+    def submit(self, name: str, builder, *args) -> None:
+        if name in self.cached:
+            future = Future()
+            future.set_result(self.cached[name])
+            self._futures[name] = future
+            return
+        self._timings[name] = {"queued": time.perf_counter()}
+        self._futures[name] = _get_pool().submit(self._run, name, builder, args)
+
+    def result(self, name: str):
+        return self._futures[name].result()
+
+    def results(self) -> dict:
+        """Every submitted figure (waiting for those still building)."""
+        return {name: future.result() for name, future in self._futures.items()}
+
+    def timings(self) -> pd.DataFrame:
+        """Per-figure timings in ms relative to the scheduler's creation, slowest first."""
+        rows = []
+        for name, timing in self._timings.items():
+            if "end" not in timing:
+                continue
+            rows.append({
+                "figure": name,
+                "thread": timing["thread"],
+                "wait_ms": (timing["start"] - timing["queued"]) * 1000,
+                "start_ms": (timing["start"] - self.started) * 1000,
+                "end_ms": (timing["end"] - self.started) * 1000,
+                "build_ms": (timing["end"] - timing["start"]) * 1000,
+            })
+        columns = ["figure", "thread", "wait_ms", "start_ms", "end_ms", "build_ms"]
+        return pd.DataFrame(rows, columns=columns).sort_values("build_ms", ascending=False).round(1)
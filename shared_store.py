@@ -0,0 +1,183 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from drilldown import build_cube
+from filters import FilterIndex, FILTER_COLUMNS
+
+# Root of the published segments; every dashboard process on the host points here
+SHARED_DIR = os.environ.get("DASHBOARD_SHARED_DIR", os.path.join(".cache", "shared"))
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+# Published versions kept on disk; older ones are removed after a switch-over
+KEEP_VERSIONS = 2
+
+
+class SharedDataset:
+    """A published dataset version attached read-only from memory-mapped files.
+
+    Numeric columns, the filter-index positions and the cube's numeric columns
+    are ``np.memmap`` views of the segment files, so every process attached
+    to the same version shares one copy through the page cache. Text columns
+    are stored dictionary-encoded: the int32 codes are mapped the same way,
+    and each process holds only the distinct strings plus an array of
+    references to them.
+    """
+
+    def __init__(self, version: str, frame: pd.DataFrame, filter_index: FilterIndex, cube: pd.DataFrame,
+                 quality: dict | None = None):
+        self.version = version
+        self.frame = frame
+        self.filter_index = filter_index
+        self.cube = cube
+        self.quality = quality
+
+
+# ── Writing
+
+def _write_frame(df: pd.DataFrame, directory: str) -> list[dict]:
+    """Write each column as .npy (numeric) or codes .npy + distinct values (text)."""
+    os.makedirs(directory)
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        path = os.path.join(directory, f"{i}.npy")
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            np.save(path, series.to_numpy())
+            columns.append({"name": name, "kind": "numeric"})
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            np.save(path, codes.astype(np.int32))
+            values = uniques.tolist()
+            if not all(isinstance(v, (str, int, float, bool)) for v in values):
+                raise TypeError(f"Column {name!r} holds values that cannot be shared")
+            columns.append({"name": name, "kind": "text", "values": values})
+    return columns
+
+
+def _write_positions(index: FilterIndex, directory: str) -> dict:
+    """Filter-index positions per column as one concatenated array plus offsets."""
+    os.makedirs(directory)
+    layout = {}
+    for column in FILTER_COLUMNS:
+        values = index.options(column)
+        groups = [np.asarray(index._positions[column][v], dtype=np.int64) for v in values]
+        offsets = np.cumsum([0] + [len(g) for g in groups])
+        np.save(os.path.join(directory, f"{column}.positions.npy"),
+                np.concatenate(groups) if groups else np.empty(0, dtype=np.int64))
+        np.save(os.path.join(directory, f"{column}.offsets.npy"), offsets)
+        layout[column] = values
+    return layout
+
+
+def publish(df: pd.DataFrame, root: str = SHARED_DIR, quality: dict | None = None) -> str:
+    """Publish ``df`` (with its filter index, cube and quality report) as a new segment; returns its version.
+
+    The segment is written to a temporary directory and renamed into place,
+    then the ``CURRENT`` pointer is replaced atomically, so attaching
+    processes see either the old or the new version, never a partial one.
+    Publishing a version that already exists only moves the pointer.
+    """
+    version = df.attrs.get("version") or ""
+    if not version:
+        raise ValueError("Dataset has no version; load it with ingest.ingest_sources")
+    os.makedirs(root, exist_ok=True)
+    target = os.path.join(root, f"v-{version}")
+    if not os.path.exists(target):
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=root)
+        try:
+            manifest = {
+                "version": version,
+                "rows": len(df),
+                "columns": _write_frame(df, os.path.join(staging, "frame")),
+                "filters": _write_positions(FilterIndex(df), os.path.join(staging, "filters")),
+                "cube": _write_frame(build_cube(df), os.path.join(staging, "cube")),
+                "quality": quality,
+            }
+            with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            os.rename(staging, target)
+        except OSError:
+            # Another process published the same version first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.exists(os.path.join(target, MANIFEST_FILE)):
+                raise
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    pointer = os.path.join(root, f".{CURRENT_FILE}.{os.getpid()}")
+    with open(pointer, "w", encoding="utf-8") as f:
+        f.write(f"v-{version}")
+    os.replace(pointer, os.path.join(root, CURRENT_FILE))
+    _prune(root, keep=f"v-{version}")
+    return version
+
+
+def _prune(root: str, keep: str) -> None:
+    """Remove the oldest segments; processes still mapping them keep their open files."""
+    segments = sorted(
+        (entry for entry in os.scandir(root) if entry.is_dir() and entry.name.startswith("v-")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in segments[:-KEEP_VERSIONS]:
+        if entry.name != keep:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+# ── Attaching
+
+def current_segment(root: str = SHARED_DIR) -> str | None:
+    """Name of the published segment (one small file read; cheap to call on every rerun)."""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _read_frame(directory: str, columns: list[dict]) -> pd.DataFrame:
+    data = {}
+    for i, column in enumerate(columns):
+        array = np.load(os.path.join(directory, f"{i}.npy"), mmap_mode="r")
+        if column["kind"] == "numeric":
+            data[column["name"]] = pd.Series(array, copy=False)
+        else:
+            values = np.empty(len(column["values"]) + 1, dtype=object)
+            values[:-1] = column["values"]
+            values[-1] = np.nan
+            # Code -1 (missing) indexes the trailing NaN slot
+            data[column["name"]] = pd.Series(values[array], copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+def attach(segment: str, root: str = SHARED_DIR) -> SharedDataset:
+    """Attach a published segment read-only."""
+    directory = os.path.join(root, segment)
+    with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    frame = _read_frame(os.path.join(directory, "frame"), manifest["columns"])
+    frame.attrs["version"] = manifest["version"]
+
+    positions = {}
+    for column, values in manifest["filters"].items():
+        flat = np.load(os.path.join(directory, "filters", f"{column}.positions.npy"), mmap_mode="r")
+        offsets = np.load(os.path.join(directory, "filters", f"{column}.offsets.npy"))
+        positions[column] = {value: flat[offsets[i]:offsets[i + 1]] for i, value in enumerate(values)}
+    cube = _read_frame(os.path.join(directory, "cube"), manifest["cube"])
+    return SharedDataset(manifest["version"], frame, FilterIndex(frame, positions), cube, manifest.get("quality"))
+
+
+if __name__ == "__main__":
+    # Load the sources once and publish them for every dashboard process on this host
+    from ingest import ingest_sources, load_manifest
+
+    root = sys.argv[sys.argv.index("--dir") + 1] if "--dir" in sys.argv else SHARED_DIR
+    dataset, _, _, quality = ingest_sources(load_manifest(), with_details=True)
+    published = publish(dataset, root, quality)
+    print(f"Published dataset version {published} to {root}")
@@ -0,0 +1,78 @@
+import json
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from utils import UNDEFINED_AR
+
+STATUS_RULES_PATH = "data/status_rules.json"
+
+# Used when no rules file exists: the original three-way split
+DEFAULT_STATUS_RULES = {
+    "default": {"status": "غير نشط", "bucket": "غير نشط"},
+    "rules": [
+        {"keywords": ["متخرج", "خريج"], "status": "متخرج", "bucket": "متخرج"},
+        {"keywords": ["متابع", "مؤهل", "مكتمل", "زائر", "مؤجل"], "status": "نشط", "bucket": "نشط"},
+    ],
+}
+
+
+class StatusClassifier:
+    """Ordered keyword/regex rules mapping a detailed status to (status, bucket).
+
+    Each rule has ``keywords`` (substrings) or a ``pattern`` (regex) and
+    assigns a coarse ``status`` plus a finer ``bucket``; the first rule that
+    matches anywhere in the text wins. All rules are compiled into a single
+    regex of anchored lookahead branches, tried in rule order, so one match
+    call classifies a value.
+    """
+
+    def __init__(self, config: dict):
+        self.rules = config["rules"]
+        self.default = (config["default"]["status"], config["default"]["bucket"])
+        branches = []
+        for i, rule in enumerate(self.rules):
+            if "pattern" in rule:
+                body = rule["pattern"]
+            else:
+                body = "|".join(re.escape(keyword) for keyword in rule["keywords"])
+            branches.append(f"(?=.*?(?:{body}))(?P<r{i}>)")
+        self._matcher = re.compile("^(?:" + "|".join(branches) + ")", re.DOTALL) if branches else None
+        self.buckets = list(dict.fromkeys([rule["bucket"] for rule in self.rules] + [self.default[1]]))
+
+    def classify(self, value) -> tuple[str, str]:
+        if pd.isna(value):
+            return UNDEFINED_AR, UNDEFINED_AR
+        match = self._matcher.match(str(value)) if self._matcher else None
+        if match is None:
+            return self.default
+        rule = self.rules[int(match.lastgroup[1:])]
+        return rule["status"], rule["bucket"]
+
+    def classify_series(self, values: pd.Series) -> pd.DataFrame:
+        """``status`` and ``status_bucket`` columns, classifying each distinct value once."""
+        codes, uniques = pd.factorize(values)
+        labels = [self.classify(value) for value in uniques] + [(UNDEFINED_AR, UNDEFINED_AR)]
+        # Code -1 (missing) picks the trailing undefined entry
+        statuses = np.array([label[0] for label in labels], dtype=object)
+        buckets = np.array([label[1] for label in labels], dtype=object)
+        return pd.DataFrame(
+            {"status": statuses[codes], "status_bucket": buckets[codes]},
+            index=values.index,
+        )
+
+
+def load_status_rules(path: str = STATUS_RULES_PATH) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return DEFAULT_STATUS_RULES
+
+
+@lru_cache(maxsize=4)
+def get_status_classifier(path: str = STATUS_RULES_PATH) -> StatusClassifier:
+    """Compiled classifier for a rules file (once per process)."""
+    return StatusClassifier(load_status_rules(path))
@@ -0,0 +1,65 @@
+import json
+import os
+import threading
+from collections import Counter
+from datetime import date
+
+from filters import FILTER_COLUMNS, ALL_OPTION
+
+# Append-only log of filter combinations, shared by every process on the host
+USAGE_LOG_PATH = os.environ.get("DASHBOARD_USAGE_LOG", os.path.join(".cache", "usage.jsonl"))
+# Only the most recent lines are read when ranking combinations
+MAX_LOG_LINES = 20_000
+
+_lock = threading.Lock()
+
+
+def combination(selections: dict, gpa_range: tuple | None) -> tuple:
+    """Hashable filter combination: the set filters in FILTER_COLUMNS order plus the GPA range.
+
+    ``gpa_range`` is None for the dataset's full range, so a combination
+    stays the same when a new dataset version moves the GPA bounds.
+    """
+    filters = tuple((column, selections[column]) for column in FILTER_COLUMNS
+                    if selections.get(column, ALL_OPTION) != ALL_OPTION)
+    return filters, None if gpa_range is None else tuple(round(float(v), 2) for v in gpa_range)
+
+
+def log_usage(key: tuple, tabs: list[str], path: str = USAGE_LOG_PATH) -> None:
+    """Append one anonymized record: the combination, the sections used and the day.
+
+    No session, user or request details are written.
+    """
+    filters, gpa_range = key
+    record = {"day": date.today().isoformat(), "filters": dict(filters), "gpa_range": gpa_range, "tabs": tabs}
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def _tail(path: str, lines: int) -> list[str]:
+    try:
+        with open(path, "rb") as f:
+            # Records are short; reading a bounded window from the end is enough
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - lines * 512))
+            return f.read().decode("utf-8", errors="ignore").splitlines()[-lines:]
+    except FileNotFoundError:
+        return []
+
+
+def top_combinations(n: int, path: str = USAGE_LOG_PATH) -> list[tuple]:
+    """The ``n`` most frequent combinations among the recent records, most used first."""
+    counts = Counter()
+    for line in _tail(path, MAX_LOG_LINES):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # The first line of the window may be cut
+            continue
+        selections = record.get("filters", {})
+        gpa_range = record.get("gpa_range")
+        counts[combination(selections, None if gpa_range is None else tuple(gpa_range))] += 1
+    return [key for key, _ in counts.most_common(n)]
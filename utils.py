@@ -1,4 +1,9 @@
+import hashlib
+import importlib
+import os
 import re
+from types import MappingProxyType
+
 import pandas as pd
 
 # Constants for undefined/unspecified values
@@ -145,88 +150,88 @@ NATIONALITY_MAPPING = {
     "يوغوسلافيا": {"country_ar": "يوغوسلافيا", "country_en": "Yugoslavia", "continent": "أوروبا"},
 }
 
+def build_mapping_tables() -> dict:
+    """Derive the lookup tables used across the app from NATIONALITY_MAPPING.
+
+    ``NATIONALITY_INDEX`` maps whitespace-stripped nationalities to
+    ``(country_ar, continent)``; an exact stripped key wins over a padded one.
+    """
+    arabic_to_english = {}
+    english_to_arabic = {}
+    country_to_continent = {UNDEFINED_AR: UNDEFINED_AR}
+    nationality_index = {}
+    for key, mapping in NATIONALITY_MAPPING.items():
+        country_ar = mapping["country_ar"]
+        country_en = mapping["country_en"]
+        if country_ar not in arabic_to_english and country_ar != UNDEFINED_AR:
+            arabic_to_english[country_ar] = country_en
+        # Reverse mapping for accepting English country names in CSV uploads
+        if country_en not in english_to_arabic and country_ar != UNDEFINED_AR and country_en != UNDEFINED_EN:
+            english_to_arabic[country_en] = country_ar
+        if country_ar not in country_to_continent:
+            country_to_continent[country_ar] = mapping["continent"]
+        entry = (country_ar, mapping["continent"])
+        if key == key.strip():
+            nationality_index[key] = entry
+        else:
+            nationality_index.setdefault(key.strip(), entry)
+    return {
+        "ARABIC_TO_ENGLISH": arabic_to_english,
+        "ENGLISH_TO_ARABIC": english_to_arabic,
+        "COUNTRY_TO_CONTINENT": country_to_continent,
+        "NATIONALITY_INDEX": nationality_index,
+    }
+
+
+def mapping_digest() -> str:
+    """Fingerprint of NATIONALITY_MAPPING used to detect stale precompiled tables."""
+    return hashlib.sha1(repr(NATIONALITY_MAPPING).encode("utf-8")).hexdigest()
+
+
+# Load the frozen tables generated by build_mapping_tables.py as they are; only
+# with DASHBOARD_CHECK_MAPPING_TABLES=1 (development) are they compared with
+# NATIONALITY_MAPPING, since hashing it would cost every import. They are rebuilt
+# here when the module is missing, or stale under that flag.
+try:
+    import mapping_tables as _tables
+    if os.environ.get("DASHBOARD_CHECK_MAPPING_TABLES") == "1" and _tables.SOURCE_DIGEST != mapping_digest():
+        raise ImportError("mapping_tables.py is stale")
+    ARABIC_TO_ENGLISH = _tables.ARABIC_TO_ENGLISH
+    ENGLISH_TO_ARABIC = _tables.ENGLISH_TO_ARABIC
+    COUNTRY_TO_CONTINENT = _tables.COUNTRY_TO_CONTINENT
+    NATIONALITY_INDEX = _tables.NATIONALITY_INDEX
+except ImportError:
+    _built = {name: MappingProxyType(table) for name, table in build_mapping_tables().items()}
+    ARABIC_TO_ENGLISH = _built["ARABIC_TO_ENGLISH"]
+    ENGLISH_TO_ARABIC = _built["ENGLISH_TO_ARABIC"]
+    COUNTRY_TO_CONTINENT = _built["COUNTRY_TO_CONTINENT"]
+    NATIONALITY_INDEX = _built["NATIONALITY_INDEX"]
+
+
 # Helper function to get Arabic country name from nationality
 def _get_country_ar(nationality: str) -> str:
     """Get Arabic country name from nationality, handling whitespace variations."""
     # First try exact match
     if nationality in NATIONALITY_MAPPING:
         return NATIONALITY_MAPPING[nationality]["country_ar"]
-    # Then try stripped version
+    # Then look up the stripped version in the precompiled index
     stripped = nationality.strip()
-    if stripped in NATIONALITY_MAPPING:
-        return NATIONALITY_MAPPING[stripped]["country_ar"]
-    # Try to find a matching key that when stripped matches
-    for key, value in NATIONALITY_MAPPING.items():
-        if key.strip() == stripped:
-            return value["country_ar"]
+    if stripped in NATIONALITY_INDEX:
+        return NATIONALITY_INDEX[stripped][0]
     return stripped if stripped else UNDEFINED_AR
 
-# Helper function to get English country name from Arabic country name
-def _get_country_en(country_ar: str) -> str | None:
-    """Get English country name from Arabic country name.
-    
-    Note: This is an internal helper used for building ARABIC_TO_ENGLISH.
-    Returns None if the country is not found in the mapping.
-    """
-    for mapping in NATIONALITY_MAPPING.values():
-        if mapping["country_ar"] == country_ar:
-            return mapping["country_en"]
-    return None
-
 # Helper function to get continent from nationality
 def _get_continent(nationality: str) -> str:
     """Get continent from nationality, handling whitespace variations."""
     # First try exact match
     if nationality in NATIONALITY_MAPPING:
         return NATIONALITY_MAPPING[nationality]["continent"]
-    # Then try stripped version
+    # Then look up the stripped version in the precompiled index
     stripped = nationality.strip()
-    if stripped in NATIONALITY_MAPPING:
-        return NATIONALITY_MAPPING[stripped]["continent"]
-    # Try to find a matching key that when stripped matches
-    for key, value in NATIONALITY_MAPPING.items():
-        if key.strip() == stripped:
-            return value["continent"]
+    if stripped in NATIONALITY_INDEX:
+        return NATIONALITY_INDEX[stripped][1]
     return UNDEFINED_AR
 
-# Build ARABIC_TO_ENGLISH for backward compatibility
-ARABIC_TO_ENGLISH = {}
-for mapping in NATIONALITY_MAPPING.values():
-    country_ar = mapping["country_ar"]
-    country_en = mapping["country_en"]
-    if country_ar not in ARABIC_TO_ENGLISH and country_ar != UNDEFINED_AR:
-        ARABIC_TO_ENGLISH[country_ar] = country_en
-
-# Build ENGLISH_TO_ARABIC reverse mapping (for accepting English country names in CSV uploads)
-ENGLISH_TO_ARABIC = {}
-for mapping in NATIONALITY_MAPPING.values():
-    country_ar = mapping["country_ar"]
-    country_en = mapping["country_en"]
-    if country_en not in ENGLISH_TO_ARABIC and country_ar != UNDEFINED_AR and country_en != UNDEFINED_EN:
-        ENGLISH_TO_ARABIC[country_en] = country_ar
-
-# Build COUNTRY_TO_CONTINENT from NATIONALITY_MAPPING for backward compatibility
-COUNTRY_TO_CONTINENT = {UNDEFINED_AR: UNDEFINED_AR}
-for mapping in NATIONALITY_MAPPING.values():
-    country_ar = mapping["country_ar"]
-    continent = mapping["continent"]
-    if country_ar not in COUNTRY_TO_CONTINENT:
-        COUNTRY_TO_CONTINENT[country_ar] = continent
-
-STATUS_ACTIVE_KEYWORDS = [
-    "متابع",
-    "مؤهل",
-    "مكتمل",
-    "زائر",
-    "مؤجل"
-]
-
-STATUS_GRAD_KEYWORDS = [
-    "متخرج",
-    "خريج"
-]
-
-
 def map_country(value: str) -> str:
     if pd.isna(value):
         return UNDEFINED_AR
@@ -243,16 +248,6 @@ def map_continent(value: str) -> str:
     key = str(value).strip()
     return COUNTRY_TO_CONTINENT.get(key, UNDEFINED_AR)
 
-def categorize_status(value: str) -> str:
-    if pd.isna(value):
-        return UNDEFINED_AR
-    text = str(value)
-    if any(keyword in text for keyword in STATUS_GRAD_KEYWORDS):
-        return "متخرج"
-    if any(keyword in text for keyword in STATUS_ACTIVE_KEYWORDS):
-        return "نشط"
-    return "غير نشط"
-
 
 # Semester to Hijri month mapping for date formatting
 SEMESTER_MONTH_MAPPING = {
@@ -319,6 +314,23 @@ def map_gender(value: str) -> str:
         return UNDEFINED_AR
     return mapping.get(str(value).strip(), UNDEFINED_AR)
 
+class LazyModule:
+    """Proxy that imports a heavy module on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self):
+        """Import the module now (e.g. before several threads first touch it)."""
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
 # Constant for undefined trace name
 _UNDEFINED_TRACE_NAME = 'undefined'
 
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+# Detailed statuses meaning an admitted student never started (withdrew, declined or deferred)
+NO_SHOW_STATUSES = ["إنسحاب قبول", "معتذر", "مؤجل"]
+
+# Pseudo-count pulling small groups toward the overall yield
+YIELD_PRIOR_STRENGTH = 20
+# Upper bound on random draws held in memory per simulation block
+DRAWS_PER_BLOCK = 4_000_000
+PERCENTILES = [5, 25, 50, 75, 95]
+# The waitlist is cut where the expected enrollment exceeds the seats by this
+# many standard deviations, beyond which P(fill) is 1 for any practical purpose
+WAITLIST_SIGMAS = 4
+
+
+def estimate_yield_rates(students_df: pd.DataFrame, by: str,
+                         prior_strength: float = YIELD_PRIOR_STRENGTH) -> tuple[pd.Series, float]:
+    """Historical yield per group of ``by`` (e.g. ``country`` or ``program``).
+
+    Yield is the share of students whose detailed status is not a no-show,
+    shrunk toward the overall rate so groups with few students stay plausible.
+    Returns (rates indexed by group, overall rate).
+    """
+    show = ~students_df["status_detail"].isin(NO_SHOW_STATUSES)
+    overall = float(show.mean()) if len(show) else 1.0
+    grouped = show.groupby(students_df[by]).agg(["sum", "count"])
+    rates = (grouped["sum"] + prior_strength * overall) / (grouped["count"] + prior_strength)
+    return rates.clip(0.0, 1.0), overall
+
+
+def applicant_yield(groups: pd.Series, rates: pd.Series | dict, default: float) -> np.ndarray:
+    """Per-applicant yield probabilities looked up by group (unknown groups get ``default``)."""
+    return groups.map(rates).fillna(default).to_numpy(dtype=np.float64)
+
+
+def _histogram_percentiles(hist: np.ndarray, percentiles: list[int]) -> dict:
+    cdf = np.cumsum(hist) / max(hist.sum(), 1)
+    return {p: int(np.searchsorted(cdf, p / 100)) for p in percentiles}
+
+
+def group_distributions(probabilities: np.ndarray, group_codes: np.ndarray) -> list[np.ndarray]:
+    """Exact distribution of the enrolled count of every group (Poisson binomial).
+
+    Members are laid out as a (groups × largest group) matrix, padded with
+    zero probabilities, and every group's distribution is advanced one
+    member at a time in the same array step. The cost is independent of the
+    number of simulations, unlike counting each group in every draw.
+    """
+    group_codes = np.asarray(group_codes)
+    sizes = np.bincount(group_codes)
+    order = np.argsort(group_codes, kind="stable")
+    codes = group_codes[order]
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    members = np.zeros((len(sizes), int(sizes.max())))
+    members[codes, np.arange(len(order)) - starts[codes]] = np.asarray(probabilities, dtype=np.float64)[order]
+
+    distribution = np.zeros((len(sizes), members.shape[1] + 1))
+    distribution[:, 0] = 1.0
+    for k in range(members.shape[1]):
+        p = members[:, k:k + 1]
+        enrolled = distribution[:, :-1] * p
+        distribution *= 1 - p
+        distribution[:, 1:] += enrolled
+    return [distribution[g, :size + 1] for g, size in enumerate(sizes)]
+
+
+def waitlist_limit(probabilities: np.ndarray, seats: int, n_planned: int) -> int:
+    """Number of candidates (planned admits first) worth simulating.
+
+    Admitting more than the first list position where the expected
+    enrollment is ``WAITLIST_SIGMAS`` standard deviations above ``seats``
+    cannot change the seat-fill curve the report reads, so the rest of the
+    waitlist is left out. The simulation cost is proportional to the
+    candidates, so this keeps it near ``seats / yield`` rather than the file
+    size. There is no fixed cap: at low yield rates the recommendation can
+    lie far down the list. Never fewer than the planned admits are kept.
+    """
+    probs = np.asarray(probabilities, dtype=np.float64)
+    mean = np.cumsum(probs)
+    spread = np.sqrt(np.cumsum(probs * (1 - probs)))
+    saturated = np.flatnonzero(mean - WAITLIST_SIGMAS * spread >= seats)
+    limit = int(saturated[0]) + 1 if len(saturated) else len(probs)
+    return min(len(probs), max(limit, n_planned))
+
+
+def simulate_yield(probabilities: np.ndarray, seats: int, n_planned: int,
+                   n_sims: int = 100_000, confidence: float = 0.9,
+                   group_codes: np.ndarray | None = None, seed: int | None = None) -> dict:
+    """Monte Carlo seat fill for an ordered admission list.
+
+    ``probabilities`` are per-candidate yield rates in acceptance order: the
+    ``n_planned`` accepted applicants first, then the waitlist. Every simulation
+    draws one Bernoulli outcome per candidate; a cumulative sum along the list
+    gives the enrolled count for every possible number of admits at once. Draws
+    are generated in blocks so memory stays bounded for any ``n_sims``.
+
+    ``group_codes`` (integer code per planned applicant) adds per-group
+    enrollment distributions for the planned list, computed exactly by
+    ``group_distributions`` rather than from the draws.
+    """
+    probs = np.asarray(probabilities, dtype=np.float32)
+    n_candidates = len(probs)
+    if n_candidates == 0 or n_planned == 0:
+        raise ValueError("No admitted applicants to simulate")
+
+    rng = np.random.default_rng(seed)
+    block = max(1, DRAWS_PER_BLOCK // n_candidates)
+
+    # Counts never exceed the candidates, so the cumulative sums fit a narrower type
+    count_dtype = np.int16 if n_candidates <= np.iinfo(np.int16).max else np.int32
+    filled = np.zeros(n_candidates, dtype=np.int64)     # sims with enrolled >= seats, per admit count
+    enrolled_sum = np.zeros(n_candidates, dtype=np.int64)
+    overflow_sum = np.zeros(n_candidates, dtype=np.int64)
+    planned_hist = np.zeros(n_planned + 1, dtype=np.int64)
+
+    done = 0
+    while done < n_sims:
+        size = min(block, n_sims - done)
+        draws = rng.random((size, n_candidates), dtype=np.float32) < probs
+        enrolled = draws.cumsum(axis=1, dtype=count_dtype)
+        filled += np.count_nonzero(enrolled >= seats, axis=0)
+        enrolled_sum += enrolled.sum(axis=0, dtype=np.int64)
+        planned_hist += np.bincount(enrolled[:, n_planned - 1], minlength=n_planned + 1)
+        # Overflow is max(enrolled, seats) - seats, clipped in place as enrolled is not read again
+        overflow_sum += np.maximum(enrolled, seats, out=enrolled).sum(axis=0, dtype=np.int64) - seats * size
+        done += size
+
+    has_groups = group_codes is not None and len(group_codes)
+    group_dists = group_distributions(probabilities[:n_planned], group_codes) if has_groups else []
+    admits = np.arange(1, n_candidates + 1)
+    p_fill = filled / n_sims
+    curve = pd.DataFrame({
+        "admits": admits,
+        "mean_enrolled": enrolled_sum / n_sims,
+        "p_fill": p_fill,
+        "mean_overflow": overflow_sum / n_sims,
+    })
+
+    # Smallest admit count that fills every seat with the requested confidence
+    reachable = np.flatnonzero(p_fill >= confidence)
+    recommended = int(admits[reachable[0]]) if len(reachable) else None
+
+    mean_planned = float(curve["mean_enrolled"].iat[n_planned - 1])
+    return {
+        "n_sims": n_sims,
+        "seats": seats,
+        "n_planned": n_planned,
+        "planned_hist": planned_hist,
+        "planned_mean": mean_planned,
+        "planned_percentiles": _histogram_percentiles(planned_hist, PERCENTILES),
+        "planned_p_fill": float(p_fill[n_planned - 1]),
+        "planned_fill_rate": mean_planned / seats if seats else 0.0,
+        "curve": curve,
+        "recommended_admits": recommended,
+        "over_admission": None if recommended is None else recommended - n_planned,
+        "group_percentiles": [_histogram_percentiles(d, PERCENTILES) for d in group_dists],
+        "group_means": [float((d * np.arange(len(d))).sum()) for d in group_dists],
+    }